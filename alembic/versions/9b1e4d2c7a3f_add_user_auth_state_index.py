@@ -0,0 +1,35 @@
+"""add user auth state index
+
+Revision ID: 9b1e4d2c7a3f
+Revises: 566f0ccd369b
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b1e4d2c7a3f'
+down_revision: Union[str, Sequence[str], None] = '566f0ccd369b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Covering index of role and flags, lookups of them by user_id are
+    # index-only scans.
+    op.create_index(
+        'ix_user_auth_state',
+        'user',
+        ['user_id'],
+        unique=False,
+        postgresql_include=['user_service_role', 'user_is_active', 'user_is_verified'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_auth_state', table_name='user')
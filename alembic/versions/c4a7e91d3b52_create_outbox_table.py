@@ -0,0 +1,45 @@
+"""create outbox table
+
+Revision ID: c4a7e91d3b52
+Revises: 9b1e4d2c7a3f
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7e91d3b52'
+down_revision: Union[str, Sequence[str], None] = '9b1e4d2c7a3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'outbox',
+        sa.Column('event_id', sa.UUID(), nullable=False),
+        sa.Column('routing_key', sa.String(), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('event_id'),
+    )
+    op.create_index(
+        'ix_outbox_pending',
+        'outbox',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text('sent_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_outbox_pending', table_name='outbox', postgresql_where=sa.text('sent_at IS NULL'))
+    op.drop_table('outbox')
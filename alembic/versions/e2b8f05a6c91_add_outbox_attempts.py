@@ -0,0 +1,31 @@
+"""add outbox attempts
+
+Revision ID: e2b8f05a6c91
+Revises: c4a7e91d3b52
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b8f05a6c91'
+down_revision: Union[str, Sequence[str], None] = 'c4a7e91d3b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'outbox',
+        sa.Column('attempts', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('outbox', 'attempts')
@@ -5,21 +5,63 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from app.internal.pkg.cache.cache import cache
+from app.internal.pkg.events.publisher import event_publisher
+from app.internal.pkg.jwt.keys import key_ring
+from app.internal.pkg.outbox.relay import outbox_relay
+from app.internal.pkg.password.executor import password_executor
+from app.internal.pkg.revocation.revocation import revocation_list
+from app.internal.repository.v1.postgresql.connection import dispose_engines
+from app.pkg.settings import settings
+
 
 @asynccontextmanager
 async def lifespan(
     app: FastAPI,  # pylint: disable=unused-argument
 ):
     app.state.shutting_down = False
+    if settings.JWT.KEYS_DIR:
+        key_ring.reload()
+        app.state.key_rotation = asyncio.create_task(
+            key_ring.run_rotation(settings.JWT.KEYS_RELOAD_INTERVAL_SECONDS),
+        )
+    app.state.revocation_sync = asyncio.create_task(
+        revocation_list.run_sync(settings.JWT.REVOCATION_REBUILD_INTERVAL_SECONDS),
+    )
+    app.state.cache_sync = asyncio.create_task(cache.run_sync())
+    app.state.outbox_relay = asyncio.create_task(outbox_relay.run())
+    app.state.event_publisher = asyncio.create_task(event_publisher.run())
     yield
-    await shutdown_event()
+    await shutdown_event(app)
+
+
+#: Background tasks of the app, stored on ``app.state`` by :func:`lifespan`.
+_BACKGROUND_TASKS = (
+    "key_rotation",
+    "revocation_sync",
+    "cache_sync",
+    "outbox_relay",
+    "event_publisher",
+)
 
 
-async def shutdown_event() -> None:
+async def shutdown_event(app: FastAPI) -> None:
+    # Only own background tasks are cancelled: tasks of the server, e.g.
+    # of requests still in flight, may publish events which are drained
+    # below.
     pending = [
-        task for task in asyncio.all_tasks() if task is not asyncio.current_task()
+        getattr(app.state, name)
+        for name in _BACKGROUND_TASKS
+        if hasattr(app.state, name)
     ]
     for task in pending:
         task.cancel()
 
     await asyncio.gather(*pending, return_exceptions=True)
+
+    # Connections are still open, buffered events are published or spilled
+    # to the outbox.
+    await event_publisher.drain()
+
+    password_executor.shutdown()
+    await dispose_engines()
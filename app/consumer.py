@@ -0,0 +1,46 @@
+"""Entry point of the consumer of user-lifecycle commands.
+
+It runs as a separate process, so consuming doesn't compete with the API
+for the event loop::
+
+    $ python -m app.consumer
+"""
+
+import asyncio
+import signal
+
+from app.configuration import __containers__
+from app.internal.consumers.handlers import handlers
+from app.internal.consumers.runtime import ConsumerRuntime
+from app.internal.repository.v1.postgresql.connection import dispose_engines
+from app.pkg.settings import settings
+
+
+async def run() -> None:
+    runtime = ConsumerRuntime(
+        queue_name=settings.CONSUMER.QUEUE,
+        handlers=handlers,
+        prefetch=settings.CONSUMER.PREFETCH,
+        concurrency=settings.CONSUMER.CONCURRENCY,
+        ack_batch_size=settings.CONSUMER.ACK_BATCH_SIZE,
+        ack_interval=settings.CONSUMER.ACK_INTERVAL_SECONDS,
+        handler_timeout=settings.CONSUMER.HANDLER_TIMEOUT_SECONDS,
+        retry_delays=settings.CONSUMER.RETRY_DELAYS_SECONDS,
+        max_attempts=settings.CONSUMER.MAX_ATTEMPTS,
+    )
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, runtime.stop)
+    try:
+        await runtime.run()
+    finally:
+        await dispose_engines()
+
+
+def main() -> None:
+    __containers__.wire_packages()
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Consumers of commands sent to the service through RabbitMQ."""
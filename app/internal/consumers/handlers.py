@@ -0,0 +1,33 @@
+"""Handlers of user-lifecycle commands."""
+
+from dependency_injector.wiring import Provide, inject
+
+from app.internal.consumers.runtime import Handler
+from app.internal.services import Services
+from app.internal.services.v1 import AuthService, UserService
+from app.pkg.models import v1 as models
+
+__all__ = ["handlers"]
+
+
+@inject
+async def update_active(
+    body: dict,
+    user_service: UserService = Provide[Services.v1.user_service],
+    auth_service: AuthService = Provide[Services.v1.auth_service],
+) -> None:
+    """Activate or deactivate the user, e.g. by the admin service.
+
+    Sessions of a deactivated user are revoked, so its access tokens stop
+    working before they expire.
+    """
+
+    cmd = models.UserUpdateActiveCommand.model_validate(body)
+    user = await user_service.change_active(cmd)
+    if not user.user_is_active:
+        await auth_service.logout_all(user.user_id)
+
+
+handlers: dict[str, Handler] = {
+    "user.update_active": update_active,
+}
@@ -0,0 +1,374 @@
+"""Runtime of a queue consumer.
+
+Messages are taken from the queue up to ``prefetch`` at a time and handled
+by ``concurrency`` tasks. Successful deliveries are acknowledged in
+batches by a single ``basic.ack`` with ``multiple`` flag.
+
+Failed deliveries are retried with delay. A copy of the message with
+incremented ``x-attempts`` header is published to a delay queue, which
+has no consumers: the broker dead-letters it back to the queue when its
+TTL expires. Delays grow with attempts::
+
+    <queue> --fail--> <queue>.retry.<delay>s --TTL--> <queue>
+            --fail, last attempt or not retryable--> <queue>.dlq
+
+Deliveries which failed permanently (malformed message, unknown command,
+client error of a handler) or ``max_attempts`` times are rejected and
+routed by the broker to the dead letter queue ``<queue>.dlq``. Use
+``scripts/replay_dead_letters.py`` to send them back once fixed.
+
+Messages are JSON objects with ``command`` field, which selects the
+handler::
+
+    {"command": "user.update_active", "user_id": "...", "user_is_active": false}
+
+Notes:
+    Messages are delivered at least once (e.g. unacknowledged ones are
+    redelivered after a crash), handlers must be idempotent.
+"""
+
+import asyncio
+from logging import Logger
+from typing import Awaitable, Callable
+
+import aio_pika
+from aio_pika.abc import AbstractIncomingMessage
+
+from app.internal.repository.v1.rabbitmq.connection import (
+    acquire_connection,
+    get_connection,
+)
+from app.internal.repository.v1.rabbitmq.serializers import get_serializer
+from app.pkg.logger import get_logger
+from app.pkg.models.base import BaseAPIException
+
+__all__ = ["AckTracker", "ConsumerRuntime", "Handler", "UnknownCommand"]
+
+Handler = Callable[[dict], Awaitable[None]]
+
+#: Header with count of failed attempts of a message.
+ATTEMPTS_HEADER = "x-attempts"
+
+
+class UnknownCommand(ValueError):
+    """Message has no handler."""
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Check that handling may succeed next time.
+
+    Malformed messages (``ValueError``, including validation errors) and
+    client errors of services never will.
+    """
+
+    if isinstance(error, (ValueError, UnicodeDecodeError)):
+        return False
+    if isinstance(error, BaseAPIException):
+        return error.status_code >= 500
+    return True
+
+
+class AckTracker:
+    """Settles deliveries of one channel with as few frames as possible.
+
+    ``multiple`` ack settles all deliveries up to a tag, so it's sent only
+    for the longest prefix of deliveries which are all handled.
+    """
+
+    def __init__(self):
+        #: Delivery tag -> message, None while not handled. Tags grow, so
+        #  insertion order is the order of tags.
+        self._outstanding: dict[int, AbstractIncomingMessage | None] = {}
+        #: Tags settled individually (rejected).
+        self._settled: set[int] = set()
+        #: Acks must be sent in order of tags, an ack of a tag below an
+        #  already acknowledged one closes the channel.
+        self._lock = asyncio.Lock()
+        self.pending = 0
+        self.frames = 0
+
+    def received(self, message: AbstractIncomingMessage) -> None:
+        self._outstanding[message.delivery_tag] = None
+
+    def handled(self, message: AbstractIncomingMessage) -> None:
+        """Mark ``message`` handled, it's acknowledged by next flush."""
+
+        self._outstanding[message.delivery_tag] = message
+        self.pending += 1
+
+    def settled(self, message: AbstractIncomingMessage) -> None:
+        """Mark ``message`` already settled by reject."""
+
+        self._outstanding[message.delivery_tag] = message
+        self._settled.add(message.delivery_tag)
+
+    async def flush(self) -> None:
+        """Acknowledge the longest prefix of handled deliveries."""
+
+        async with self._lock:
+            last = None
+            while self._outstanding:
+                tag, message = next(iter(self._outstanding.items()))
+                if message is None:
+                    break
+                del self._outstanding[tag]
+                if tag in self._settled:
+                    self._settled.discard(tag)
+                else:
+                    last = message
+                    self.pending -= 1
+
+            if last is not None:
+                await last.ack(multiple=True)
+                self.frames += 1
+
+
+class ConsumerRuntime:
+    """Consumer of one queue with concurrent handlers.
+
+    Attributes:
+        queue_name: Queue to consume. Its dead letter queue is
+            ``<queue_name>.dlq``.
+        handlers: Handlers by ``command`` of messages.
+        prefetch: Max count of unacknowledged deliveries.
+        concurrency: Count of concurrent handler tasks.
+        ack_batch_size: Count of handled deliveries acknowledged at once.
+        ack_interval: Max delay in seconds of acknowledgement.
+        handler_timeout: Max time in seconds of one handler call.
+        retry_delays: Delays in seconds of retries, one delay queue each.
+            Attempt ``n`` waits ``retry_delays[n - 1]``, or the last delay.
+        max_attempts: Max count of attempts of a message.
+    """
+
+    __logger: Logger = get_logger(__name__)
+
+    def __init__(
+        self,
+        queue_name: str,
+        handlers: dict[str, Handler],
+        prefetch: int,
+        concurrency: int,
+        ack_batch_size: int,
+        ack_interval: float,
+        handler_timeout: float,
+        retry_delays: list[int],
+        max_attempts: int,
+    ):
+        self.queue_name = queue_name
+        self.handlers = handlers
+        self.prefetch = prefetch
+        self.concurrency = concurrency
+        self.ack_batch_size = ack_batch_size
+        self.ack_interval = ack_interval
+        self.handler_timeout = handler_timeout
+        self.retry_delays = retry_delays
+        self.max_attempts = max_attempts
+        self._stopping = asyncio.Event()
+        self._handled = 0
+        self._failed = 0
+        self._retried = 0
+
+    @property
+    def dead_letter_queue(self) -> str:
+        return f"{self.queue_name}.dlq"
+
+    def retry_queue(self, delay: int) -> str:
+        return f"{self.queue_name}.retry.{delay}s"
+
+    def stop(self) -> None:
+        """Stop consuming, deliveries already received are handled."""
+
+        self._stopping.set()
+
+    async def declare(
+        self,
+        channel: aio_pika.abc.AbstractChannel,
+    ) -> aio_pika.abc.AbstractQueue:
+        """Declare the queue, its delay queues and dead letter queue."""
+
+        await channel.declare_queue(self.dead_letter_queue, durable=True)
+        for delay in self.retry_delays:
+            await channel.declare_queue(
+                self.retry_queue(delay),
+                durable=True,
+                arguments={
+                    "x-message-ttl": delay * 1000,
+                    "x-dead-letter-exchange": "",
+                    "x-dead-letter-routing-key": self.queue_name,
+                },
+            )
+        return await channel.declare_queue(
+            self.queue_name,
+            durable=True,
+            arguments={
+                "x-dead-letter-exchange": "",
+                "x-dead-letter-routing-key": self.dead_letter_queue,
+            },
+        )
+
+    async def run(self) -> None:
+        """Consume until :meth:`stop` is called."""
+
+        async with get_connection(return_pool=True) as pool:
+            async with acquire_connection(pool) as channel:
+                await channel.set_qos(prefetch_count=self.prefetch)
+                queue = await self.declare(channel)
+
+                inbox: asyncio.Queue[AbstractIncomingMessage] = asyncio.Queue()
+                tracker = AckTracker()
+
+                async def receive(message: AbstractIncomingMessage) -> None:
+                    tracker.received(message)
+                    inbox.put_nowait(message)
+
+                workers = [
+                    asyncio.create_task(self.__work(inbox, tracker))
+                    for _ in range(self.concurrency)
+                ]
+                acker = asyncio.create_task(self.__acknowledge(tracker))
+                consumer_tag = await queue.consume(receive)
+                self.__logger.info("Consuming %s.", self.queue_name)
+                try:
+                    await self._stopping.wait()
+                    await queue.cancel(consumer_tag)
+                    await inbox.join()
+                finally:
+                    for task in (*workers, acker):
+                        task.cancel()
+                    await asyncio.gather(*workers, acker, return_exceptions=True)
+                    await tracker.flush()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "handled": self._handled,
+            "failed": self._failed,
+            "retried": self._retried,
+        }
+
+    async def __work(
+        self,
+        inbox: asyncio.Queue[AbstractIncomingMessage],
+        tracker: AckTracker,
+    ) -> None:
+        while True:
+            message = await inbox.get()
+            try:
+                await self.__handle(message)
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                self._failed += 1
+                await self.__settle_failed(message, error, tracker)
+            else:
+                self._handled += 1
+                tracker.handled(message)
+                if tracker.pending >= self.ack_batch_size:
+                    await self.__flush(tracker)
+            finally:
+                inbox.task_done()
+
+    async def __settle_failed(
+        self,
+        message: AbstractIncomingMessage,
+        error: Exception,
+        tracker: AckTracker,
+    ) -> None:
+        """Retry or dead-letter ``message``.
+
+        Errors are logged and never raised: a failed worker would not be
+        replaced, and the consumer would stop once all of them failed.
+        """
+
+        try:
+            retried = await self.__retry(message, error)
+        except Exception:  # pylint: disable=broad-exception-caught
+            self.__logger.exception(
+                "Failed to schedule retry of message %s, it is dead-lettered.",
+                message.message_id or message.delivery_tag,
+            )
+            retried = False
+        if retried:
+            tracker.handled(message)
+            return
+
+        try:
+            await message.reject(requeue=False)
+        except Exception:  # pylint: disable=broad-exception-caught
+            # The channel is broken, unsettled deliveries are redelivered.
+            self.__logger.exception(
+                "Failed to reject message %s.",
+                message.message_id or message.delivery_tag,
+            )
+        # Never block acknowledgement of the deliveries after it.
+        tracker.settled(message)
+
+    async def __flush(self, tracker: AckTracker) -> None:
+        try:
+            await tracker.flush()
+        except Exception:  # pylint: disable=broad-exception-caught
+            # The channel is broken, unacknowledged deliveries are redelivered.
+            self.__logger.exception("Failed to acknowledge messages.")
+
+    async def __retry(self, message: AbstractIncomingMessage, error: Exception) -> bool:
+        """Schedule a delayed retry of ``message``.
+
+        Returns:
+            True if the retry is published, so ``message`` must be
+            acknowledged, False if it must be dead-lettered.
+        """
+
+        message_id = message.message_id or message.delivery_tag
+        attempts = int((message.headers or {}).get(ATTEMPTS_HEADER, 0)) + 1
+        if (
+            not _is_retryable(error)
+            or attempts >= self.max_attempts
+            or not self.retry_delays
+        ):
+            self.__logger.exception(
+                "Failed to handle message %s (attempt %s), it is dead-lettered.",
+                message_id,
+                attempts,
+            )
+            return False
+
+        delay = self.retry_delays[min(attempts, len(self.retry_delays)) - 1]
+        self.__logger.warning(
+            "Failed to handle message %s (attempt %s), retry in %s s: %r",
+            message_id,
+            attempts,
+            delay,
+            error,
+        )
+        try:
+            async with get_connection() as channel:
+                await channel.default_exchange.publish(
+                    aio_pika.Message(
+                        body=message.body,
+                        headers={**(message.headers or {}), ATTEMPTS_HEADER: attempts},
+                        content_type=message.content_type,
+                        message_id=message.message_id,
+                        delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                    ),
+                    routing_key=self.retry_queue(delay),
+                )
+        except (aio_pika.exceptions.AMQPException, OSError, asyncio.TimeoutError):
+            self.__logger.exception(
+                "Failed to schedule retry of message %s, it is dead-lettered.",
+                message_id,
+            )
+            return False
+
+        self._retried += 1
+        return True
+
+    async def __handle(self, message: AbstractIncomingMessage) -> None:
+        body = get_serializer(message.content_type).loads(message.body)
+        if not isinstance(body, dict):
+            raise ValueError(f"Message body must be an object, got {type(body)}.")
+        handler = self.handlers.get(body.get("command"))
+        if handler is None:
+            raise UnknownCommand(f"Unknown command {body.get('command')!r}.")
+        await asyncio.wait_for(handler(body), self.handler_timeout)
+
+    async def __acknowledge(self, tracker: AckTracker) -> None:
+        while True:
+            await asyncio.sleep(self.ack_interval)
+            await self.__flush(tracker)
@@ -0,0 +1,279 @@
+"""Two-tier read-through cache of repository results.
+
+Results are looked up in memory of the worker (L1) first, then in Redis
+(L2), and only then read from the database. Mutating methods invalidate
+affected keys in Redis and publish them, so every worker drops them from
+its L1 too. L1 entries also expire after ``CACHE__L1_TTL_SECONDS``, which
+bounds staleness if an invalidation message is missed.
+
+Models with secrets (e.g. a password hash) are never written to Redis,
+they are cached in L1 only.
+
+A result read from the database is cached only if its key was not
+invalidated since the read began (see :class:`.CacheRepository`), so a
+slow read doesn't cache a stale row. Misses are read from the primary, a
+lagging replica would return the row as of before the invalidation.
+
+Examples:
+    Cache a read and invalidate it on update::
+
+        >>> class UserRepository(Repository):
+        ...     @cached(key=lambda cmd: f"user:{cmd.user_id}", ttl=60)
+        ...     @collect_response
+        ...     async def read(self, cmd: ReadUserCommand) -> User:
+        ...         ...
+        ...
+        ...     @invalidates(keys=lambda user: [f"user:{user.user_id}"])
+        ...     @collect_response
+        ...     async def update(self, cmd: UpdateUserCommand) -> User:
+        ...         ...
+"""
+
+import asyncio
+from functools import wraps
+from logging import Logger
+from typing import Any, Callable, get_type_hints
+
+from pydantic import BaseModel, SecretBytes, SecretStr, TypeAdapter
+from redis import RedisError
+
+from app.internal.pkg.cache.local import LocalCache
+from app.internal.repository.v1.postgresql.unit_of_work import (
+    current_unit_of_work,
+    has_pending_writes,
+)
+from app.internal.repository.v1.redis.cache import CacheRepository
+from app.pkg.connectors.postgresql.replicas import primary_reads
+from app.pkg.logger import get_logger
+from app.pkg.models.v1.exceptions.repository import DriverError
+from app.pkg.settings import settings
+
+__all__ = ["TwoTierCache", "cache", "cached", "invalidates"]
+
+
+def _has_secrets(model: Any) -> bool:
+    """Check that ``model`` has secret fields, e.g. a password hash."""
+
+    return (
+        isinstance(model, type)
+        and issubclass(model, BaseModel)
+        and any(
+            isinstance(field.annotation, type)
+            and issubclass(field.annotation, (SecretBytes, SecretStr))
+            for field in model.model_fields.values()
+        )
+    )
+
+
+class TwoTierCache:
+    """Cache of models in memory of the worker and in Redis.
+
+    Notes:
+        Errors of Redis are logged and never fail the cached call, the
+        database is read instead.
+
+    Attributes:
+        repository: Storage of L2 entries.
+        local: L1 cache.
+        local_ttl: Max lifetime of L1 entries in seconds.
+    """
+
+    __logger: Logger = get_logger(__name__)
+
+    def __init__(self, repository: CacheRepository, local_max_size: int, local_ttl: int):
+        self.repository = repository
+        self.local = LocalCache(local_max_size)
+        self.local_ttl = local_ttl
+        self.remote_hits = 0
+        self.remote_misses = 0
+        self.stale_fills = 0
+
+    async def get(
+        self,
+        key: str,
+        adapter: TypeAdapter,
+        remote: bool = True,
+    ) -> tuple[Any | None, str | None]:
+        """Look up ``key``.
+
+        Args:
+            key: Key of the entry.
+            adapter: Validates values stored in Redis.
+            remote: If False, the entry is cached in L1 only and Redis is
+                asked only for its version.
+
+        Returns:
+            Cached value or None, and on a miss the version of the entry to
+            pass to :meth:`set`. The version is None if Redis failed.
+        """
+
+        value = self.local.get(key)
+        if value is not None:
+            return value, None
+
+        try:
+            if not remote:
+                return None, await self.repository.read_version(key)
+            raw, version = await self.repository.read(key)
+        except (RedisError, DriverError):
+            self.__logger.exception("Failed to read cache entry %s.", key)
+            return None, None
+        if raw is None:
+            self.remote_misses += 1
+            return None, version
+
+        self.remote_hits += 1
+        value = adapter.validate_json(raw)
+        self.local.set(key, value, self.local_ttl)
+        return value, None
+
+    async def set(
+        self,
+        key: str,
+        value: BaseModel,
+        ttl: int,
+        version: str | None,
+        remote: bool = True,
+    ) -> None:
+        """Cache ``value`` unless ``key`` was invalidated since ``version``.
+
+        Args:
+            key: Key of the entry.
+            value: Value read after :meth:`get` returned ``version``.
+            ttl: Lifetime of the entry in seconds.
+            version: Version returned by :meth:`get`. If it's None, Redis
+                is unavailable and the value is cached in L1 only.
+            remote: If False, the value is cached in L1 only.
+        """
+
+        if version is not None:
+            try:
+                if remote:
+                    filled = await self.repository.create(
+                        key,
+                        value.model_dump_json(),
+                        ttl,
+                        version,
+                    )
+                else:
+                    filled = await self.repository.read_version(key) == version
+            except (RedisError, DriverError):
+                self.__logger.exception("Failed to write cache entry %s.", key)
+                return
+            if not filled:
+                self.stale_fills += 1
+                return
+
+        self.local.set(key, value, min(ttl, self.local_ttl))
+
+    async def invalidate(self, keys: list[str]) -> None:
+        for key in keys:
+            self.local.delete(key)
+        try:
+            await self.repository.delete(keys)
+        except (RedisError, DriverError):
+            self.__logger.exception("Failed to invalidate cache entries %s.", keys)
+
+    async def run_sync(self) -> None:
+        """Drop keys invalidated by other workers, run it as background task."""
+
+        while True:
+            try:
+                async for key in self.repository.listen():
+                    self.local.delete(key)
+            except (RedisError, DriverError, OSError):
+                self.__logger.exception("Cache invalidation sync is broken.")
+            # Invalidations may have been missed while disconnected.
+            self.local.clear()
+            await asyncio.sleep(1)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "l1": self.local.stats(),
+            "l2": {
+                "hits": self.remote_hits,
+                "misses": self.remote_misses,
+                "stale_fills": self.stale_fills,
+            },
+        }
+
+
+cache = TwoTierCache(
+    repository=CacheRepository(),
+    local_max_size=settings.CACHE.L1_MAX_SIZE,
+    local_ttl=settings.CACHE.L1_TTL_SECONDS,
+)
+
+
+def cached(key: Callable[..., str], ttl: int):
+    """Read-through caching of a repository method.
+
+    Args:
+        key: Builds cache key from arguments of the method except ``self``.
+        ttl: Lifetime of entries in seconds, 0 disables caching. Models with
+            secrets live in L1, at most ``CACHE__L1_TTL_SECONDS``.
+
+    Returns:
+        Decorator of the method. The method must be annotated by a model.
+    """
+
+    def decorator(fn):
+        if not ttl:
+            return fn
+
+        model = get_type_hints(fn)["return"]
+        adapter = TypeAdapter(model)
+        remote = not _has_secrets(model)
+
+        @wraps(fn)
+        async def inner(self, *args, **kwargs):
+            if has_pending_writes():
+                # Uncommitted writes must neither be hidden nor be cached.
+                return await fn(self, *args, **kwargs)
+
+            cache_key = key(*args, **kwargs)
+            value, version = await cache.get(cache_key, adapter, remote)
+            if value is not None:
+                return value
+
+            # A lagging replica may return the row as of before the
+            # invalidation which bumped ``version``.
+            with primary_reads():
+                value = await fn(self, *args, **kwargs)
+            await cache.set(cache_key, value, ttl, version, remote)
+            return value
+
+        return inner
+
+    return decorator
+
+
+def invalidates(keys: Callable[[Any], list[str]]):
+    """Invalidate cache entries affected by a mutating repository method.
+
+    Args:
+        keys: Builds keys to invalidate from result of the method.
+
+    Notes:
+        Inside :func:`.unit_of_work` entries are invalidated again after
+        commit, since other workers may cache the old row until then.
+
+    Returns:
+        Decorator of the method.
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        async def inner(*args, **kwargs):
+            result = await fn(*args, **kwargs)
+            affected = keys(result)
+            await cache.invalidate(affected)
+
+            uow = current_unit_of_work()
+            if uow is not None:
+                uow.after_commit(lambda: cache.invalidate(affected))
+            return result
+
+        return inner
+
+    return decorator
@@ -6,11 +6,28 @@ from fastapi import Depends
 from app.internal.pkg.jwt.jwt_handler import get_token_from_cookie
 from app.internal.services import Services
 from app.internal.services.v1 import AuthService
+from app.pkg.models import v1 as models
 
 
 @inject
 async def get_current_user_from_auth(
     token: str = Depends(get_token_from_cookie),
     auth_service: AuthService = Depends(Provide[Services.v1.auth_service]),
-):
+) -> models.User:
+    """Full user read from database.
+
+    Use it only for endpoints that need fields missing in
+    :class:`.UserPrincipal`, e.g. password hash.
+    """
+
     return await auth_service.get_current_user(token)
+
+
+@inject
+async def get_current_principal_from_auth(
+    token: str = Depends(get_token_from_cookie),
+    auth_service: AuthService = Depends(Provide[Services.v1.auth_service]),
+) -> models.UserPrincipal:
+    """Authorization data of the user built from access token claims."""
+
+    return await auth_service.get_current_principal(token)
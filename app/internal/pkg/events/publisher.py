@@ -0,0 +1,213 @@
+"""Buffered publisher of events to RabbitMQ.
+
+:meth:`EventPublisher.publish` only puts an event into an in-process
+buffer, so requests don't wait for the broker. A background task flushes
+the buffer in batches, when a batch is full or ``flush_interval`` passed
+since its first event, and retries failed batches with exponential
+backoff. Events which can't be published (broker is down, buffer is full,
+worker is shutting down) are spilled to the outbox and published later by
+:class:`.OutboxRelay`.
+
+Examples:
+    ::
+
+        >>> await event_publisher.publish(event, routing_key="notification_key")
+"""
+
+import asyncio
+import time
+from logging import Logger
+from uuid import uuid4
+
+from aio_pika.exceptions import AMQPException
+
+from app.internal.repository.v1.postgresql.outbox import OutboxRepository
+from app.internal.repository.v1.postgresql.unit_of_work import unit_of_work
+from app.internal.repository.v1.rabbitmq.base_repository import RabbitMQRepository
+from app.pkg.logger import get_logger
+from app.pkg.models import v1 as models
+from app.pkg.models.base import BaseModel
+from app.pkg.settings import settings
+
+__all__ = ["EventPublisher", "event_publisher"]
+
+_PublishErrors = (AMQPException, OSError, asyncio.TimeoutError)
+
+
+class EventPublisher:
+    """Publisher of events with a bounded buffer.
+
+    Attributes:
+        rabbitmq_repository: Publisher of batches with confirms.
+        outbox_repository: Storage of events which can't be published.
+        buffer_size: Max count of buffered events.
+        batch_size: Max count of events in one batch.
+        flush_interval: Max time in seconds an event waits for its batch.
+        max_retries: Count of retries of a failed batch before spilling it.
+        retry_backoff: Delay in seconds before the first retry, doubled for
+            every next one.
+        publish_timeout: Max time in seconds of publishing of a batch.
+    """
+
+    __logger: Logger = get_logger(__name__)
+
+    def __init__(
+        self,
+        rabbitmq_repository: RabbitMQRepository,
+        outbox_repository: OutboxRepository,
+        buffer_size: int,
+        batch_size: int,
+        flush_interval: float,
+        max_retries: int,
+        retry_backoff: float,
+        publish_timeout: float,
+    ):
+        self.rabbitmq_repository = rabbitmq_repository
+        self.outbox_repository = outbox_repository
+        self.buffer_size = buffer_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.publish_timeout = publish_timeout
+        self._buffer: asyncio.Queue[models.OutboxCreateCommand] = asyncio.Queue(
+            maxsize=buffer_size,
+        )
+        #: Batch being published, kept to be drained if the task is cancelled.
+        self._batch: list[models.OutboxCreateCommand] = []
+        self._published = 0
+        self._spilled = 0
+        self._failures = 0
+
+    async def publish(self, message: BaseModel, routing_key: str) -> None:
+        """Buffer ``message`` for publishing.
+
+        If the buffer is full, the message is written to the outbox instead.
+
+        Args:
+            message: Event. Its ``event_id`` is kept, if it has one.
+            routing_key: Routing key of the event.
+
+        Raises:
+            DriverError: The buffer is full and writing to the outbox failed.
+        """
+
+        event = models.OutboxCreateCommand(
+            event_id=getattr(message, "event_id", None) or uuid4(),
+            routing_key=routing_key,
+            payload=message.model_dump(mode="json"),
+        )
+        try:
+            self._buffer.put_nowait(event)
+        except asyncio.QueueFull:
+            self.__logger.warning("Event buffer is full, event is spilled to outbox.")
+            await self.__spill([event])
+
+    async def run(self) -> None:
+        """Flush the buffer until cancelled, run it as background task."""
+
+        while True:
+            self._batch = [await self._buffer.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    self._batch.append(
+                        await asyncio.wait_for(self._buffer.get(), timeout),
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self.__flush(self._batch)
+            except Exception:  # pylint: disable=broad-exception-caught
+                # Any error must not stop the loop, or later events are lost.
+                self._failures += 1
+                self.__logger.exception(
+                    "Failed to flush %s events, they are spilled to outbox.",
+                    len(self._batch),
+                )
+                await self.__try_spill(self._batch)
+            self._batch = []
+
+    async def drain(self) -> None:
+        """Publish or spill all buffered events, call it on shutdown after
+        the task of :meth:`run` is cancelled."""
+
+        events = self._batch
+        self._batch = []
+        while not self._buffer.empty():
+            events.append(self._buffer.get_nowait())
+
+        for i in range(0, len(events), self.batch_size):
+            batch = events[i : i + self.batch_size]
+            try:
+                await self.__publish(batch)
+            except _PublishErrors:
+                self.__logger.exception("Failed to publish events on shutdown.")
+                await self.__try_spill(batch)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "buffered": self._buffer.qsize(),
+            "buffer_size": self.buffer_size,
+            "published": self._published,
+            "spilled": self._spilled,
+            "failures": self._failures,
+        }
+
+    async def __flush(self, batch: list[models.OutboxCreateCommand]) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.__publish(batch)
+                return
+            except _PublishErrors:
+                self._failures += 1
+                self.__logger.exception(
+                    "Failed to publish %s events, attempt %s.",
+                    len(batch),
+                    attempt + 1,
+                )
+            if attempt < self.max_retries:
+                await asyncio.sleep(self.retry_backoff * 2**attempt)
+
+        await self.__try_spill(batch)
+
+    async def __publish(self, batch: list[models.OutboxCreateCommand]) -> None:
+        await asyncio.wait_for(
+            self.rabbitmq_repository.publish_batch(
+                [(event.payload, event.routing_key) for event in batch],
+            ),
+            self.publish_timeout,
+        )
+        self._published += len(batch)
+
+    async def __try_spill(self, batch: list[models.OutboxCreateCommand]) -> None:
+        try:
+            await self.__spill(batch)
+        except Exception:  # pylint: disable=broad-exception-caught
+            self.__logger.exception(
+                "Failed to spill %s events, they are lost.",
+                len(batch),
+            )
+
+    async def __spill(self, batch: list[models.OutboxCreateCommand]) -> None:
+        # Spilled events must not be rolled back with the request publishing them.
+        async with unit_of_work(join=False):
+            for event in batch:
+                await self.outbox_repository.create(cmd=event)
+        self._spilled += len(batch)
+
+
+event_publisher = EventPublisher(
+    rabbitmq_repository=RabbitMQRepository(),
+    outbox_repository=OutboxRepository(),
+    buffer_size=settings.PUBLISHER.BUFFER_SIZE,
+    batch_size=settings.PUBLISHER.BATCH_SIZE,
+    flush_interval=settings.PUBLISHER.FLUSH_INTERVAL_SECONDS,
+    max_retries=settings.PUBLISHER.MAX_RETRIES,
+    retry_backoff=settings.PUBLISHER.RETRY_BACKOFF_SECONDS,
+    publish_timeout=settings.PUBLISHER.PUBLISH_TIMEOUT_SECONDS,
+)
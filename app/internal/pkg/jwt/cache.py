@@ -0,0 +1,87 @@
+"""In-process cache of verified access tokens."""
+
+import hashlib
+import time
+from collections import OrderedDict
+
+from app.pkg.settings import settings
+
+__all__ = ["TokenCache", "access_token_cache"]
+
+
+class TokenCache:
+    """LRU cache of decoded payloads of verified tokens.
+
+    Payload is kept until ``exp`` claim of its token, so a cached token
+    never outlives its signature check. Tokens are stored by digest, the
+    token itself is never kept in memory.
+
+    Notes:
+        The cache is used from the event loop only, so it has no locks.
+        Returned payloads are shared, callers must not mutate them.
+
+    Attributes:
+        max_size: Max count of cached tokens.
+        hits: Count of lookups answered by the cache.
+        misses: Count of lookups not answered by the cache.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+
+    def get(self, token: str) -> dict | None:
+        """Payload of ``token`` if it was verified and not expired yet."""
+
+        key = self.__key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, payload = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def put(self, token: str, payload: dict) -> None:
+        """Remember verified ``payload`` of ``token`` until its ``exp``."""
+
+        expires_at = payload.get("exp")
+        if not isinstance(expires_at, (int, float)) or self.max_size <= 0:
+            return
+
+        key = self.__key(token)
+        self._entries[key] = (expires_at, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int | float]:
+        """Snapshot of size and hit ratio of the cache."""
+
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    @staticmethod
+    def __key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+access_token_cache = TokenCache(max_size=settings.JWT.TOKEN_CACHE_SIZE)
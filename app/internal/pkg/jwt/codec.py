@@ -0,0 +1,189 @@
+"""Codec of HMAC-signed JWT (HS256, HS384, HS512).
+
+Replaces ``python-jose`` for tokens signed by shared secret. Everything
+that does not depend on a token is prepared once per codec: encoded header,
+HMAC object keyed by the secret, expected length of signature. Malformed
+tokens are rejected by cheap structural checks before any cryptography
+and JSON parsing.
+
+Tokens are compatible with ``python-jose`` in both directions: header is
+serialized the same way and standard claims ``exp`` and ``nbf`` are
+checked the same way.
+"""
+
+import base64
+import binascii
+import calendar
+import hashlib
+import hmac
+import json
+import math
+import time
+from datetime import datetime
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+__all__ = ["HMACCodec"]
+
+_Model = TypeVar("_Model", bound=BaseModel)
+
+_DIGESTS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return calendar.timegm(value.utctimetuple())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class HMACCodec:
+    """Encode and verify JWT signed by HMAC with a single secret.
+
+    Attributes:
+        algorithm: One of ``HS256``, ``HS384``, ``HS512``.
+        max_token_length: Longer tokens are rejected without decoding.
+    """
+
+    def __init__(
+        self,
+        secret: str | bytes,
+        algorithm: str = "HS256",
+        max_token_length: int = 8192,
+    ):
+        if algorithm not in _DIGESTS:
+            raise ValueError(f"Unsupported HMAC algorithm {algorithm!r}.")
+        if isinstance(secret, str):
+            secret = secret.encode()
+
+        self.algorithm = algorithm
+        self.max_token_length = max_token_length
+
+        digest = _DIGESTS[algorithm]
+        self._mac = hmac.new(secret, digestmod=digest)
+        self._signature_length = math.ceil(digest().digest_size * 4 / 3)
+        self._header = _b64encode(
+            json.dumps(
+                {"alg": algorithm, "typ": "JWT"},
+                separators=(",", ":"),
+                sort_keys=True,
+            ).encode(),
+        )
+        self._header_str = self._header.decode("ascii")
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        """Sign ``claims``.
+
+        Args:
+            claims: JSON serializable claims. ``datetime`` values are
+                converted to unix timestamps.
+
+        Returns:
+            Encoded token.
+        """
+
+        payload = _b64encode(
+            json.dumps(
+                claims,
+                separators=(",", ":"),
+                default=_json_default,
+            ).encode(),
+        )
+        signing_input = self._header + b"." + payload
+        return (signing_input + b"." + self.__sign(signing_input)).decode("ascii")
+
+    def decode(self, token: str) -> dict[str, Any] | None:
+        """Verify ``token`` and return its claims.
+
+        Args:
+            token: Encoded token.
+
+        Returns:
+            Claims, or None if the token is malformed, has invalid signature,
+            is expired or is not valid yet.
+        """
+
+        if (
+            not isinstance(token, str)
+            or len(token) > self.max_token_length
+            or not token.isascii()
+            or token.count(".") != 2
+        ):
+            return None
+
+        header, _, rest = token.partition(".")
+        payload_segment, _, signature = rest.rpartition(".")
+        if len(signature) != self._signature_length:
+            return None
+        if header != self._header_str and not self.__accepts_header(header):
+            return None
+
+        signing_input = token[: len(header) + 1 + len(payload_segment)].encode()
+        if not hmac.compare_digest(self.__sign(signing_input), signature.encode()):
+            return None
+
+        try:
+            claims = json.loads(_b64decode(payload_segment))
+        except (ValueError, binascii.Error):
+            return None
+        if not isinstance(claims, dict) or not self.__is_in_time(claims):
+            return None
+        return claims
+
+    def decode_as(self, token: str, model: type[_Model]) -> _Model | None:
+        """Verify ``token`` and validate its claims by ``model``.
+
+        Returns:
+            Claims as ``model``, or None if the token or its claims are invalid.
+        """
+
+        claims = self.decode(token)
+        if claims is None:
+            return None
+        try:
+            return model.model_validate(claims)
+        except ValidationError:
+            return None
+
+    def __sign(self, signing_input: bytes) -> bytes:
+        mac = self._mac.copy()
+        mac.update(signing_input)
+        return _b64encode(mac.digest())
+
+    def __accepts_header(self, header: str) -> bool:
+        """Check header serialized differently from ours, e.g. with other
+        order of keys."""
+
+        try:
+            parsed = json.loads(_b64decode(header))
+        except (ValueError, binascii.Error):
+            return False
+        return (
+            isinstance(parsed, dict)
+            and parsed.get("alg") == self.algorithm
+            and parsed.get("typ", "JWT") == "JWT"
+            and "crit" not in parsed
+        )
+
+    @staticmethod
+    def __is_in_time(claims: dict[str, Any]) -> bool:
+        now = time.time()
+        exp = claims.get("exp")
+        if exp is not None and (not isinstance(exp, (int, float)) or exp <= now):
+            return False
+        nbf = claims.get("nbf")
+        if nbf is not None and (not isinstance(nbf, (int, float)) or nbf > now):
+            return False
+        return True
@@ -1,18 +1,49 @@
 """"""
 
+import time
 from datetime import datetime, timedelta, timezone
 from logging import Logger
+from uuid import uuid4
 
 from fastapi import HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from pydantic import ValidationError
 
+from app.internal.pkg.jwt.cache import access_token_cache
+from app.internal.pkg.jwt.codec import HMACCodec
+from app.internal.pkg.jwt.keys import key_ring
 from app.internal.repository.v1.postgresql import UserRepository
 from app.pkg.logger import get_logger
+from app.pkg.models import v1 as models
 from app.pkg.settings import settings
 
+__all__ = ["JWTHandler", "ACCESS_CLAIMS_VERSION", "get_token_from_cookie"]
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 
+#: int: Version of the claim set embedded into access tokens.
+#  Bump it when the claim set changes, tokens of other versions are
+#  authorized by reading the user from database.
+ACCESS_CLAIMS_VERSION = 1
+
+
+def _is_symmetric(algorithm: str) -> bool:
+    return algorithm.startswith("HS")
+
+
+#: HMACCodec | None: Codec of access tokens if they are signed by shared secret.
+_access_codec = (
+    HMACCodec(settings.JWT.SECRET_KEY.get_secret_value(), settings.JWT.ALGORITHM)
+    if _is_symmetric(settings.JWT.ALGORITHM)
+    else None
+)
+#: HMACCodec: Codec of refresh tokens.
+_refresh_codec = HMACCodec(
+    settings.JWT.REFRESH_SECRET_KEY.get_secret_value(),
+    settings.JWT.REFRESH_ALGORITHM,
+)
+
 
 async def get_token_from_cookie(request: Request) -> str:
     token = request.cookies.get("access_token")
@@ -32,45 +63,141 @@ class JWTHandler:
     __logger: Logger = get_logger(__name__)
 
     @staticmethod
-    def _create_token(
-        data: dict,
-        expires_delta: timedelta,
-        secret_key: str,
-        algorithm: str,
-    ) -> str:
+    def _with_expiration(data: dict, expires_delta: timedelta) -> dict:
         to_encode = data.copy()
         expire = datetime.now(timezone.utc) + expires_delta
         to_encode.update({"exp": expire})
-        return jwt.encode(to_encode, secret_key, algorithm=algorithm)
+        return to_encode
 
     @staticmethod
-    def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
-        return JWTHandler._create_token(
-            data=data,
+    def create_access_token(
+        user: models.UserPrincipal | models.UserResponse | models.User,
+        expires_delta: timedelta = None,
+    ) -> str:
+        """Create access token with authorization claims of ``user``.
+
+        Args:
+            user: User the token is issued for.
+            expires_delta: Lifetime of the token.
+
+        Returns:
+            Encoded access token.
+        """
+
+        claims = models.AccessTokenClaims(
+            claims_version=ACCESS_CLAIMS_VERSION,
+            user_id=user.user_id,
+            user_service_role=user.user_service_role,
+            user_is_active=user.user_is_active,
+            user_is_verified=user.user_is_verified,
+        )
+        to_encode = JWTHandler._with_expiration(
+            data=claims.model_dump(mode="json", by_alias=True),
             expires_delta=expires_delta
             or timedelta(minutes=settings.JWT.ACCESS_TOKEN_EXPIRE_MINUTES),
-            secret_key=settings.JWT.SECRET_KEY.get_secret_value(),
+        )
+        # Id and issue time (with milliseconds) make the token revocable,
+        # see :class:`.RevocationList`.
+        to_encode.update({"jti": uuid4().hex, "iat": round(time.time(), 3)})
+        if _access_codec is not None:
+            return _access_codec.encode(to_encode)
+
+        signing_key = key_ring.signing_key
+        return jwt.encode(
+            to_encode,
+            signing_key.private_pem,
             algorithm=settings.JWT.ALGORITHM,
+            headers={"kid": signing_key.kid},
         )
 
     @staticmethod
     def create_refresh_token(data: dict, expires_delta: timedelta = None) -> str:
-        return JWTHandler._create_token(
-            data=data,
-            expires_delta=expires_delta
-            or timedelta(days=settings.JWT.REFRESH_TOKEN_EXPIRE_DAYS),
-            secret_key=settings.JWT.REFRESH_SECRET_KEY.get_secret_value(),
-            algorithm=settings.JWT.ALGORITHM,
+        return _refresh_codec.encode(
+            JWTHandler._with_expiration(
+                data=data,
+                expires_delta=expires_delta
+                or timedelta(days=settings.JWT.REFRESH_TOKEN_EXPIRE_DAYS),
+            ),
         )
 
+    @staticmethod
+    def decode_refresh_token(token: str) -> models.RefreshTokenClaims | None:
+        """Verify signature and expiration of refresh token.
+
+        Notes:
+            It does not check that the token is not revoked, see
+            :class:`.RefreshTokenRepository`.
+
+        Args:
+            token: Encoded refresh token.
+
+        Returns:
+            Claims of the token, or None if the token is invalid.
+        """
+
+        return _refresh_codec.decode_as(token, models.RefreshTokenClaims)
+
     @staticmethod
     def decode_access_token(token: str) -> dict | None:
+        """Verify signature and expiration of access token.
+
+        Tokens signed by asymmetric algorithm are verified by the key from
+        their ``kid`` header, so tokens signed by a previous key are still
+        accepted while that key is published.
+
+        Verified payloads are cached until expiration of the token, so
+        repeated requests with the same token skip parsing and signature
+        check.
+
+        Args:
+            token: Encoded access token.
+
+        Returns:
+            Payload of the token, or None if the token is invalid.
+        """
+
+        payload = access_token_cache.get(token)
+        if payload is not None:
+            return payload
+
+        if _access_codec is not None:
+            payload = _access_codec.decode(token)
+        else:
+            payload = JWTHandler.__decode_asymmetric(token)
+
+        if payload is not None:
+            access_token_cache.put(token, payload)
+        return payload
+
+    @staticmethod
+    def __decode_asymmetric(token: str) -> dict | None:
         try:
-            payload = jwt.decode(
+            kid = jwt.get_unverified_header(token).get("kid")
+            verification_key = key_ring.verification_key(kid)
+            if verification_key is None:
+                return None
+            return jwt.decode(
                 token,
-                settings.JWT.SECRET_KEY.get_secret_value(),
+                verification_key.public_jwk,
                 algorithms=[settings.JWT.ALGORITHM],
             )
-            return payload
         except JWTError:
             return None
+
+    @staticmethod
+    def claims_from_payload(payload: dict) -> models.AccessTokenClaims | None:
+        """Read authorization claims from decoded access token payload.
+
+        Args:
+            payload: Payload returned by :meth:`.decode_access_token`.
+
+        Returns:
+            Claims, or None if the token carries a claim set of another version.
+        """
+
+        if payload.get("cv") != ACCESS_CLAIMS_VERSION:
+            return None
+        try:
+            return models.AccessTokenClaims.model_validate(payload)
+        except ValidationError:
+            return None
@@ -0,0 +1,178 @@
+"""Key ring of asymmetric keys for signing access tokens.
+
+Private keys are read from :attr:`.JWTSettings.KEYS_DIR`, one PEM file per
+key. The file name is the key id (``kid``) and has form
+``<created unix timestamp>-<suffix>.pem``, see
+``scripts/generate_jwt_key.py``. So every pod sharing the directory comes
+to the same decision about which key signs tokens:
+
+* a key is published in JWKS right away, but signs tokens only after
+  ``KEY_ACTIVATION_DELAY_SECONDS``, so verifiers have refreshed their JWKS
+  cache before the first token signed by it shows up;
+* the newest activated key signs tokens;
+* an older key is still published and accepted until tokens signed by
+  it expired, then it's retired.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from logging import Logger
+from pathlib import Path
+
+from jose import jwk
+
+from app.pkg.logger import get_logger
+from app.pkg.settings import settings
+
+__all__ = ["SigningKey", "KeyRing", "key_ring"]
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    """Single asymmetric key.
+
+    Attributes:
+        kid: Key id, written into ``kid`` header of tokens.
+        private_pem: Private key in PEM.
+        public_jwk: Public key in JWK format.
+        activate_at: Unix timestamp since which the key signs tokens.
+    """
+
+    kid: str
+    private_pem: str
+    public_jwk: dict
+    activate_at: float
+
+
+class KeyRing:
+    """Keys for signing and verification of access tokens.
+
+    Attributes:
+        keys_dir: Directory with private keys.
+        algorithm: Signing algorithm, e.g. ``RS256``.
+        activation_delay: Seconds between creation and activation of a key.
+        retention: Seconds an older key is kept after a newer one activated.
+    """
+
+    __logger: Logger = get_logger(__name__)
+
+    def __init__(
+        self,
+        keys_dir: str | None,
+        algorithm: str,
+        activation_delay: float,
+        retention: float,
+    ):
+        self.keys_dir = keys_dir
+        self.algorithm = algorithm
+        self.activation_delay = activation_delay
+        self.retention = retention
+        self._keys: dict[str, SigningKey] = {}
+        self._signing_key: SigningKey | None = None
+        self._jwks = b'{"keys":[]}'
+        self._jwks_etag = self.__etag(self._jwks)
+
+    @property
+    def signing_key(self) -> SigningKey:
+        """Key that signs new tokens."""
+
+        if self._signing_key is None:
+            self.reload()
+        if self._signing_key is None:
+            raise RuntimeError(f"No signing keys found in {self.keys_dir!r}.")
+        return self._signing_key
+
+    def verification_key(self, kid: str) -> SigningKey | None:
+        """Key accepted for verification of tokens with ``kid`` header."""
+
+        if not self._keys:
+            self.reload()
+        return self._keys.get(kid)
+
+    def jwks(self) -> tuple[bytes, str]:
+        """Serialized JWK set of all published keys and its ETag.
+
+        The body is built once per reload, not per request.
+        """
+
+        if not self._keys:
+            self.reload()
+        return self._jwks, self._jwks_etag
+
+    def reload(self) -> None:
+        """Read keys from :attr:`keys_dir` and decide on signing key."""
+
+        if not self.keys_dir:
+            return
+
+        now = time.time()
+        keys = sorted(
+            (self.__load(path) for path in Path(self.keys_dir).glob("*.pem")),
+            key=lambda key: key.activate_at,
+        )
+        if not keys:
+            self.__logger.error("No signing keys found in %s.", self.keys_dir)
+            return
+
+        activated = [key for key in keys if key.activate_at <= now]
+        # On the very first deployment there is no activated key yet.
+        signing_key = activated[-1] if activated else keys[0]
+
+        published = {}
+        for key, successor in zip(keys, [*keys[1:], None]):
+            if (
+                key.activate_at < signing_key.activate_at
+                and successor is not None
+                and successor.activate_at + self.retention < now
+            ):
+                continue
+            published[key.kid] = key
+
+        if self._signing_key is None or self._signing_key.kid != signing_key.kid:
+            self.__logger.info("Access tokens are signed by key %s.", signing_key.kid)
+
+        self._keys = published
+        self._signing_key = signing_key
+        self._jwks = json.dumps(
+            {"keys": [key.public_jwk for key in published.values()]},
+            separators=(",", ":"),
+        ).encode()
+        self._jwks_etag = self.__etag(self._jwks)
+
+    async def run_rotation(self, interval: float) -> None:
+        """Reload keys every ``interval`` seconds, run it as background task."""
+
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.reload()
+            except (OSError, ValueError):
+                self.__logger.exception("Failed to reload signing keys.")
+
+    @staticmethod
+    def __etag(body: bytes) -> str:
+        return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+    def __load(self, path: Path) -> SigningKey:
+        private_pem = path.read_text()
+        created_at = float(path.stem.split("-", 1)[0])
+        public_jwk = jwk.construct(private_pem, self.algorithm).public_key().to_dict()
+        public_jwk.update({"kid": path.stem, "use": "sig", "alg": self.algorithm})
+        return SigningKey(
+            kid=path.stem,
+            private_pem=private_pem,
+            public_jwk=public_jwk,
+            activate_at=created_at + self.activation_delay,
+        )
+
+
+key_ring = KeyRing(
+    keys_dir=settings.JWT.KEYS_DIR,
+    algorithm=settings.JWT.ALGORITHM,
+    activation_delay=settings.JWT.KEY_ACTIVATION_DELAY_SECONDS,
+    retention=settings.JWT.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    + settings.JWT.KEY_ACTIVATION_DELAY_SECONDS,
+)
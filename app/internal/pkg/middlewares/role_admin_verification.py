@@ -28,8 +28,8 @@ async def user_role_verification(
 ) -> None:
     if user_id is not None:
         try:
-            user: models.UserResponse = (
-                await user_service.user_repository.get_user_by_id(
+            user: models.UserPrincipal = (
+                await user_service.user_repository.get_user_principal_by_id(
                     cmd=models.UserReadByIDCommand(
                         user_id=UUID(user_id),
                     ),
@@ -0,0 +1,25 @@
+"""Request-scoped unit of work for postgresql repositories."""
+
+from typing import AsyncIterator
+
+from app.internal.repository.v1.postgresql.unit_of_work import unit_of_work
+
+__all__ = ["request_unit_of_work"]
+
+
+async def request_unit_of_work() -> AsyncIterator[None]:
+    """Share one database session between repository calls of a request.
+
+    The session is opened by the first repository call, committed after
+    the endpoint returns and rolled back if it raises.
+
+    Examples:
+        ::
+
+            >>> from fastapi import APIRouter, Depends
+            >>>
+            >>> router = APIRouter(dependencies=[Depends(request_unit_of_work)])
+    """
+
+    async with unit_of_work():
+        yield
@@ -0,0 +1,203 @@
+"""Relay of the outbox of events to RabbitMQ.
+
+Services write events to the outbox in the transaction of the change they
+describe (see :class:`.OutboxRepository`), so an event exists if and only
+if the change was committed, and requests never wait for the broker. The
+relay of every worker locks a batch of pending events with ``SKIP
+LOCKED``, publishes it with confirms and marks it sent in one transaction.
+
+If the transaction fails after publishing, the batch is published again,
+so events are delivered at least once; consumers deduplicate them by
+``event_id``.
+
+If a batch fails, its events are published one at a time, so an event
+which can't be published (e.g. rejected by the broker) doesn't block the
+others. Its failures are counted, and after ``max_attempts`` of them it's
+quarantined: left in the outbox unsent and skipped by relays. If every
+event of the batch fails, the broker is more likely down than all events
+broken, and failures are not counted.
+"""
+
+import asyncio
+import time
+from datetime import timedelta
+from logging import Logger
+
+from app.internal.repository.v1.postgresql.outbox import OutboxRepository
+from app.internal.repository.v1.postgresql.unit_of_work import unit_of_work
+from app.internal.repository.v1.rabbitmq.base_repository import RabbitMQRepository
+from app.pkg.logger import get_logger
+from app.pkg.models import v1 as models
+from app.pkg.settings import settings
+
+__all__ = ["OutboxRelay", "outbox_relay"]
+
+
+class OutboxRelay:
+    """Publisher of pending events of the outbox.
+
+    Attributes:
+        outbox_repository: Storage of events.
+        rabbitmq_repository: Publisher of events.
+        batch_size: Max count of events published in one transaction.
+        poll_interval: Interval in seconds of polling when idle.
+        retention: Lifetime of published events.
+        max_attempts: Count of failed publications after which an event is
+            quarantined.
+    """
+
+    __logger: Logger = get_logger(__name__)
+
+    #: Interval in seconds of deletion of old published events.
+    purge_interval = 3600
+
+    def __init__(
+        self,
+        outbox_repository: OutboxRepository,
+        rabbitmq_repository: RabbitMQRepository,
+        batch_size: int,
+        poll_interval: float,
+        retention: timedelta,
+        max_attempts: int,
+    ):
+        self.outbox_repository = outbox_repository
+        self.rabbitmq_repository = rabbitmq_repository
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.max_attempts = max_attempts
+        self._wakeup = asyncio.Event()
+        self._published = 0
+        self._failures = 0
+        self._quarantined = 0
+
+    async def wake(self) -> None:
+        """Publish pending events now instead of at the next poll.
+
+        Register it as :meth:`.UnitOfWork.after_commit` callback of units
+        writing to the outbox.
+        """
+
+        self._wakeup.set()
+
+    async def relay_batch(self) -> int:
+        """Publish one batch of pending events.
+
+        Returns:
+            Count of published events.
+        """
+
+        async with unit_of_work():
+            events = await self.outbox_repository.read_pending(
+                self.batch_size,
+                max_attempts=self.max_attempts,
+            )
+            if not events:
+                return 0
+
+            try:
+                await self.rabbitmq_repository.publish_batch(
+                    [(event.payload, event.routing_key) for event in events],
+                )
+            except Exception:  # pylint: disable=broad-exception-caught
+                self.__logger.exception(
+                    "Failed to publish outbox batch, publishing events one by one.",
+                )
+                sent = await self.__publish_one_by_one(events)
+            else:
+                sent = events
+
+            await self.outbox_repository.mark_sent(
+                [event.event_id for event in sent],
+            )
+
+        self._published += len(sent)
+        return len(sent)
+
+    async def __publish_one_by_one(
+        self,
+        events: list[models.OutboxEvent],
+    ) -> list[models.OutboxEvent]:
+        """Publish ``events`` separately and count failures of each.
+
+        Returns:
+            Published events.
+
+        Raises:
+            Exception: Every event failed, the error of the first one.
+        """
+
+        sent, failed, error = [], [], None
+        for event in events:
+            try:
+                await self.rabbitmq_repository.publish_batch(
+                    [(event.payload, event.routing_key)],
+                )
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                failed.append(event)
+                error = error or exc
+            else:
+                sent.append(event)
+
+        if not sent:
+            raise error
+
+        await self.outbox_repository.mark_failed(
+            [event.event_id for event in failed],
+        )
+        for event in failed:
+            if event.attempts + 1 >= self.max_attempts:
+                self._quarantined += 1
+                self.__logger.error(
+                    "Outbox event %s is quarantined after %s failed attempts.",
+                    event.event_id,
+                    self.max_attempts,
+                )
+        return sent
+
+    async def run(self) -> None:
+        """Publish events until cancelled, run it as background task."""
+
+        purged_at = 0.0
+        while True:
+            try:
+                published = await self.relay_batch()
+                if time.monotonic() - purged_at > self.purge_interval:
+                    await self.outbox_repository.delete_sent(
+                        retention=self.retention,
+                    )
+                    purged_at = time.monotonic()
+            except Exception:  # pylint: disable=broad-exception-caught
+                # Any error must not stop the relay, or events pile up unsent.
+                self._failures += 1
+                self.__logger.exception("Failed to relay outbox events.")
+                # Wake-ups by new events must not turn it into a busy loop.
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            if published < self.batch_size:
+                await self.__wait()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "published": self._published,
+            "failures": self._failures,
+            "quarantined": self._quarantined,
+        }
+
+    async def __wait(self) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+
+outbox_relay = OutboxRelay(
+    outbox_repository=OutboxRepository(),
+    rabbitmq_repository=RabbitMQRepository(),
+    batch_size=settings.OUTBOX.BATCH_SIZE,
+    poll_interval=settings.OUTBOX.POLL_INTERVAL_SECONDS,
+    retention=timedelta(hours=settings.OUTBOX.RETENTION_HOURS),
+    max_attempts=settings.OUTBOX.MAX_ATTEMPTS,
+)
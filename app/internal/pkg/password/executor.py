@@ -0,0 +1,205 @@
+"""Async API for password hashing backed by a pool of worker processes.
+
+Password hashing is CPU bound and slow by design, so calling it on the event loop
+stalls every other request of the worker. All hashing and verification
+work is sent to a dedicated process pool instead. Access to the pool is
+granted by :class:`.PasswordScheduler`, so login verification always
+goes ahead of hashing of new passwords.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from logging import Logger
+from typing import Any, Callable, TypeVar
+
+from pydantic import SecretBytes
+
+from app.internal.pkg.password.hashers import (
+    Argon2Hasher,
+    BcryptHasher,
+    PasswordHasher,
+    PasswordHashers,
+)
+from app.internal.pkg.password.scheduler import (
+    LaneLimits,
+    PasswordLane,
+    PasswordScheduler,
+)
+from app.pkg.logger import get_logger
+from app.pkg.models.v1.exceptions.password import PasswordHashingUnavailable
+from app.pkg.settings import settings
+
+__all__ = [
+    "PasswordExecutor",
+    "PasswordLane",
+    "password_executor",
+    "password_hashers",
+    "hash_password",
+    "verify_password",
+    "password_needs_rehash",
+]
+
+_T = TypeVar("_T")
+
+
+class PasswordExecutor:
+    """Run password functions in a pool of worker processes.
+
+    Count of running jobs never exceeds count of workers, so the pool has
+    no internal queue and the order of jobs is decided by ``scheduler``.
+
+    Notes:
+        If the awaiting coroutine is cancelled (e.g. client disconnected)
+        while its job is still waiting for a slot, the job is never
+        executed.
+
+    Attributes:
+        max_workers: Count of worker processes.
+        scheduler: Scheduler which hands out worker slots.
+    """
+
+    __logger: Logger = get_logger(__name__)
+
+    def __init__(self, max_workers: int, scheduler: PasswordScheduler):
+        self.max_workers = max_workers
+        self.scheduler = scheduler
+        self._pool: ProcessPoolExecutor | None = None
+
+    async def run(self, lane: PasswordLane, fn: Callable[..., _T], *args: Any) -> _T:
+        """Run ``fn`` in the pool and wait for its result.
+
+        Args:
+            lane: Lane of the job.
+            fn: Picklable function or bound method of picklable object.
+            *args: Picklable positional arguments for ``fn``.
+
+        Raises:
+            PasswordHashingUnavailable: Job was shed by scheduler or pool is broken.
+
+        Returns:
+            Result of ``fn``.
+        """
+
+        async with self.scheduler.slot(lane):
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.__get_pool(), fn, *args)
+            except BrokenProcessPool as exc:
+                self.__logger.exception("Password hashing pool is broken.")
+                self.shutdown()
+                raise PasswordHashingUnavailable from exc
+
+    def shutdown(self) -> None:
+        """Stop worker processes and drop all queued jobs."""
+
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def __get_pool(self) -> ProcessPoolExecutor:
+        """Lazily start worker processes on the first job."""
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+
+def _build_executor() -> PasswordExecutor:
+    """Build executor from :attr:`.Settings.PASSWORD`."""
+
+    conf = settings.PASSWORD
+    workers = conf.WORKERS or os.cpu_count() or 1
+    scheduler = PasswordScheduler(
+        capacity=workers,
+        lanes={
+            PasswordLane.LOGIN: LaneLimits(
+                max_concurrency=conf.LOGIN_MAX_CONCURRENCY or workers,
+                wait_budget=conf.LOGIN_WAIT_BUDGET,
+            ),
+            PasswordLane.VERIFY: LaneLimits(
+                max_concurrency=conf.VERIFY_MAX_CONCURRENCY or workers,
+                wait_budget=conf.VERIFY_WAIT_BUDGET,
+            ),
+            PasswordLane.HASH: LaneLimits(
+                max_concurrency=conf.HASH_MAX_CONCURRENCY or max(1, workers // 2),
+                wait_budget=conf.HASH_WAIT_BUDGET,
+            ),
+        },
+    )
+    return PasswordExecutor(max_workers=workers, scheduler=scheduler)
+
+
+def _build_hashers() -> PasswordHashers:
+    """Build hashers from :attr:`.Settings.PASSWORD`."""
+
+    conf = settings.PASSWORD
+    hashers: dict[str, PasswordHasher] = {
+        "argon2id": Argon2Hasher(
+            time_cost=conf.ARGON2_TIME_COST,
+            memory_cost=conf.ARGON2_MEMORY_COST,
+            parallelism=conf.ARGON2_PARALLELISM,
+        ),
+        "bcrypt": BcryptHasher(rounds=conf.BCRYPT_ROUNDS),
+    }
+    default = hashers.pop(conf.ALGORITHM)
+    return PasswordHashers(default=default, legacy=list(hashers.values()))
+
+
+password_executor = _build_executor()
+password_hashers = _build_hashers()
+
+
+async def hash_password(password: bytes) -> str:
+    """Hash raw password in the pool.
+
+    Args:
+        password: Raw password in bytes.
+
+    Returns:
+        Hashed password ready to be stored.
+    """
+
+    return await password_executor.run(
+        PasswordLane.HASH,
+        password_hashers.hash,
+        password,
+    )
+
+
+async def verify_password(
+    password: SecretBytes,
+    hashed: SecretBytes,
+    lane: PasswordLane = PasswordLane.VERIFY,
+) -> bool:
+    """Check equality of hashed and raw password in the pool.
+
+    Args:
+        password: Raw password.
+        hashed: Hashed password.
+        lane: Lane of the job. Use ``PasswordLane.LOGIN`` on login.
+
+    Returns:
+        True if equality check passed, False otherwise.
+    """
+
+    return await password_executor.run(
+        lane,
+        password_hashers.verify,
+        password.get_secret_value(),
+        hashed.get_secret_value().decode(),
+    )
+
+
+def password_needs_rehash(hashed: SecretBytes) -> bool:
+    """Check that ``hashed`` was created by outdated algorithm or parameters.
+
+    Args:
+        hashed: Hashed password.
+
+    Returns:
+        True if password must be hashed again, False otherwise.
+    """
+
+    return password_hashers.needs_rehash(hashed.get_secret_value().decode())
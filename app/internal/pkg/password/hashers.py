@@ -0,0 +1,176 @@
+"""Pluggable password hashers.
+
+New passwords are hashed by the default hasher, while hashes created by
+any registered legacy hasher can still be verified and are reported by
+:meth:`.PasswordHashers.needs_rehash`, so they can be upgraded on the
+next successful login.
+
+Warnings:
+    Hashers are sent to worker processes by pickle, so they must keep only
+    plain parameters in attributes.
+"""
+
+from abc import ABC, abstractmethod
+
+import bcrypt
+from argon2 import PasswordHasher as Argon2PasswordHasher
+from argon2 import Type
+from argon2.exceptions import InvalidHashError, VerificationError
+
+__all__ = ["PasswordHasher", "BcryptHasher", "Argon2Hasher", "PasswordHashers"]
+
+
+class PasswordHasher(ABC):
+    """Base interface of password hasher."""
+
+    #: str: Name of hashing algorithm.
+    algorithm: str
+
+    @abstractmethod
+    def hash(self, password: bytes) -> str:  # noqa: A003
+        """Hash raw password.
+
+        Args:
+            password: Raw password in bytes.
+
+        Returns:
+            Encoded hash with algorithm parameters and salt.
+        """
+
+    @abstractmethod
+    def verify(self, password: bytes, hashed: str) -> bool:
+        """Check equality of hashed and raw password.
+
+        Args:
+            password: Raw password in bytes.
+            hashed: Encoded hash created by :meth:`.hash`.
+
+        Returns:
+            True if equality check passed, False otherwise.
+        """
+
+    @abstractmethod
+    def identify(self, hashed: str) -> bool:
+        """Check that ``hashed`` was created by this algorithm."""
+
+    @abstractmethod
+    def needs_rehash(self, hashed: str) -> bool:
+        """Check that ``hashed`` was created with outdated parameters."""
+
+
+class BcryptHasher(PasswordHasher):
+    """bcrypt hasher.
+
+    Attributes:
+        rounds: Log2 of count of key expansion rounds.
+    """
+
+    algorithm = "bcrypt"
+
+    def __init__(self, rounds: int = 12):
+        self.rounds = rounds
+
+    def hash(self, password: bytes) -> str:  # noqa: A003
+        return bcrypt.hashpw(password, bcrypt.gensalt(self.rounds)).decode()
+
+    def verify(self, password: bytes, hashed: str) -> bool:
+        try:
+            return bcrypt.checkpw(password, hashed.encode())
+        except ValueError:
+            return False
+
+    def identify(self, hashed: str) -> bool:
+        return hashed.startswith(("$2a$", "$2b$", "$2y$"))
+
+    def needs_rehash(self, hashed: str) -> bool:
+        try:
+            return int(hashed.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+
+class Argon2Hasher(PasswordHasher):
+    """Argon2id hasher.
+
+    Attributes:
+        time_cost: Count of iterations.
+        memory_cost: Memory usage in kibibytes.
+        parallelism: Count of parallel threads.
+    """
+
+    algorithm = "argon2id"
+
+    def __init__(self, time_cost: int, memory_cost: int, parallelism: int):
+        self.time_cost = time_cost
+        self.memory_cost = memory_cost
+        self.parallelism = parallelism
+
+    def hash(self, password: bytes) -> str:  # noqa: A003
+        return self.__hasher().hash(password)
+
+    def verify(self, password: bytes, hashed: str) -> bool:
+        try:
+            return self.__hasher().verify(hashed, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    def identify(self, hashed: str) -> bool:
+        return hashed.startswith("$argon2id$")
+
+    def needs_rehash(self, hashed: str) -> bool:
+        try:
+            return self.__hasher().check_needs_rehash(hashed)
+        except InvalidHashError:
+            return True
+
+    def __hasher(self) -> Argon2PasswordHasher:
+        return Argon2PasswordHasher(
+            time_cost=self.time_cost,
+            memory_cost=self.memory_cost,
+            parallelism=self.parallelism,
+            type=Type.ID,
+        )
+
+
+class PasswordHashers:
+    """Default hasher together with legacy hashers.
+
+    Attributes:
+        default: Hasher for new passwords.
+        legacy: Hashers which hashes are still accepted on verification.
+    """
+
+    def __init__(self, default: PasswordHasher, legacy: list[PasswordHasher]):
+        self.default = default
+        self.legacy = legacy
+
+    def hash(self, password: bytes) -> str:  # noqa: A003
+        """Hash raw password by default hasher."""
+
+        return self.default.hash(password)
+
+    def verify(self, password: bytes, hashed: str) -> bool:
+        """Check password by the hasher that created ``hashed``."""
+
+        hasher = self.__identify(hashed)
+        if hasher is None:
+            return False
+        return hasher.verify(password, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """Check that ``hashed`` must be replaced by a hash of default hasher.
+
+        Notes:
+            Only the hash header is parsed, so it's cheap enough to be called
+            on the event loop.
+        """
+
+        if not self.default.identify(hashed):
+            return True
+        return self.default.needs_rehash(hashed)
+
+    def __identify(self, hashed: str) -> PasswordHasher | None:
+        for hasher in (self.default, *self.legacy):
+            if hasher.identify(hashed):
+                return hasher
+        return None
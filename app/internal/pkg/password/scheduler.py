@@ -0,0 +1,180 @@
+"""Priority-aware admission control for password hashing jobs.
+
+Jobs are split into lanes. A free worker slot is always handed to the
+waiting job of the most important lane, each lane has its own
+concurrency cap, and a job is rejected right away when its expected
+queue wait exceeds the lane's wait budget. Under load the expensive,
+low-priority work (hashing on register/change password) is shed first
+while login verification keeps flowing.
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from logging import Logger
+from typing import AsyncIterator
+
+from app.pkg.logger import get_logger
+from app.pkg.models.base import BaseEnum
+from app.pkg.models.v1.exceptions.password import PasswordHashingUnavailable
+
+__all__ = ["PasswordLane", "LaneLimits", "PasswordScheduler"]
+
+
+class PasswordLane(BaseEnum):
+    """Lanes of password jobs.
+
+    Lower value means higher priority.
+    """
+
+    #: Verification of credentials on login.
+    LOGIN = 0
+    #: Any other verification of a password, e.g. old password check.
+    VERIFY = 1
+    #: Hashing of a new password on register or change password.
+    HASH = 2
+
+
+@dataclass(frozen=True)
+class LaneLimits:
+    """Limits of single lane.
+
+    Attributes:
+        max_concurrency: Max count of running jobs of the lane.
+        wait_budget: Max time in seconds a job of the lane may wait in queue.
+    """
+
+    max_concurrency: int
+    wait_budget: float
+
+
+@dataclass
+class _LaneState:
+    limits: LaneLimits
+    running: int = 0
+    waiters: deque[asyncio.Future] = field(default_factory=deque)
+
+
+class PasswordScheduler:
+    """Hand out worker slots to password jobs by lane priority.
+
+    Attributes:
+        capacity: Total count of slots, usually count of worker processes.
+    """
+
+    __logger: Logger = get_logger(__name__)
+
+    #: float: Smoothing factor of the job duration moving average.
+    _ALPHA: float = 0.2
+
+    def __init__(self, capacity: int, lanes: dict[PasswordLane, LaneLimits]):
+        self.capacity = capacity
+        self._running = 0
+        self._avg_duration = 0.0
+        self._lanes = {
+            lane: _LaneState(limits=lanes[lane])
+            for lane in sorted(PasswordLane, key=lambda lane: lane.value)
+        }
+
+    @asynccontextmanager
+    async def slot(self, lane: PasswordLane) -> AsyncIterator[None]:
+        """Hold a worker slot of ``lane`` for the duration of the block.
+
+        Args:
+            lane: Lane of the job.
+
+        Raises:
+            PasswordHashingUnavailable: Expected or actual wait in queue
+                exceeds the wait budget of the lane.
+        """
+
+        await self.__acquire(lane)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            duration = time.monotonic() - started
+            self._avg_duration += self._ALPHA * (duration - self._avg_duration)
+            self.__release(lane)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Snapshot of running and waiting jobs per lane."""
+
+        return {
+            lane.name.lower(): {
+                "running": state.running,
+                "waiting": len(state.waiters),
+                "max_concurrency": state.limits.max_concurrency,
+            }
+            for lane, state in self._lanes.items()
+        }
+
+    async def __acquire(self, lane: PasswordLane) -> None:
+        state = self._lanes[lane]
+
+        if not state.waiters and self.__has_room(state):
+            self.__take(state)
+            return
+
+        if self.__estimate_wait(lane) > state.limits.wait_budget:
+            self.__logger.warning("Password job of lane %s is shed.", lane.name)
+            raise PasswordHashingUnavailable
+
+        waiter = asyncio.get_running_loop().create_future()
+        state.waiters.append(waiter)
+        try:
+            async with asyncio.timeout(state.limits.wait_budget):
+                await waiter
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was handed over right before the timeout or cancel.
+                self.__release(lane)
+            elif waiter in state.waiters:
+                state.waiters.remove(waiter)
+
+            if isinstance(exc, TimeoutError):
+                self.__logger.warning("Password job of lane %s timed out.", lane.name)
+                raise PasswordHashingUnavailable from exc
+            raise
+
+    def __release(self, lane: PasswordLane) -> None:
+        self._running -= 1
+        self._lanes[lane].running -= 1
+        self.__wake_up()
+
+    def __wake_up(self) -> None:
+        """Hand free slots to waiters, most important lane first."""
+
+        for state in self._lanes.values():
+            while state.waiters and self.__has_room(state):
+                waiter = state.waiters.popleft()
+                if waiter.done():
+                    continue
+                self.__take(state)
+                waiter.set_result(None)
+
+            if self._running >= self.capacity:
+                return
+
+    def __estimate_wait(self, lane: PasswordLane) -> float:
+        """Estimate queue wait of a new job of ``lane`` in seconds."""
+
+        ahead = 1 + sum(
+            len(state.waiters)
+            for other, state in self._lanes.items()
+            if other.value <= lane.value
+        )
+        throughput = min(self.capacity, self._lanes[lane].limits.max_concurrency)
+        return ahead / throughput * self._avg_duration
+
+    def __has_room(self, state: _LaneState) -> bool:
+        return (
+            self._running < self.capacity
+            and state.running < state.limits.max_concurrency
+        )
+
+    def __take(self, state: _LaneState) -> None:
+        self._running += 1
+        state.running += 1
@@ -0,0 +1,65 @@
+"""Bloom filter of strings."""
+
+import hashlib
+import math
+
+__all__ = ["BloomFilter"]
+
+
+class BloomFilter:
+    """Bloom filter sized for ``capacity`` items at ``error_rate``.
+
+    Membership check never gives false negatives, false positives happen
+    with probability about ``error_rate`` while count of added items does
+    not exceed ``capacity``. Items can't be removed, rebuild the filter
+    instead.
+
+    Attributes:
+        capacity: Expected count of items.
+        error_rate: Target probability of false positives.
+        size: Count of bits.
+        hash_count: Count of bits set per item.
+        count: Count of added items.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.size = math.ceil(
+            -self.capacity * math.log(error_rate) / math.log(2) ** 2,
+        )
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, item: str) -> None:
+        for position in self.__positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self.__positions(item)
+        )
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._bits)
+
+    @property
+    def estimated_error_rate(self) -> float:
+        """Probability of false positive for the current count of items."""
+
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** (
+            self.hash_count
+        )
+
+    def __positions(self, item: str):
+        """Bit positions of ``item`` by double hashing of one digest."""
+
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
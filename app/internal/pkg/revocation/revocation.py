@@ -0,0 +1,235 @@
+"""Revocation check of access tokens without a Redis call per request.
+
+Revoked entries are stored in Redis (see :class:`.RevocationRepository`)
+and mirrored into an in-process :class:`.BloomFilter`. An access token is
+checked against the filter first, Redis is asked only when the filter
+reports a possible match. So the count of Redis calls is the count of
+requests with revoked tokens plus a fraction ``error_rate`` of the rest.
+
+The filter is kept in sync by Redis pub/sub and rebuilt from a full scan
+periodically, which drops expired entries and recovers messages missed
+while the subscription was down.
+"""
+
+import asyncio
+import time
+from logging import Logger
+from uuid import UUID
+
+from redis import RedisError
+
+from app.internal.pkg.revocation.bloom import BloomFilter
+from app.internal.repository.v1.redis.revocation import RevocationRepository
+from app.pkg.logger import get_logger
+from app.pkg.models.v1.exceptions.repository import DriverError
+from app.pkg.settings import settings
+
+__all__ = ["RevocationList", "revocation_list"]
+
+
+class RevocationList:
+    """Revoked access tokens of all workers.
+
+    Attributes:
+        repository: Storage of revoked entries.
+        capacity: Expected count of revoked entries at a time.
+        error_rate: Target false positive rate of the filter.
+        token_lifetime: Lifetime of access tokens in seconds.
+    """
+
+    __logger: Logger = get_logger(__name__)
+
+    def __init__(
+        self,
+        repository: RevocationRepository,
+        capacity: int,
+        error_rate: float,
+        token_lifetime: int,
+    ):
+        self.repository = repository
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.token_lifetime = token_lifetime
+        self._filter = BloomFilter(capacity, error_rate)
+        #: Entries added while each running rebuild scans Redis.
+        self._rebuilds: list[set[str]] = []
+        self._checks = 0
+        self._filter_hits = 0
+        self._false_positives = 0
+
+    async def is_revoked(self, payload: dict) -> bool:
+        """Check that access token with ``payload`` is revoked.
+
+        Args:
+            payload: Verified payload of access token.
+
+        Returns:
+            True if the token itself or all tokens of its user issued
+            before it were revoked.
+        """
+
+        return (await self.are_revoked([payload]))[0]
+
+    async def are_revoked(self, payloads: list[dict]) -> list[bool]:
+        """Check revocation of a batch of access tokens.
+
+        Redis is called at most once for the whole batch.
+
+        Args:
+            payloads: Verified payloads of access tokens.
+
+        Returns:
+            Flags of revocation in order of ``payloads``.
+        """
+
+        self._checks += len(payloads)
+        candidates = [self.__candidates(payload) for payload in payloads]
+        entries = list({entry for group in candidates for entry in group})
+        if not entries:
+            return [False] * len(payloads)
+
+        try:
+            values = await self.repository.read_many(entries)
+        except (RedisError, DriverError):
+            self.__logger.exception("Failed to confirm revocation, tokens are rejected.")
+            return [bool(group) for group in candidates]
+        stored = dict(zip(entries, values))
+
+        result = []
+        for payload, group in zip(payloads, candidates):
+            if not group:
+                result.append(False)
+                continue
+            self._filter_hits += 1
+            revoked = any(
+                self.__revokes(entry, stored[entry], payload) for entry in group
+            )
+            if not revoked:
+                self._false_positives += 1
+            result.append(revoked)
+        return result
+
+    async def revoke_token(self, token_id: str, expires_at: float) -> None:
+        """Revoke a single access token until it expires."""
+
+        entry = f"jti:{token_id}"
+        await self.repository.create(
+            entry=entry,
+            value="1",
+            expire_time=int(expires_at - time.time()) + 1,
+        )
+        self.__add(entry)
+
+    async def revoke_user(self, user_id: UUID | str) -> None:
+        """Revoke all access tokens of the user issued until now."""
+
+        entry = f"user:{user_id}"
+        await self.repository.create(
+            entry=entry,
+            value=str(round(time.time(), 3)),
+            expire_time=self.token_lifetime,
+        )
+        self.__add(entry)
+
+    async def rebuild(self) -> None:
+        """Replace the filter by a new one built from all stored entries.
+
+        Entries added during the scan may be missed by it, so they are
+        buffered and added to the new filter too.
+        """
+
+        added: set[str] = set()
+        self._rebuilds.append(added)
+        try:
+            entries = await self.repository.read_all()
+        finally:
+            self._rebuilds.remove(added)
+
+        new_filter = BloomFilter(
+            max(self.capacity, 2 * (len(entries) + len(added))),
+            self.error_rate,
+        )
+        for entry in (*entries, *added):
+            new_filter.add(entry)
+        self._filter = new_filter
+
+    async def run_sync(self, rebuild_interval: float) -> None:
+        """Keep the filter in sync, run it as background task.
+
+        Args:
+            rebuild_interval: Interval in seconds of full rebuilds.
+        """
+
+        rebuilder = asyncio.create_task(self.__run_rebuilds(rebuild_interval))
+        try:
+            while True:
+                try:
+                    await self.rebuild()
+                    async for entry in self.repository.listen():
+                        self.__add(entry)
+                except (RedisError, DriverError, OSError):
+                    self.__logger.exception("Revocation sync is broken, reconnecting.")
+                await asyncio.sleep(1)
+        finally:
+            rebuilder.cancel()
+
+    def stats(self) -> dict[str, int | float]:
+        """Sizing of the filter and its observed effectiveness."""
+
+        return {
+            "entries": self._filter.count,
+            "capacity": self._filter.capacity,
+            "memory_bytes": self._filter.memory_bytes,
+            "hash_count": self._filter.hash_count,
+            "target_error_rate": self.error_rate,
+            "estimated_error_rate": self._filter.estimated_error_rate,
+            "checks": self._checks,
+            "filter_hits": self._filter_hits,
+            "false_positives": self._false_positives,
+            "observed_error_rate": (
+                self._false_positives / self._checks if self._checks else 0.0
+            ),
+        }
+
+    def __add(self, entry: str) -> None:
+        self._filter.add(entry)
+        for added in self._rebuilds:
+            added.add(entry)
+
+    def __candidates(self, payload: dict) -> list[str]:
+        """Entries revoking the token which the filter may contain."""
+
+        token_id = payload.get("jti")
+        user_id = payload.get("user_id")
+        return [
+            entry
+            for entry in (
+                f"jti:{token_id}" if token_id else None,
+                f"user:{user_id}" if user_id else None,
+            )
+            if entry is not None and entry in self._filter
+        ]
+
+    @staticmethod
+    def __revokes(entry: str, value: bytes | None, payload: dict) -> bool:
+        if value is None:
+            return False
+        if entry.startswith("jti:"):
+            return True
+        return payload.get("iat", 0) <= float(value)
+
+    async def __run_rebuilds(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.rebuild()
+            except (RedisError, DriverError):
+                self.__logger.exception("Failed to rebuild revocation filter.")
+
+
+revocation_list = RevocationList(
+    repository=RevocationRepository(),
+    capacity=settings.JWT.REVOCATION_CAPACITY,
+    error_rate=settings.JWT.REVOCATION_ERROR_RATE,
+    token_lifetime=settings.JWT.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
@@ -2,6 +2,7 @@
 
 from dependency_injector import containers, providers
 
+from app.internal.repository.v1.postgresql.outbox import OutboxRepository
 from app.internal.repository.v1.postgresql.user import UserRepository
 
 
@@ -9,3 +10,4 @@ class Repositories(containers.DeclarativeContainer):
     """Container for postgresql repositories."""
 
     user_repository = providers.Factory(UserRepository)
+    outbox_repository = providers.Factory(OutboxRepository)
@@ -6,9 +6,11 @@ from typing import AsyncGenerator, Union
 from dependency_injector.wiring import Provide, inject
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
+from app.internal.repository.v1.postgresql.unit_of_work import current_unit_of_work
 from app.pkg.connectors import Connectors
+from app.pkg.connectors.postgresql.replicas import Replicas, replicas_allowed
 
-__all__ = ["get_connection"]
+__all__ = ["get_connection", "dispose_engines"]
 
 
 @asynccontextmanager
@@ -19,9 +21,20 @@ async def get_connection(
     ],
     return_engine: bool = False,
     engine: AsyncEngine = Provide[Connectors.postgresql.engine],
+    read_only: bool = False,
+    replicas: Replicas = Provide[Connectors.postgresql.replicas],
 ) -> AsyncGenerator[Union[AsyncSession, AsyncEngine], None]:
     """Get async SQLAlchemy session or engine.
 
+    Notes:
+        Inside :func:`.unit_of_work` the session of the unit is yielded and
+        stays open after the block.
+
+        Read-only sessions are opened on a replica, unless the current unit
+        of work has written already: then the request reads its own writes
+        from the session of the unit. Inside :func:`.primary_reads` they are
+        opened on the primary.
+
     Args:
         session_factory:
             async SQLAlchemy session factory.
@@ -29,6 +42,11 @@ async def get_connection(
             if True, yield SQLAlchemy engine instead of session.
         engine:
             SQLAlchemy AsyncEngine.
+        read_only:
+            if True, the session is used only for reads and may be
+            opened on a read replica.
+        replicas:
+            Read replicas.
 
     Examples:
         >>> async def exec_query():
@@ -44,5 +62,37 @@ async def get_connection(
         yield engine
         return
 
+    uow = current_unit_of_work()
+    if (
+        read_only
+        and replicas
+        and replicas_allowed()
+        and (uow is None or not uow.dirty)
+    ):
+        _, replica_session_factory = replicas.next()
+        async with replica_session_factory() as session:
+            yield session
+        return
+
+    if uow is not None:
+        if uow.session is None:
+            uow.session = session_factory()
+        yield uow.session
+        return
+
     async with session_factory() as session:
         yield session
+
+
+@inject
+async def dispose_engines(
+    engine: AsyncEngine = Provide[Connectors.postgresql.engine],
+    replicas: Replicas = Provide[Connectors.postgresql.replicas],
+) -> None:
+    """Close pools of the primary and of read replicas, call it on shutdown.
+
+    Engines are singletons, nothing else closes their connections.
+    """
+
+    await replicas.dispose()
+    await engine.dispose()
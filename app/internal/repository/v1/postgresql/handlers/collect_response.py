@@ -1,5 +1,6 @@
 """Collect response module."""
 
+from dataclasses import dataclass
 from functools import wraps
 from typing import (
     Any,
@@ -21,7 +22,56 @@ from app.pkg.models.base import Model
 from app.pkg.models.v1.exceptions.repository import EmptyResult
 
 
+@dataclass(frozen=True)
+class ResponseSpec:
+    """Return annotation of a repository method resolved once.
+
+    Attributes:
+        base_type: Annotated type without ``Optional`` and ``list``, None if
+            the method returns nothing.
+        adapter: Validator of ``base_type``.
+        is_optional: The method may return None.
+        is_list: The method returns a list of ``base_type``.
+    """
+
+    base_type: Any = None
+    adapter: TypeAdapter | None = None
+    is_optional: bool = False
+    is_list: bool = False
+
+    @classmethod
+    def from_function(cls, fn: Callable) -> "ResponseSpec":
+        return_annotation = get_type_hints(fn).get("return")
+        if return_annotation is None or return_annotation is type(None):
+            return cls()
+
+        origin = get_origin(return_annotation)
+        is_optional = origin is Union and type(None) in get_args(return_annotation)
+
+        base_type = return_annotation
+        if is_optional:
+            base_type = [t for t in get_args(return_annotation) if t is not type(None)][0]
+
+        is_list = get_origin(base_type) is list
+        if is_list:
+            base_type = get_args(base_type)[0]
+
+        return cls(
+            base_type=base_type,
+            adapter=TypeAdapter(base_type),
+            is_optional=is_optional,
+            is_list=is_list,
+        )
+
+    def is_instance(self, obj: Any) -> bool:
+        """Check that ``obj`` is already of the annotated type."""
+
+        return isinstance(self.base_type, type) and isinstance(obj, self.base_type)
+
+
 def collect_response(fn) -> Callable:
+    spec = ResponseSpec.from_function(fn)
+
     @wraps(fn)
     @handle_exception
     async def inner(
@@ -29,40 +79,35 @@ def collect_response(fn) -> Callable:
         **kwargs: Any,
     ) -> Union[List[Type[Model]], Type[Model], None]:
         response = await fn(*args, **kwargs)
-        return await process_response(fn, response)
+        return await process_response(spec, response)
 
     return inner
 
 
 async def process_response(
-    fn: Callable,
+    spec: ResponseSpec,
     response: Any,
 ) -> Union[List[Type[Model]], Type[Model], None]:
-    return_annotation = get_type_hints(fn).get("return")
-    if return_annotation is None or return_annotation is type(None):
+    if spec.adapter is None:
         return None
 
-    origin = get_origin(return_annotation)
-    is_optional = origin is Union and type(None) in get_args(return_annotation)
-
-    if is_optional and not response:
+    if spec.is_optional and not response:
         return None
 
-    if origin is list and not response:
+    if spec.is_list and not response:
         return []
 
     if not response:
         raise EmptyResult
 
-    base_type = None
-    if is_optional:
-        base_type = [t for t in get_args(return_annotation) if t is not type(None)][0]
-    else:
-        base_type = return_annotation
-
-    adapter = TypeAdapter(base_type)
+    if spec.is_list:
+        return [
+            obj if spec.is_instance(obj) else spec.adapter.validate_python(obj)
+            for obj in response
+        ]
 
-    if origin is list:
-        return [adapter.validate_python(obj) for obj in response]
+    # Repository methods usually build the model themselves.
+    if spec.is_instance(response):
+        return response
 
-    return adapter.validate_python(response)
+    return spec.adapter.validate_python(response)
@@ -0,0 +1,149 @@
+"""Outbox repository implementation."""
+
+from datetime import timedelta
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select, update
+
+from app.internal.repository.repository import Repository
+from app.internal.repository.v1.postgresql.connection import get_connection
+from app.internal.repository.v1.postgresql.handlers.collect_response import (
+    collect_response,
+)
+from app.internal.repository.v1.postgresql.projection import projection
+from app.internal.repository.v1.postgresql.unit_of_work import commit
+from app.pkg.models import v1 as models
+from app.pkg.models.sqlalchemy_models import Outbox
+
+__all__ = ["OutboxRepository"]
+
+_OUTBOX_TABLE = Outbox.__table__
+
+
+class OutboxRepository(Repository):
+    """Outbox of events to publish.
+
+    Events are written in the transaction of the change they describe and
+    published later by :class:`.OutboxRelay`.
+
+    Notes:
+        Payloads may contain secrets, e.g. verification codes of
+        ``user.verification`` events. They are stored in plain text until
+        the event is sent, then cleared; sent rows are kept without
+        payload only to expose ``sent_at``. Payloads of quarantined events
+        stay until the events are resolved by hand.
+    """
+
+    @collect_response
+    async def create(self, cmd: models.OutboxCreateCommand) -> models.OutboxEvent:
+        """Writes an event to the outbox.
+
+        Notes:
+            Call it inside :func:`.unit_of_work` together with the change the
+            event describes, so both are committed or neither.
+
+        Args:
+            cmd (models.OutboxCreateCommand): Event to publish.
+
+        Returns:
+            models.OutboxEvent: The stored event.
+        """
+
+        async with get_connection() as session:
+            result = await session.execute(
+                insert(Outbox)
+                .values(
+                    event_id=cmd.event_id,
+                    routing_key=cmd.routing_key,
+                    payload=cmd.payload,
+                )
+                .returning(*projection(_OUTBOX_TABLE, models.OutboxEvent)),
+            )
+            event = result.mappings().one()
+            await commit(session)
+
+            return models.OutboxEvent.model_validate(dict(event))
+
+    @collect_response
+    async def read_pending(
+        self,
+        limit: int,
+        max_attempts: int,
+    ) -> list[models.OutboxEvent]:
+        """Locks and returns the oldest pending events.
+
+        Rows locked by other relays are skipped, so relays of all workers
+        publish disjoint batches. Events which failed ``max_attempts`` times
+        are quarantined and skipped too.
+
+        Notes:
+            Locks are held until the end of the current :func:`.unit_of_work`,
+            mark events as sent within it.
+
+        Args:
+            limit (int): Max count of events.
+            max_attempts (int): Max count of failed publications of events.
+
+        Returns:
+            list[models.OutboxEvent]: Events in order of creation.
+        """
+
+        async with get_connection() as session:
+            result = await session.execute(
+                select(*projection(_OUTBOX_TABLE, models.OutboxEvent))
+                .where(Outbox.sent_at.is_(None), Outbox.attempts < max_attempts)
+                .order_by(Outbox.created_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True),
+            )
+
+            return [
+                models.OutboxEvent.model_validate(dict(row))
+                for row in result.mappings()
+            ]
+
+    @collect_response
+    async def mark_sent(self, event_ids: list[UUID]) -> None:
+        """Marks events as published and clears their payloads.
+
+        Args:
+            event_ids (list[UUID]): Ids of published events.
+        """
+
+        async with get_connection() as session:
+            await session.execute(
+                update(Outbox)
+                .where(Outbox.event_id.in_(event_ids))
+                .values(sent_at=func.now(), payload={}),
+            )
+            await commit(session)
+
+    @collect_response
+    async def mark_failed(self, event_ids: list[UUID]) -> None:
+        """Counts a failed publication of events.
+
+        Args:
+            event_ids (list[UUID]): Ids of events which failed to publish.
+        """
+
+        async with get_connection() as session:
+            await session.execute(
+                update(Outbox)
+                .where(Outbox.event_id.in_(event_ids))
+                .values(attempts=Outbox.attempts + 1),
+            )
+            await commit(session)
+
+    @collect_response
+    async def delete_sent(self, retention: timedelta) -> None:
+        """Deletes events published more than ``retention`` ago.
+
+        Args:
+            retention (timedelta): Lifetime of published events.
+        """
+
+        async with get_connection() as session:
+            await session.execute(
+                delete(Outbox).where(Outbox.sent_at < func.now() - retention),
+            )
+            await commit(session)
@@ -0,0 +1,42 @@
+"""Projections of tables to response models.
+
+A query selects only columns the response model is built from, e.g.
+password hash is not fetched for :class:`.UserResponse`.
+"""
+
+from functools import lru_cache
+
+from pydantic import BaseModel
+from sqlalchemy import Column, Table
+
+__all__ = ["projection", "raw_select"]
+
+
+@lru_cache
+def projection(table: Table, model: type[BaseModel]) -> tuple[Column, ...]:
+    """Columns of ``table`` that are fields of ``model``.
+
+    Examples:
+        ::
+
+            >>> select(*projection(User.__table__, models.UserResponse))
+    """
+
+    return tuple(
+        column for column in table.columns if column.name in model.model_fields
+    )
+
+
+@lru_cache
+def raw_select(table: Table, model: type[BaseModel], key: str) -> str:
+    """SQL of the projection filtered by ``key`` column for raw queries.
+
+    Examples:
+        ::
+
+            >>> raw_select(User.__table__, models.UserResponse, "user_id")
+            'SELECT user_id, user_email, ... FROM "user" WHERE user_id = $1'
+    """
+
+    columns = ", ".join(column.name for column in projection(table, model))
+    return f'SELECT {columns} FROM "{table.name}" WHERE {key} = $1'
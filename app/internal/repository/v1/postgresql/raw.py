@@ -0,0 +1,85 @@
+"""Thin query layer over the driver connection of the SQLAlchemy engine.
+
+Used by the hottest reads, where the ORM (statement compilation, identity
+map, construction of ORM objects) costs more than the query itself.
+Queries are sent by asyncpg directly, asyncpg prepares them once per
+connection and reuses the prepared statement afterwards. Connections are
+taken from the pool of the SQLAlchemy engine, so pool limits are shared.
+
+Which repository methods use it is set by
+:attr:`.Postgresql.RAW_QUERY_METHODS`. Raw queries are reads, so they are
+sent to read replicas if any are configured.
+"""
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator
+
+import asyncpg
+from dependency_injector.wiring import Provide, inject
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.internal.repository.v1.postgresql.unit_of_work import has_pending_writes
+from app.pkg.connectors import Connectors
+from app.pkg.connectors.postgresql.replicas import Replicas, replicas_allowed
+from app.pkg.logger import get_logger
+from app.pkg.models.v1.exceptions.repository import DriverError
+from app.pkg.settings import settings
+
+__all__ = ["uses_raw_query", "get_raw_connection", "fetch_one"]
+
+logger = get_logger(__name__)
+
+
+def uses_raw_query(method: str) -> bool:
+    """Check that repository ``method`` must use raw queries.
+
+    Raw queries run outside of the session, so they are not used after
+    writes of the current unit of work, which they would not see.
+    """
+
+    if method not in settings.POSTGRES.RAW_QUERY_METHODS:
+        return False
+    return not has_pending_writes()
+
+
+@asynccontextmanager
+@inject
+async def get_raw_connection(
+    engine: AsyncEngine = Provide[Connectors.postgresql.engine],
+    read_only: bool = False,
+    replicas: Replicas = Provide[Connectors.postgresql.replicas],
+) -> AsyncGenerator[asyncpg.Connection, None]:
+    """Get asyncpg connection from the pool of the engine.
+
+    If ``read_only`` and replicas are configured, the connection is taken
+    from the pool of a replica, except inside :func:`.primary_reads`.
+    """
+
+    if read_only and replicas and replicas_allowed():
+        engine, _ = replicas.next()
+
+    async with engine.connect() as connection:
+        raw_connection = await connection.get_raw_connection()
+        yield raw_connection.driver_connection
+
+
+async def fetch_one(query: str, *args: Any) -> asyncpg.Record | None:
+    """Execute ``query`` and return its first row.
+
+    Args:
+        query: SQL with ``$n`` placeholders.
+        *args: Values of placeholders.
+
+    Raises:
+        DriverError: Any error of the driver.
+
+    Returns:
+        First row, or None if the query returned nothing.
+    """
+
+    try:
+        async with get_raw_connection(read_only=True) as connection:
+            return await connection.fetchrow(query, *args)
+    except (asyncpg.PostgresError, asyncpg.InterfaceError, OSError) as error:
+        logger.exception(f"asyncpg error: {error}")
+        raise DriverError(error_details=str(error)) from error
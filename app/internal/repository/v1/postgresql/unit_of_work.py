@@ -0,0 +1,160 @@
+"""Unit of work shared by repository calls of one request.
+
+Without it every repository call opens its own session and checks out its
+own connection, so a request that reads and then updates a user pays two
+checkouts and the calls cannot share a transaction.
+
+Inside :func:`.unit_of_work` :func:`.get_connection` yields one session,
+opened lazily by the first repository call. Mutating methods flush by
+:func:`.commit` instead of committing, and the whole unit is committed on
+exit, or rolled back if the block raised.
+
+Notes:
+    The unit is joined only by the task that opened it. Tasks spawned by
+    the request (e.g. a coalesced read shared with other requests) copy
+    context variables, but an ``AsyncSession`` must not be used by
+    concurrent tasks, so they open sessions of their own.
+
+Examples:
+    ::
+
+        >>> async with unit_of_work():
+        ...     user = await user_repository.get_user_by_id(cmd=...)
+        ...     await user_repository.update_data(cmd=...)
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from logging import Logger
+from typing import AsyncIterator, Awaitable, Callable
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.pkg.logger import get_logger
+from app.pkg.models.v1.exceptions.repository import DriverError
+
+__all__ = [
+    "UnitOfWork",
+    "unit_of_work",
+    "current_unit_of_work",
+    "has_pending_writes",
+    "commit",
+]
+
+_current: ContextVar["UnitOfWork | None"] = ContextVar("unit_of_work", default=None)
+
+
+class UnitOfWork:
+    """Session shared by repository calls of one task.
+
+    Attributes:
+        owner: Task that opened the unit.
+        session: Shared session, None until the first repository call.
+        dirty: Some repository call has written in the session.
+    """
+
+    __logger: Logger = get_logger(__name__)
+
+    def __init__(self):
+        self.owner = asyncio.current_task()
+        self.session: AsyncSession | None = None
+        self.dirty = False
+        self._after_commit: list[Callable[[], Awaitable[None]]] = []
+
+    def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """Run ``callback`` once the unit is committed."""
+
+        self._after_commit.append(callback)
+
+    async def commit(self) -> None:
+        if self.session is not None and self.dirty:
+            try:
+                await self.session.commit()
+            except SQLAlchemyError as error:
+                self.__logger.exception(f"SQLAlchemy error: {error}")
+                raise DriverError(error_details=str(error)) from error
+
+        for callback in self._after_commit:
+            await callback()
+
+    async def rollback(self) -> None:
+        if self.session is not None:
+            await self.session.rollback()
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+
+def current_unit_of_work() -> UnitOfWork | None:
+    """Unit of work joined by the current task, if any."""
+
+    uow = _current.get()
+    if uow is None or uow.owner is not asyncio.current_task():
+        return None
+    return uow
+
+
+def has_pending_writes() -> bool:
+    """Check that the unit of work of the current task has written.
+
+    Reads of such a task must run in the task itself and use the session
+    of the unit: neither caches, replicas nor calls shared with other
+    tasks see uncommitted writes.
+    """
+
+    uow = current_unit_of_work()
+    return uow is not None and uow.dirty
+
+
+@asynccontextmanager
+async def unit_of_work(join: bool = True) -> AsyncIterator[UnitOfWork]:
+    """Share one session between repository calls inside the block.
+
+    Nested blocks join the outer unit.
+
+    Args:
+        join: If False, a nested block runs in a unit of its own, committed
+            on exit of the block, e.g. for writes which must survive a
+            rollback of the outer unit. The outer unit is resumed after it.
+
+    Raises:
+        DriverError: Commit of the unit failed.
+    """
+
+    outer = current_unit_of_work()
+    if outer is not None and join:
+        yield outer
+        return
+
+    uow = UnitOfWork()
+    token = _current.set(uow)
+    try:
+        yield uow
+    except BaseException:
+        await uow.rollback()
+        raise
+    else:
+        await uow.commit()
+    finally:
+        _current.reset(token)
+        await uow.close()
+
+
+async def commit(session: AsyncSession) -> None:
+    """Commit writes of a repository call.
+
+    If ``session`` belongs to a unit of work, writes are only flushed and
+    committed together with the unit.
+    """
+
+    uow = current_unit_of_work()
+    if uow is not None and uow.session is session:
+        uow.dirty = True
+        await session.flush()
+        return
+
+    await session.commit()
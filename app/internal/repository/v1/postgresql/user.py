@@ -4,17 +4,39 @@ from uuid import UUID
 
 from sqlalchemy import select, update
 
+from app.internal.pkg.cache.cache import cached, invalidates
 from app.internal.repository.repository import Repository
 from app.internal.repository.v1.postgresql.connection import get_connection
 from app.internal.repository.v1.postgresql.handlers.collect_response import (
     collect_response,
 )
+from app.internal.repository.v1.postgresql.projection import projection, raw_select
+from app.internal.repository.v1.postgresql.raw import fetch_one, uses_raw_query
+from app.internal.repository.v1.postgresql.unit_of_work import (
+    commit,
+    has_pending_writes,
+)
+from app.pkg.async_helpers.single_flight import single_flight
 from app.pkg.models import v1 as models
 from app.pkg.models.sqlalchemy_models import User
 from app.pkg.models.v1.exceptions.repository import EmptyResult
+from app.pkg.settings import settings
 
 __all__ = ["UserRepository"]
 
+_USER_TABLE = User.__table__
+
+
+def _user_cache_keys(user: models.UserResponse) -> list[str]:
+    """Keys of all cached reads of ``user``."""
+
+    return [
+        f"user:by_id:{user.user_id}",
+        f"user:principal_by_id:{user.user_id}",
+        f"user:full_by_id:{user.user_id}",
+        f"user:by_email:{user.user_email}",
+    ]
+
 
 class UserRepository(Repository):
     """User repository implementation."""
@@ -33,11 +55,12 @@ class UserRepository(Repository):
         async with get_connection() as session:
             user = User(**cmd.to_dict())
             session.add(user)
-            await session.commit()
+            await commit(session)
             await session.refresh(user)
 
             return models.UserResponse.model_validate(user)
 
+    @invalidates(keys=_user_cache_keys)
     @collect_response
     async def update_password(
         self,
@@ -53,16 +76,25 @@ class UserRepository(Repository):
         """
 
         async with get_connection() as session:
-            await session.execute(
+            result = await session.execute(
                 update(User)
                 .where(User.user_id == cmd.user_id)
-                .values(hashed_password=cmd.hash_password),
+                .values(hashed_password=cmd.hash_password)
+                .returning(*projection(_USER_TABLE, models.UserResponse)),
             )
-            await session.commit()
-            updated_user = await session.get(User, cmd.user_id)
+            updated_user = result.mappings().one_or_none()
+            await commit(session)
+
+            if updated_user is None:
+                raise EmptyResult
 
-            return models.UserResponse.model_validate(updated_user)
+            return models.UserResponse.model_validate(dict(updated_user))
 
+    @single_flight(bypass=has_pending_writes)
+    @cached(
+        key=lambda cmd: f"user:by_id:{cmd.user_id}",
+        ttl=settings.CACHE.USER_BY_ID_TTL_SECONDS,
+    )
     @collect_response
     async def get_user_by_id(
         self,
@@ -77,17 +109,78 @@ class UserRepository(Repository):
             models.UserResponse: The user data matching the given ID.
         """
 
-        async with get_connection() as session:
+        if uses_raw_query("get_user_by_id"):
+            record = await fetch_one(
+                raw_select(_USER_TABLE, models.UserResponse, "user_id"),
+                cmd.user_id,
+            )
+            if record is None:
+                raise EmptyResult
+            return models.UserResponse.model_validate(dict(record))
+
+        async with get_connection(read_only=True) as session:
             result = await session.execute(
-                select(User).where(User.user_id == cmd.user_id),
+                select(*projection(_USER_TABLE, models.UserResponse)).where(
+                    User.user_id == cmd.user_id,
+                ),
             )
-            user = result.scalar_one_or_none()
+            user = result.mappings().one_or_none()
 
             if user is None:
                 raise EmptyResult
 
-            return models.UserResponse.model_validate(user)
+            return models.UserResponse.model_validate(dict(user))
 
+    @single_flight(bypass=has_pending_writes)
+    @cached(
+        key=lambda cmd: f"user:principal_by_id:{cmd.user_id}",
+        ttl=settings.CACHE.USER_PRINCIPAL_BY_ID_TTL_SECONDS,
+    )
+    @collect_response
+    async def get_user_principal_by_id(
+        self,
+        cmd: models.UserReadByIDCommand,
+    ) -> models.UserPrincipal:
+        """Retrieves authorization data (role and flags) of a user by ID.
+
+        Notes:
+            Columns of the result are included into ``ix_user_auth_state``
+            index, so the query is an index-only scan.
+
+        Args:
+            cmd (models.UserReadByIDCommand): Command object containing the user ID.
+
+        Returns:
+            models.UserPrincipal: Id, role and flags of the user.
+        """
+
+        if uses_raw_query("get_user_principal_by_id"):
+            record = await fetch_one(
+                raw_select(_USER_TABLE, models.UserPrincipal, "user_id"),
+                cmd.user_id,
+            )
+            if record is None:
+                raise EmptyResult
+            return models.UserPrincipal.model_validate(dict(record))
+
+        async with get_connection(read_only=True) as session:
+            result = await session.execute(
+                select(*projection(_USER_TABLE, models.UserPrincipal)).where(
+                    User.user_id == cmd.user_id,
+                ),
+            )
+            user = result.mappings().one_or_none()
+
+            if user is None:
+                raise EmptyResult
+
+            return models.UserPrincipal.model_validate(dict(user))
+
+    @single_flight(bypass=has_pending_writes)
+    @cached(
+        key=lambda cmd: f"user:full_by_id:{cmd.user_id}",
+        ttl=settings.CACHE.FULL_USER_BY_ID_TTL_SECONDS,
+    )
     @collect_response
     async def get_full_user_by_id(self, cmd: models.UserReadByIDCommand) -> models.User:
         """Retrieves full user details by user ID.
@@ -99,17 +192,33 @@ class UserRepository(Repository):
             models.User: The full user data corresponding to the given user ID.
         """
 
-        async with get_connection() as session:
+        if uses_raw_query("get_full_user_by_id"):
+            record = await fetch_one(
+                raw_select(_USER_TABLE, models.User, "user_id"),
+                cmd.user_id,
+            )
+            if record is None:
+                raise EmptyResult
+            return models.User.model_validate(dict(record))
+
+        async with get_connection(read_only=True) as session:
             result = await session.execute(
-                select(User).where(User.user_id == cmd.user_id),
+                select(*projection(_USER_TABLE, models.User)).where(
+                    User.user_id == cmd.user_id,
+                ),
             )
-            user = result.scalar_one_or_none()
+            user = result.mappings().one_or_none()
 
             if user is None:
                 raise EmptyResult
 
-            return models.User.model_validate(user)
+            return models.User.model_validate(dict(user))
 
+    @single_flight(bypass=has_pending_writes)
+    @cached(
+        key=lambda cmd: f"user:by_email:{cmd.user_email}",
+        ttl=settings.CACHE.USER_BY_EMAIL_TTL_SECONDS,
+    )
     @collect_response
     async def get_user_by_email(
         self,
@@ -124,17 +233,29 @@ class UserRepository(Repository):
             models.User: The user data corresponding to the given email.
         """
 
-        async with get_connection() as session:
+        if uses_raw_query("get_user_by_email"):
+            record = await fetch_one(
+                raw_select(_USER_TABLE, models.User, "user_email"),
+                cmd.user_email,
+            )
+            if record is None:
+                raise EmptyResult
+            return models.User.model_validate(dict(record))
+
+        async with get_connection(read_only=True) as session:
             result = await session.execute(
-                select(User).where(User.user_email == cmd.user_email),
+                select(*projection(_USER_TABLE, models.User)).where(
+                    User.user_email == cmd.user_email,
+                ),
             )
-            user = result.scalar_one_or_none()
+            user = result.mappings().one_or_none()
 
             if user is None:
                 raise EmptyResult
 
-            return models.User.model_validate(user)
+            return models.User.model_validate(dict(user))
 
+    @invalidates(keys=_user_cache_keys)
     @collect_response
     async def update_data(
         self,
@@ -149,16 +270,21 @@ class UserRepository(Repository):
             models.UserResponse: The user object with updated data.
         """
         async with get_connection() as session:
-            await session.execute(
+            result = await session.execute(
                 update(User)
                 .where(User.user_id == cmd.user_id)
-                .values(user_name=cmd.new_user_name),
+                .values(user_name=cmd.new_user_name)
+                .returning(*projection(_USER_TABLE, models.UserResponse)),
             )
-            await session.commit()
-            updated_data = await session.get(User, cmd.user_id)
+            updated_data = result.mappings().one_or_none()
+            await commit(session)
+
+            if updated_data is None:
+                raise EmptyResult
 
-            return models.UserResponse.model_validate(updated_data)
+            return models.UserResponse.model_validate(dict(updated_data))
 
+    @invalidates(keys=_user_cache_keys)
     @collect_response
     async def update_verified(self, user_id: UUID) -> models.UserResponse:
         """Sets the user's verification status to True in the database.
@@ -170,12 +296,45 @@ class UserRepository(Repository):
             models.UserResponse: The updated user object with verification status.
         """
         async with get_connection() as session:
-            await session.execute(
+            result = await session.execute(
                 update(User)
                 .where(User.user_id == user_id)
-                .values(user_is_verified=True),
+                .values(user_is_verified=True)
+                .returning(*projection(_USER_TABLE, models.UserResponse)),
+            )
+            updated_data = result.mappings().one_or_none()
+            await commit(session)
+
+            if updated_data is None:
+                raise EmptyResult
+
+            return models.UserResponse.model_validate(dict(updated_data))
+
+    @invalidates(keys=_user_cache_keys)
+    @collect_response
+    async def update_active(
+        self,
+        cmd: models.UserUpdateActiveCommand,
+    ) -> models.UserResponse:
+        """Sets the user's active status in the database.
+
+        Args:
+            cmd (models.UserUpdateActiveCommand): Command containing the user ID and new status.
+
+        Returns:
+            models.UserResponse: The updated user object with active status.
+        """
+        async with get_connection() as session:
+            result = await session.execute(
+                update(User)
+                .where(User.user_id == cmd.user_id)
+                .values(user_is_active=cmd.user_is_active)
+                .returning(*projection(_USER_TABLE, models.UserResponse)),
             )
-            await session.commit()
-            updated_data = await session.get(User, user_id)
+            updated_data = result.mappings().one_or_none()
+            await commit(session)
+
+            if updated_data is None:
+                raise EmptyResult
 
-            return models.UserResponse.model_validate(updated_data)
+            return models.UserResponse.model_validate(dict(updated_data))
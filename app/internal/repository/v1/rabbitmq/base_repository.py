@@ -1,14 +1,32 @@
 """Create base rabbitmq repository."""
 
-import json
+import asyncio
 from typing import Any
 
 import aio_pika
 
-from app.internal.repository.v1.rabbitmq.connection import get_connection
+from app.internal.repository.v1.rabbitmq.connection import (
+    acquire_connection,
+    get_connection,
+)
+from app.internal.repository.v1.rabbitmq.serializers import get_serializer
+from app.pkg.settings import settings
 
 __all__ = ["RabbitMQRepository"]
 
+#: Queues declared by this process. Declaration is idempotent, so it's
+#  needed once per queue, not once per message.
+_declared_queues: set[str] = set()
+
+
+async def _declare_queues(
+    channel: aio_pika.abc.AbstractChannel,
+    routing_keys: set[str],
+) -> None:
+    for routing_key in routing_keys - _declared_queues:
+        await channel.declare_queue(routing_key, durable=True)
+        _declared_queues.add(routing_key)
+
 
 class RabbitMQRepository:
     """Create rabbitmq repository."""
@@ -28,15 +46,53 @@ class RabbitMQRepository:
             Any: The message that was sent.
         """
 
+        await RabbitMQRepository.publish_batch(
+            [(message.model_dump(mode="json"), routing_key)],
+        )
+        return message
+
+    @staticmethod
+    async def publish_batch(messages: list[tuple[dict, str]]) -> None:
+        """Publishes persistent messages and waits for confirms of all of them.
+
+        Messages are published without waiting for each confirm in turn, so
+        the batch costs about one round trip to the broker.
+
+        Notes:
+            Messages are mandatory: if a queue was deleted after it was
+            declared, publishing fails and the queue is declared again by
+            the next call.
+
+            Bodies are encoded by the serializer of
+            ``RABBITMQ__CONTENT_TYPE``.
+
+        Args:
+            messages (list[tuple[dict, str]]): Bodies of messages and their
+                routing keys.
+        """
+
+        serializer = get_serializer(settings.RABBITMQ.CONTENT_TYPE)
+        routing_keys = {routing_key for _, routing_key in messages}
         async with get_connection() as channel:
-            queue = await channel.declare_queue(routing_key, durable=True)
-            await channel.default_exchange.publish(
-                aio_pika.Message(
-                    body=json.dumps(message.to_dict()).encode("utf-8"),
-                ),
-                routing_key=routing_key,
-            )
-            return message
+            try:
+                await _declare_queues(channel, routing_keys)
+                await asyncio.gather(
+                    *(
+                        channel.default_exchange.publish(
+                            aio_pika.Message(
+                                body=serializer.dumps(body),
+                                content_type=serializer.content_type,
+                                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                            ),
+                            routing_key=routing_key,
+                            mandatory=True,
+                        )
+                        for body, routing_key in messages
+                    ),
+                )
+            except Exception:
+                _declared_queues.difference_update(routing_keys)
+                raise
 
     @staticmethod
     async def listen_queue(routing_key: str):
@@ -46,12 +102,15 @@ class RabbitMQRepository:
             routing_key (str): The routing key (queue name) to listen to.
         """
 
-        async with get_connection() as channel:
-            if not isinstance(channel, aio_pika.Channel):
-                raise TypeError("Expected aio_pika.Channel, but got something else.")
-            queue = await channel.declare_queue(routing_key, durable=True)
-
-            async for message in queue:
-                async with message.process():
-                    message_body = json.loads(message.body.decode("utf-8"))
-                    yield message_body
+        async with get_connection(return_pool=True) as pool:
+            async with acquire_connection(pool) as channel:
+                if not isinstance(channel, aio_pika.Channel):
+                    raise TypeError(
+                        "Expected aio_pika.Channel, but got something else.",
+                    )
+                queue = await channel.declare_queue(routing_key, durable=True)
+
+                async for message in queue:
+                    async with message.process():
+                        serializer = get_serializer(message.content_type)
+                        yield serializer.loads(message.body)
@@ -16,14 +16,23 @@ __all__ = ["get_connection", "acquire_connection"]
 async def get_connection(
     pool: aio_pika.pool.Pool = Provide[Connectors.rabbitmq.connector],
     return_pool: bool = False,
+    channels: aio_pika.pool.Pool = Provide[Connectors.rabbitmq.channels],
 ) -> Union[aio_pika.Channel, aio_pika.pool.Pool]:
     """Get async connection pool to rabbitmq.
 
+    Notes:
+        Channels are taken from the shared pool of channels with publisher
+        confirms and returned to it afterward. Don't change their state
+        (QoS, consumers), use :func:`.acquire_connection` for a dedicated
+        channel instead.
+
     Args:
         pool:
             rabbitmq connection pool.
         return_pool:
             if True, return pool, else return connection.
+        channels:
+            rabbitmq pool of channels.
 
     Examples:
         If you have a function that contains a query in rabbitmq,
@@ -39,14 +48,19 @@ async def get_connection(
         Async connection to rabbitmq.
     """
 
-    if not isinstance(pool, aio_pika.pool.Pool):
-        pool = await pool
-
     if return_pool:
+        if not isinstance(pool, aio_pika.pool.Pool):
+            pool = await pool
         yield pool
         return
 
-    async with acquire_connection(pool) as channel:
+    if not isinstance(channels, aio_pika.pool.Pool):
+        channels = await channels
+
+    async with channels.acquire() as channel:
+        # Broker closes a channel on some errors, e.g. failed declaration.
+        if channel.is_closed:
+            await channel.reopen()
         yield channel
 
 
@@ -54,7 +68,9 @@ async def get_connection(
 async def acquire_connection(
     pool: aio_pika.pool.Pool,
 ) -> aio_pika.Channel:
-    """Acquire connection from pool.
+    """Acquire connection from pool and open a dedicated channel on it.
+
+    The channel is closed on exit.
 
     Args:
         pool:
@@ -80,5 +96,5 @@ async def acquire_connection(
     """
 
     async with pool.acquire() as conn:
-        channel = await conn.channel()
-        yield channel
+        async with await conn.channel() as channel:
+            yield channel
@@ -0,0 +1,84 @@
+"""Serializers of message bodies, selected by ``content_type`` of messages.
+
+Publishers encode bodies with the serializer configured by
+``RABBITMQ__CONTENT_TYPE`` and set ``content_type`` of messages, consumers
+decode each message by its own ``content_type``. So the format can be
+switched without draining queues: consumers are upgraded first, then
+publishers.
+
+Messages without ``content_type`` are JSON.
+
+Examples:
+    ::
+
+        >>> serializer = get_serializer("application/msgpack")
+        >>> serializer.loads(serializer.dumps({"event": "user.verification"}))
+        {'event': 'user.verification'}
+"""
+
+import json
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable
+
+import msgpack
+
+__all__ = ["Serializer", "UnsupportedContentType", "get_serializer", "serializers"]
+
+
+class UnsupportedContentType(ValueError):
+    """Message has a content type without serializer."""
+
+
+@dataclass(frozen=True)
+class Serializer:
+    """Encoder and decoder of message bodies.
+
+    Attributes:
+        content_type: Content type of encoded bodies.
+        dumps: Encodes a body.
+        loads: Decodes a body.
+    """
+
+    content_type: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+def _json_dumps(body: Any) -> bytes:
+    return json.dumps(body, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+JSON = Serializer(
+    content_type="application/json",
+    dumps=_json_dumps,
+    loads=json.loads,
+)
+
+MSGPACK = Serializer(
+    content_type="application/msgpack",
+    dumps=partial(msgpack.packb, use_bin_type=True),
+    loads=partial(msgpack.unpackb, raw=False),
+)
+
+#: Serializers by content type.
+serializers: dict[str, Serializer] = {
+    serializer.content_type: serializer for serializer in (JSON, MSGPACK)
+}
+
+
+def get_serializer(content_type: str | None) -> Serializer:
+    """Get serializer of ``content_type``, JSON if it's not set.
+
+    Raises:
+        UnsupportedContentType: There is no serializer of ``content_type``.
+    """
+
+    if not content_type:
+        return JSON
+    try:
+        return serializers[content_type]
+    except KeyError:
+        raise UnsupportedContentType(
+            f"Unsupported content type {content_type!r}.",
+        ) from None
@@ -3,7 +3,13 @@
 from dependency_injector import containers, providers
 
 from app.internal.repository.v1.redis.base_repository import BaseRedisRepository
+from app.internal.repository.v1.redis.cache import CacheRepository
+from app.internal.repository.v1.redis.refresh_token import RefreshTokenRepository
+from app.internal.repository.v1.redis.revocation import RevocationRepository
 
 
 class RedisRepositories(containers.DeclarativeContainer):
     base_redis_repository = providers.Factory(BaseRedisRepository)
+    refresh_token_repository = providers.Factory(RefreshTokenRepository)
+    revocation_repository = providers.Factory(RevocationRepository)
+    cache_repository = providers.Factory(CacheRepository)
@@ -0,0 +1,132 @@
+"""Cached entries of other repositories in Redis.
+
+Every entry has a version, incremented by each invalidation. A read takes
+the version before it goes to the database and fills the entry only if the
+version is unchanged, so a read which started before an invalidation
+can't write its older result back::
+
+    cache:{<key>}      string  serialized entry
+    cache:{<key>}:ver  string  count of invalidations of the entry
+
+Keys of one entry share a hash tag, so scripts touch a single cluster slot.
+"""
+
+from typing import AsyncIterator, ClassVar
+
+from redis.commands.core import AsyncScript
+
+from app.internal.repository.v1.redis.connection import get_connection
+from app.internal.repository.v1.redis.handlers.handle_exception import (
+    handle_exception,
+)
+
+__all__ = ["CacheRepository"]
+
+_FILL = """
+local version = redis.call('GET', KEYS[2]) or ''
+if version ~= ARGV[3] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return 1
+"""
+
+
+class CacheRepository:
+    """Repository of cached entries.
+
+    Deleted keys are published to :attr:`channel`, so workers drop them
+    from their in-process caches too.
+
+    Attributes:
+        version_ttl: Lifetime in seconds of versions. Reads which take
+            longer may fill an entry invalidated meanwhile.
+    """
+
+    prefix = "cache:"
+    channel = "cache-invalidations"
+    version_ttl = 3600
+
+    _scripts: ClassVar[dict[str, AsyncScript]] = {}
+
+    def _entry_key(self, key: str) -> str:
+        return f"{self.prefix}{{{key}}}"
+
+    def _version_key(self, key: str) -> str:
+        return f"{self.prefix}{{{key}}}:ver"
+
+    @handle_exception
+    async def read(self, key: str) -> tuple[bytes | None, str]:
+        """Read the entry and its version, ``""`` if it was never
+        invalidated."""
+
+        async with get_connection() as connect:
+            value, version = await connect.mget(
+                self._entry_key(key),
+                self._version_key(key),
+            )
+        return value, version.decode() if version is not None else ""
+
+    @handle_exception
+    async def read_version(self, key: str) -> str:
+        """Read the version of the entry, see :meth:`read`."""
+
+        async with get_connection() as connect:
+            version = await connect.get(self._version_key(key))
+        return version.decode() if version is not None else ""
+
+    @handle_exception
+    async def create(
+        self,
+        key: str,
+        value: str,
+        expire_time: int,
+        version: str,
+    ) -> bool:
+        """Fill the entry if it's still of ``version``.
+
+        Returns:
+            False if the entry was invalidated since ``version`` was read.
+        """
+
+        async with get_connection() as connect:
+            script = self._scripts.get(_FILL)
+            if script is None:
+                script = connect.register_script(_FILL)
+                self._scripts[_FILL] = script
+            filled = await script(
+                keys=[self._entry_key(key), self._version_key(key)],
+                args=[value, expire_time, version],
+                client=connect,
+            )
+        return bool(filled)
+
+    @handle_exception
+    async def delete(self, keys: list[str]) -> None:
+        """Invalidate and publish ``keys`` in one round trip.
+
+        The version is incremented before the entry is deleted, so a fill
+        between the two is rejected.
+        """
+
+        async with get_connection() as connect:
+            async with connect.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.incr(self._version_key(key))
+                    pipe.expire(self._version_key(key), self.version_ttl)
+                    pipe.delete(self._entry_key(key))
+                    pipe.publish(self.channel, key)
+                await pipe.execute()
+
+    async def listen(self) -> AsyncIterator[str]:
+        """Keys deleted by any worker, until connection is lost."""
+
+        async with get_connection() as connect:
+            pubsub = connect.pubsub(ignore_subscribe_messages=True)
+            await pubsub.subscribe(self.channel)
+            try:
+                async for message in pubsub.listen():
+                    data = message["data"]
+                    yield data.decode() if isinstance(data, bytes) else data
+            finally:
+                await pubsub.aclose()
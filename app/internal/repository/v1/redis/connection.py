@@ -36,5 +36,6 @@ async def get_connection(
         yield pool
         return
 
-    async with pool as connection:
-        yield connection
+    # The client takes a connection from its pool per command. Closing it
+    # here would disconnect the shared pool under concurrent requests.
+    yield pool
@@ -1,7 +1,7 @@
 """Collect response from aiopg and convert it to an annotated model."""
 
 import json
-from functools import wraps
+from functools import lru_cache, wraps
 from types import NoneType
 from typing import Any, Callable, List, Optional, Type, Union, get_args, get_origin
 
@@ -81,27 +81,42 @@ async def process_response(
     if return_annotation is None or return_annotation is NoneType:
         return None
 
-    origin = get_origin(return_annotation)
-    is_optional = __is_optional_type(origin)
+    adapter, is_optional, is_list = __resolve(return_annotation)
 
-    if is_optional and response:
-        return_annotation = __get_optional_type(return_annotation)
-    elif is_optional and not response:
+    if is_optional and not response:
         return None
 
-    if origin is list and not response:
+    if is_list and not response:
         return []
 
     if not response:
         raise EmptyResult
 
-    adapter = TypeAdapter(return_annotation)
-
     return adapter.validate_python(
-        await __convert_response(
-            response=response,
-            annotations=str(return_annotation),
-        ),
+        await __convert_response(response=response, is_list=is_list),
+    )
+
+
+@lru_cache
+def __resolve(return_annotation) -> tuple[TypeAdapter, bool, bool]:
+    """Build adapter of ``return_annotation`` once per annotation.
+
+    Args:
+        return_annotation: Type annotation.
+
+    Returns:
+        Adapter of the annotation without ``Optional``, flags whether the
+        annotation is optional and whether it is a list.
+    """
+
+    is_optional = __is_optional_type(get_origin(return_annotation))
+    if is_optional:
+        return_annotation = __get_optional_type(return_annotation)
+
+    return (
+        TypeAdapter(return_annotation),
+        is_optional,
+        get_origin(return_annotation) is list,
     )
 
 
@@ -119,15 +134,15 @@ def __is_optional_type(origin) -> bool:
     )
 
 
-async def __convert_response(response: bytes | bytearray, annotations: str):
+async def __convert_response(response: bytes | bytearray, is_list: bool):
     """Converts the response of the request to List of models or to a single
     model.
 
     Args:
         response:
             Response of an aioredis query.
-        annotations:
-            Annotations of `fn`.
+        is_list:
+            List is specified in the type annotations of `fn`.
 
     Returns:
         List[`Model`] if List is specified in the type annotations,
@@ -137,9 +152,7 @@ async def __convert_response(response: bytes | bytearray, annotations: str):
     decoded = response.decode("utf-8")
     response = json.loads(decoded)
 
-    if isinstance(response, list) or annotations.replace("typing.", "").startswith(
-        "List",
-    ):
+    if isinstance(response, list) or is_list:
         return [await __convert_memory_viewer(item) for item in response]
 
     return await __convert_memory_viewer(response)
@@ -0,0 +1,198 @@
+"""Refresh token families in Redis.
+
+A family is a chain of refresh tokens produced by rotation from a single
+login. Only the id (``jti``) of the latest token of the family is stored,
+so validation is a single hash lookup. Presenting any earlier token of the
+family means it was stolen or replayed, and the whole family is revoked.
+
+Within ``grace`` seconds after a rotation, the replaced token is answered
+with its successor instead of revoking the family: a client which lost the
+response (or several tabs refreshing at once) retries with the old token.
+
+Keys of one user share a hash tag, so scripts touch a single cluster slot::
+
+    rt:{<user_id>}:fam:<family_id>  hash  {"jti": <latest token id>,
+                                           "prev": <replaced token id>,
+                                           "rotated_at": <unix time>}
+    rt:{<user_id>}:families         set   {<family_id>, ...}
+
+Every operation is a single Lua script, i.e. a single round trip.
+"""
+
+import time
+from typing import ClassVar
+
+from redis.commands.core import AsyncScript
+
+from app.internal.repository.v1.redis.connection import get_connection
+from app.internal.repository.v1.redis.handlers.handle_exception import (
+    handle_exception,
+)
+from app.pkg.models import v1 as models
+
+__all__ = ["RefreshTokenRepository"]
+
+_CREATE = """
+redis.call('HSET', KEYS[1], 'jti', ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('SADD', KEYS[2], ARGV[2])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return 1
+"""
+
+_ROTATE = """
+local current = redis.call('HGET', KEYS[1], 'jti')
+if not current then
+    redis.call('SREM', KEYS[2], ARGV[3])
+    return {'REVOKED', ''}
+end
+if current ~= ARGV[1] then
+    local previous = redis.call('HMGET', KEYS[1], 'prev', 'rotated_at')
+    if previous[1] == ARGV[1]
+        and tonumber(ARGV[5]) - tonumber(previous[2]) <= tonumber(ARGV[6]) then
+        return {'GRACE', current}
+    end
+    redis.call('DEL', KEYS[1])
+    redis.call('SREM', KEYS[2], ARGV[3])
+    return {'REUSED', ''}
+end
+redis.call('HSET', KEYS[1], 'jti', ARGV[2], 'prev', ARGV[1], 'rotated_at', ARGV[5])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+return {'ROTATED', ARGV[2]}
+"""
+
+_REVOKE = """
+redis.call('DEL', KEYS[1])
+redis.call('SREM', KEYS[2], ARGV[1])
+return 1
+"""
+
+_REVOKE_ALL = """
+local families = redis.call('SMEMBERS', KEYS[1])
+for _, family_id in ipairs(families) do
+    redis.call('DEL', ARGV[1] .. family_id)
+end
+redis.call('DEL', KEYS[1])
+return #families
+"""
+
+
+class RefreshTokenRepository:
+    """Repository of refresh token families."""
+
+    _scripts: ClassVar[dict[str, AsyncScript]] = {}
+
+    @staticmethod
+    def _family_key(user_id: str, family_id: str) -> str:
+        return f"rt:{{{user_id}}}:fam:{family_id}"
+
+    @staticmethod
+    def _families_key(user_id: str) -> str:
+        return f"rt:{{{user_id}}}:families"
+
+    @handle_exception
+    async def create(
+        self,
+        user_id: str,
+        family_id: str,
+        token_id: str,
+        expire_time: int,
+    ) -> None:
+        """Start a family with its first token.
+
+        Args:
+            user_id: Owner of the family.
+            family_id: Id of the new family.
+            token_id: Id of the first refresh token.
+            expire_time: Lifetime of the family in seconds since last rotation.
+        """
+
+        await self.__run(
+            _CREATE,
+            keys=[
+                self._family_key(user_id, family_id),
+                self._families_key(user_id),
+            ],
+            args=[token_id, family_id, expire_time],
+        )
+
+    @handle_exception
+    async def rotate(
+        self,
+        user_id: str,
+        family_id: str,
+        token_id: str,
+        new_token_id: str,
+        expire_time: int,
+        grace: float,
+    ) -> tuple[models.RefreshTokenRotation, str]:
+        """Replace the latest token of the family if ``token_id`` is it.
+
+        Args:
+            user_id: Owner of the family.
+            family_id: Id of the family.
+            token_id: Id of the presented refresh token.
+            new_token_id: Id of the refresh token issued instead.
+            expire_time: Lifetime of the family in seconds since this rotation.
+            grace: Seconds after a rotation the replaced token is still
+                answered with its successor.
+
+        Returns:
+            Result of rotation and id of the latest token of the family:
+            ``ROTATED`` on success, ``GRACE`` if ``token_id`` was replaced
+            within ``grace`` (the id of its successor is returned),
+            ``REUSED`` if ``token_id`` was already rotated (the family is
+            revoked then), ``REVOKED`` if the family does not exist.
+        """
+
+        result, latest_token_id = await self.__run(
+            _ROTATE,
+            keys=[
+                self._family_key(user_id, family_id),
+                self._families_key(user_id),
+            ],
+            args=[token_id, new_token_id, family_id, expire_time, time.time(), grace],
+        )
+        if isinstance(result, bytes):
+            result = result.decode()
+        if isinstance(latest_token_id, bytes):
+            latest_token_id = latest_token_id.decode()
+        return models.RefreshTokenRotation(result), latest_token_id
+
+    @handle_exception
+    async def delete(self, user_id: str, family_id: str) -> None:
+        """Revoke a single family, e.g. on logout."""
+
+        await self.__run(
+            _REVOKE,
+            keys=[
+                self._family_key(user_id, family_id),
+                self._families_key(user_id),
+            ],
+            args=[family_id],
+        )
+
+    @handle_exception
+    async def delete_all(self, user_id: str) -> int:
+        """Revoke all families of the user.
+
+        Returns:
+            Count of revoked families.
+        """
+
+        return await self.__run(
+            _REVOKE_ALL,
+            keys=[self._families_key(user_id)],
+            args=[self._family_key(user_id, "")],
+        )
+
+    async def __run(self, script: str, keys: list, args: list):
+        """Run ``script`` by its SHA, it's loaded into Redis on first use."""
+
+        async with get_connection() as connect:
+            registered = self._scripts.get(script)
+            if registered is None:
+                registered = connect.register_script(script)
+                self._scripts[script] = registered
+            return await registered(keys=keys, args=args, client=connect)
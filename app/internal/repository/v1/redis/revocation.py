@@ -0,0 +1,80 @@
+"""Revoked access tokens in Redis.
+
+Two kinds of entries are stored, both expire together with the tokens
+they revoke::
+
+    revoked:jti:<token id>   single access token
+    revoked:user:<user id>   unix timestamp, all access tokens of the user
+                             issued not later than it
+
+Every change is published to :attr:`RevocationRepository.channel` as the
+entry name without prefix (``jti:<token id>`` or ``user:<user id>``), so
+workers keep their in-process filters in sync.
+"""
+
+from typing import AsyncIterator
+
+from app.internal.repository.v1.redis.connection import get_connection
+from app.internal.repository.v1.redis.handlers.handle_exception import (
+    handle_exception,
+)
+
+__all__ = ["RevocationRepository"]
+
+
+class RevocationRepository:
+    """Repository of revoked access tokens."""
+
+    prefix = "revoked:"
+    channel = "revocations"
+
+    @handle_exception
+    async def create(self, entry: str, value: str, expire_time: int) -> None:
+        """Store and publish revocation ``entry`` in one round trip.
+
+        Args:
+            entry: ``jti:<token id>`` or ``user:<user id>``.
+            value: Value of the entry.
+            expire_time: Seconds until all tokens revoked by the entry expire.
+        """
+
+        async with get_connection() as connect:
+            async with connect.pipeline(transaction=True) as pipe:
+                pipe.set(self.prefix + entry, value, ex=max(expire_time, 1))
+                pipe.publish(self.channel, entry)
+                await pipe.execute()
+
+    @handle_exception
+    async def read_many(self, entries: list[str]) -> list[bytes | None]:
+        """Values of ``entries``, None for missing ones."""
+
+        async with get_connection() as connect:
+            return await connect.mget([self.prefix + entry for entry in entries])
+
+    @handle_exception
+    async def read_all(self, batch_size: int = 1000) -> list[str]:
+        """Names of all stored entries."""
+
+        entries = []
+        async with get_connection() as connect:
+            async for key in connect.scan_iter(
+                match=self.prefix + "*",
+                count=batch_size,
+            ):
+                if isinstance(key, bytes):
+                    key = key.decode()
+                entries.append(key.removeprefix(self.prefix))
+        return entries
+
+    async def listen(self) -> AsyncIterator[str]:
+        """Entries published by any worker, until connection is lost."""
+
+        async with get_connection() as connect:
+            pubsub = connect.pubsub(ignore_subscribe_messages=True)
+            await pubsub.subscribe(self.channel)
+            try:
+                async for message in pubsub.listen():
+                    data = message["data"]
+                    yield data.decode() if isinstance(data, bytes) else data
+            finally:
+                await pubsub.aclose()
@@ -9,7 +9,7 @@ Examples:
         >>> __routes__.register_routes(app=app)
 """
 
-from app.internal.routes import v1
+from app.internal.routes import metrics, v1, well_known
 from app.pkg.models.core.routes import Routes
 
 __all__ = [
@@ -18,5 +18,9 @@ __all__ = [
 
 
 __routes__ = Routes(
-    routers=(v1.router,),
+    routers=(
+        v1.router,
+        well_known.router,
+        metrics.router,
+    ),
 )
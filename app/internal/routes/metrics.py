@@ -0,0 +1,53 @@
+"""Routes for runtime metrics of the worker, served outside of API versions."""
+
+from typing import Any
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.internal.pkg.cache.cache import cache
+from app.internal.pkg.events.publisher import event_publisher
+from app.internal.pkg.jwt.cache import access_token_cache
+from app.internal.pkg.middlewares.token_based_verification import (
+    token_based_verification,
+)
+from app.internal.pkg.outbox.relay import outbox_relay
+from app.internal.pkg.password.executor import password_executor
+from app.internal.pkg.revocation.revocation import revocation_list
+from app.pkg.async_helpers.single_flight import single_flight_stats
+from app.pkg.connectors import Connectors
+from app.pkg.connectors.postgresql.replicas import Replicas
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"],
+    dependencies=[Depends(token_based_verification)],
+)
+
+
+@router.get(
+    "",
+    status_code=status.HTTP_200_OK,
+    description="""
+    Description: Runtime metrics of the worker which serves the request.
+    Usage: Sizing of the database pool and caches. Metrics are per worker,
+    scrape every worker of the pod.
+    """,
+)
+@inject
+async def metrics(
+    engine: AsyncEngine = Depends(Provide[Connectors.postgresql.engine]),
+    replicas: Replicas = Depends(Provide[Connectors.postgresql.replicas]),
+) -> dict[str, Any]:
+    return {
+        "postgres_pool": engine.pool.stats(),
+        "postgres_replica_pools": replicas.stats(),
+        "password_scheduler": password_executor.scheduler.stats(),
+        "access_token_cache": access_token_cache.stats(),
+        "revocation_list": revocation_list.stats(),
+        "user_cache": cache.stats(),
+        "single_flight": single_flight_stats(),
+        "outbox_relay": outbox_relay.stats(),
+        "event_publisher": event_publisher.stats(),
+    }
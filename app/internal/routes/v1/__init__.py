@@ -1,12 +1,14 @@
 """Routes for version 1 of the API."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
+from app.internal.pkg.middlewares.unit_of_work import request_unit_of_work
 from app.internal.routes.v1.auth import router as auth_router
 from app.internal.routes.v1.user import router as user_router
 
 router = APIRouter(
     prefix="/v1",
+    dependencies=[Depends(request_unit_of_work)],
 )
 
 routes = sorted(
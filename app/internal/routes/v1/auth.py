@@ -3,6 +3,12 @@
 from dependency_injector.wiring import Provide, inject
 from fastapi import APIRouter, Cookie, Depends, HTTPException, Response, status
 
+from app.internal.pkg.dependencies import (
+    get_current_principal_from_auth,
+)
+from app.internal.pkg.middlewares.token_based_verification import (
+    token_based_verification,
+)
 from app.internal.services import Services
 from app.internal.services.v1 import AuthService
 from app.pkg.models import v1 as models
@@ -39,14 +45,61 @@ async def login(
     "/logout",
     status_code=status.HTTP_200_OK,
     description="""
-    Description: Refreshes the access and refresh tokens using the refresh token cookie.
-    Usage: Issues new tokens to the user if the provided refresh token is valid.
+    Description: Logs the user out of the current session.
+    Usage: Revokes tokens from the cookies and deletes token cookies.
     """,
 )
 @inject
 async def logout(
     response: Response,
+    refresh_token: str | None = Cookie(None, include_in_schema=False),
+    access_token: str | None = Cookie(None, include_in_schema=False),
+    auth_service: AuthService = Depends(Provide[Services.v1.auth_service]),
 ) -> dict:
+    await auth_service.logout(refresh_token, access_token)
+    _delete_token_cookies(response)
+    return {"msg": "Successfully logged out"}
+
+
+@router.post(
+    "/logout_all",
+    status_code=status.HTTP_200_OK,
+    description="""
+    Description: Logs the user out on all devices.
+    Usage: Revokes all tokens of the current user and deletes token cookies.
+    """,
+)
+@inject
+async def logout_all(
+    response: Response,
+    principal: models.UserPrincipal = Depends(get_current_principal_from_auth),
+    auth_service: AuthService = Depends(Provide[Services.v1.auth_service]),
+) -> dict:
+    revoked = await auth_service.logout_all(principal.user_id)
+    _delete_token_cookies(response)
+    return {"msg": "Successfully logged out on all devices", "sessions": revoked}
+
+
+@router.post(
+    "/introspect",
+    status_code=status.HTTP_200_OK,
+    response_model=models.TokenIntrospectionResponse,
+    dependencies=[Depends(token_based_verification)],
+    description="""
+    Description: Verifies a batch of access tokens for other services.
+    Usage: Gateways send all tokens of a fan-out in one request with X-ACCESS-TOKEN
+    header and get validity and claims of each token in the same order.
+    """,
+)
+@inject
+async def introspect(
+    cmd: models.TokenIntrospectionCommand,
+    auth_service: AuthService = Depends(Provide[Services.v1.auth_service]),
+) -> models.TokenIntrospectionResponse:
+    return await auth_service.introspect_tokens(cmd)
+
+
+def _delete_token_cookies(response: Response) -> None:
     response.delete_cookie(
         key="access_token",
         httponly=True,
@@ -59,7 +112,6 @@ async def logout(
         secure=True,
         samesite="lax",
     )
-    return {"msg": "Successfully logged out"}
 
 
 @router.post(
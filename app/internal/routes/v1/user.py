@@ -3,7 +3,10 @@
 from dependency_injector.wiring import Provide, inject
 from fastapi import APIRouter, Depends, Response, status
 
-from app.internal.pkg.dependencies import get_current_user_from_auth
+from app.internal.pkg.dependencies import (
+    get_current_principal_from_auth,
+    get_current_user_from_auth,
+)
 from app.internal.services import Services
 from app.internal.services.v1 import AuthService, UserService
 from app.pkg.models import v1 as models
@@ -46,7 +49,7 @@ async def verify_code(
     auth_service: AuthService = Depends(Provide[Services.v1.auth_service]),
 ) -> models.TokenResponse:
     user = await user_service.verify_user_email(cmd)
-    tokens = await auth_service.issue_tokens(user.user_id)
+    tokens = await auth_service.issue_tokens(user)
     auth_service.set_token_cookies(
         response=response,
         tokens=tokens,
@@ -88,7 +91,7 @@ async def change_password(
 async def verify_change_password(
     cmd: models.UserVerifyCommand,
     user_service: UserService = Depends(Provide[Services.v1.user_service]),
-    current_user: models.User = Depends(get_current_user_from_auth),
+    current_user: models.UserPrincipal = Depends(get_current_principal_from_auth),
 ) -> models.UserResponse:
     return await user_service.change_password_confirm(cmd)
 
@@ -105,7 +108,7 @@ async def verify_change_password(
 async def change_data(
     cmd: models.UserChangeDataCommand,
     user_service: UserService = Depends(Provide[Services.v1.user_service]),
-    current_user: models.User = Depends(get_current_user_from_auth),
+    current_user: models.UserPrincipal = Depends(get_current_principal_from_auth),
 ) -> models.UserResponse:
     return await user_service.change_data(
         cmd=cmd.migrate(
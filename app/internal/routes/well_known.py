@@ -0,0 +1,28 @@
+"""Routes for well-known URIs (RFC 8615), served outside of API versions."""
+
+from fastapi import APIRouter, Header, Response, status
+
+from app.internal.pkg.jwt.keys import key_ring
+from app.pkg.settings import settings
+
+router = APIRouter(prefix="/.well-known", tags=["Well-known"])
+
+
+@router.get(
+    "/jwks.json",
+    status_code=status.HTTP_200_OK,
+    description="""
+    Description: Public keys for verification of access tokens.
+    Usage: Services verify access tokens locally by the key with matching `kid`.
+    Response may be cached for `Cache-Control` max-age.
+    """,
+)
+async def jwks(if_none_match: str | None = Header(default=None)) -> Response:
+    body, etag = key_ring.jwks()
+    headers = {
+        "Cache-Control": f"public, max-age={settings.JWT.JWKS_MAX_AGE_SECONDS}",
+        "ETag": etag,
+    }
+    if if_none_match == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -37,6 +37,7 @@ class Services(containers.DeclarativeContainer):
     user_service = providers.Factory(UserService)
     user_service.add_attributes(
         user_repository=postgres_repositories.user_repository,
+        outbox_repository=postgres_repositories.outbox_repository,
         redis_repository=redis_repositories.base_redis_repository,
         rabbitmq_repository=rabbitmq_repositories.base_rabbitmq_repository,
     )
@@ -44,5 +45,6 @@ class Services(containers.DeclarativeContainer):
     auth_service = providers.Factory(AuthService)
     auth_service.add_attributes(
         user_repository=postgres_repositories.user_repository,
+        refresh_token_repository=redis_repositories.refresh_token_repository,
         jwt_handler=jwt_repositories.jwt_repository,
     )
@@ -1,23 +1,35 @@
 """Models for Auth object."""
 
 from logging import Logger
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from fastapi import Response
-from jose import jwt
+from pydantic import SecretBytes
+from redis import RedisError
 
 from app.internal.pkg.jwt.jwt_handler import JWTHandler
-from app.internal.pkg.password.password import check_password
+from app.internal.pkg.password.executor import (
+    PasswordLane,
+    hash_password,
+    password_needs_rehash,
+    verify_password,
+)
+from app.internal.pkg.revocation.revocation import revocation_list
 from app.internal.repository.v1.postgresql.user import UserRepository
+from app.internal.repository.v1.redis import RefreshTokenRepository
 from app.pkg.logger import get_logger
 from app.pkg.models import v1 as models
 from app.pkg.models.v1.exceptions.auth import (
+    AccessTokenRevoked,
     InvalidAuthCredentials,
     InvalidCredentials,
-    InvalidTokenPayload,
+    RefreshTokenReused,
+    RefreshTokenRevoked,
     TokenPayloadMissingUserID,
     UserInactive,
 )
+from app.pkg.models.v1.exceptions.password import PasswordHashingUnavailable
+from app.pkg.models.v1.exceptions.redis import ErrorRedisCreate, ErrorRedisRead
 from app.pkg.models.v1.exceptions.repository import DriverError, EmptyResult
 from app.pkg.models.v1.exceptions.user import (
     UserNotFound,
@@ -33,23 +45,46 @@ class AuthService:
     """Auth service class."""
 
     user_repository: UserRepository
+    refresh_token_repository: RefreshTokenRepository
     jwt_handler: JWTHandler
     __logger: Logger = get_logger(__name__)
 
-    async def issue_tokens(self, user_id: UUID) -> models.TokenResponse:
+    async def issue_tokens(
+        self,
+        user: models.UserPrincipal | models.UserResponse | models.User,
+        family_id: str | None = None,
+        token_id: str | None = None,
+    ) -> models.TokenResponse:
         """Issues a new pair of access and refresh tokens for the given user.
 
         Args:
-            user_id (UUID): The ID of the user.
+            user (models.UserPrincipal | models.UserResponse | models.User): The user. Its role and
+                flags are embedded into access token.
+            family_id (str | None): Family of the refresh token. If not set,
+                a new family (session) is started.
+            token_id (str | None): Id of the refresh token, already stored
+                as the latest in ``family_id`` by rotation.
 
         Returns:
             models.TokenResponse: Contains access token, refresh token, and metadata.
         """
-        access_token = self.jwt_handler.create_access_token(
-            {"user_id": str(user_id)},
-        )
+
+        if family_id is None:
+            family_id, token_id = uuid4().hex, uuid4().hex
+            try:
+                await self.refresh_token_repository.create(
+                    user_id=str(user.user_id),
+                    family_id=family_id,
+                    token_id=token_id,
+                    expire_time=self._refresh_token_ttl(),
+                )
+            except (RedisError, DriverError) as exc:
+                self.__logger.exception("Failed to store refresh token family.")
+                raise ErrorRedisCreate from exc
+
+        access_token = self.jwt_handler.create_access_token(user)
         refresh_token = self.jwt_handler.create_refresh_token(
-            {"user_id": str(user_id)},
+            {"user_id": str(user.user_id), "fid": family_id, "jti": token_id},
         )
         return models.TokenResponse(
             access_token=access_token,
@@ -74,13 +109,20 @@ class AuthService:
         except DriverError as exc:
             raise UserReadError from exc
 
-        if not check_password(cmd.user_password, user.hashed_password):
+        if not await verify_password(
+            cmd.user_password,
+            user.hashed_password,
+            lane=PasswordLane.LOGIN,
+        ):
             raise InvalidCredentials
 
         if not user.user_is_active:
             raise UserInactive
 
-        return await self.issue_tokens(user.user_id)
+        if password_needs_rehash(user.hashed_password):
+            await self._rehash_password(user.user_id, cmd.user_password)
+
+        return await self.issue_tokens(user)
 
     async def refresh_access_token(self, refresh_token: str) -> models.TokenResponse:
         """Refreshes the access token using a valid refresh token.
@@ -92,18 +134,15 @@ class AuthService:
             models.TokenResponse: Contains new access and refresh tokens with token type.
         """
 
-        payload = jwt.decode(
-            refresh_token,
-            settings.JWT.REFRESH_SECRET_KEY.get_secret_value(),
-            algorithms=[settings.JWT.ALGORITHM],
-        )
-        user_id = payload.get("user_id")
-        if user_id is None:
-            raise InvalidTokenPayload
+        claims = self.jwt_handler.decode_refresh_token(refresh_token)
+        if claims is None:
+            raise InvalidAuthCredentials
 
+        # The presented token is consumed by rotation, so everything which
+        # may fail goes before it.
         try:
-            user = await self.user_repository.get_user_by_id(
-                cmd=models.UserReadByIDCommand(user_id=user_id),
+            user = await self.user_repository.get_user_principal_by_id(
+                cmd=models.UserReadByIDCommand(user_id=claims.user_id),
             )
         except EmptyResult:
             raise UserNotFound
@@ -113,15 +152,110 @@ class AuthService:
         if not user.user_is_active:
             raise UserNotVerified
 
-        access_token = self.jwt_handler.create_access_token({"user_id": str(user_id)})
-        refresh_token = self.jwt_handler.create_refresh_token({"user_id": str(user_id)})
+        try:
+            rotation, token_id = await self.refresh_token_repository.rotate(
+                user_id=str(claims.user_id),
+                family_id=claims.family_id,
+                token_id=claims.token_id,
+                new_token_id=uuid4().hex,
+                expire_time=self._refresh_token_ttl(),
+                grace=settings.JWT.REFRESH_REUSE_GRACE_SECONDS,
+            )
+        except (RedisError, DriverError) as exc:
+            self.__logger.exception("Failed to rotate refresh token.")
+            raise ErrorRedisRead from exc
+
+        if rotation == models.RefreshTokenRotation.REUSED:
+            self.__logger.warning(
+                "Reuse of refresh token detected, family %s of user %s is revoked.",
+                claims.family_id,
+                claims.user_id,
+            )
+            raise RefreshTokenReused
+        if rotation == models.RefreshTokenRotation.REVOKED:
+            raise RefreshTokenRevoked
 
-        return models.TokenResponse(
-            access_token=access_token,
-            refresh_token=refresh_token,
-            token_type="bearer",
+        return await self.issue_tokens(
+            user,
+            family_id=claims.family_id,
+            token_id=token_id,
         )
 
+    async def logout(
+        self,
+        refresh_token: str | None,
+        access_token: str | None = None,
+    ) -> None:
+        """Revokes the session (refresh token family) of ``refresh_token``
+        and ``access_token``.
+
+        Notes:
+            Invalid or missing tokens are ignored, the client is logged out
+            by removal of cookies anyway.
+
+        Args:
+            refresh_token (str | None): The refresh token string provided by the client.
+            access_token (str | None): The access token string provided by the client.
+        """
+
+        payload = self.jwt_handler.decode_access_token(access_token or "")
+        if payload is not None and payload.get("jti"):
+            try:
+                await revocation_list.revoke_token(payload["jti"], payload["exp"])
+            except (RedisError, DriverError):
+                self.__logger.exception("Failed to revoke access token.")
+
+        if not refresh_token:
+            return
+        claims = self.jwt_handler.decode_refresh_token(refresh_token)
+        if claims is None:
+            return
+
+        try:
+            await self.refresh_token_repository.delete(
+                user_id=str(claims.user_id),
+                family_id=claims.family_id,
+            )
+        except (RedisError, DriverError):
+            self.__logger.exception("Failed to revoke refresh token family.")
+
+    async def logout_all(self, user_id: UUID) -> int:
+        """Revokes all sessions of the user, i.e. logs out on all devices.
+
+        Args:
+            user_id (UUID): The user.
+
+        Returns:
+            int: Count of revoked sessions.
+        """
+
+        try:
+            await revocation_list.revoke_user(user_id)
+            return await self.refresh_token_repository.delete_all(
+                user_id=str(user_id),
+            )
+        except (RedisError, DriverError) as exc:
+            self.__logger.exception("Failed to revoke refresh token families.")
+            raise ErrorRedisCreate from exc
+
+    async def _verify_access_token(self, token: str) -> dict:
+        """Decode access token and check that it's not revoked.
+
+        Returns:
+            dict: Payload of the token.
+        """
+
+        payload = self.jwt_handler.decode_access_token(token)
+        if payload is None:
+            raise InvalidAuthCredentials
+        if await revocation_list.is_revoked(payload):
+            raise AccessTokenRevoked
+        return payload
+
+    @staticmethod
+    def _refresh_token_ttl() -> int:
+        return settings.JWT.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+
     async def get_current_user(self, token: str) -> models.User:
         """Retrieves the current user based on the provided access token.
 
@@ -132,9 +266,7 @@ class AuthService:
             models.User: The full user data retrieved from the repository.
         """
 
-        payload = self.jwt_handler.decode_access_token(token)
-        if payload is None:
-            raise InvalidAuthCredentials
+        payload = await self._verify_access_token(token)
 
         user_id = payload.get("user_id")
         if user_id is None:
@@ -150,6 +282,114 @@ class AuthService:
         except DriverError as exc:
             raise UserReadError from exc
 
+    async def get_current_principal(self, token: str) -> models.UserPrincipal:
+        """Retrieves authorization data of the current user from the provided
+        access token.
+
+        Notes:
+            Database is read only for tokens issued without authorization claims.
+
+        Args:
+            token (str): The JWT access token.
+
+        Returns:
+            models.UserPrincipal: Id, role and flags of the user.
+        """
+
+        payload = await self._verify_access_token(token)
+
+        claims = self.jwt_handler.claims_from_payload(payload)
+        if claims is not None:
+            return claims
+
+        user_id = payload.get("user_id")
+        if user_id is None:
+            raise TokenPayloadMissingUserID
+
+        try:
+            return await self.user_repository.get_user_principal_by_id(
+                cmd=models.UserReadByIDCommand(user_id=user_id),
+            )
+        except EmptyResult as exc:
+            raise UserNotFound from exc
+        except DriverError as exc:
+            raise UserReadError from exc
+
+    async def introspect_tokens(
+        self,
+        cmd: models.TokenIntrospectionCommand,
+    ) -> models.TokenIntrospectionResponse:
+        """Verifies a batch of access tokens for other services.
+
+        Notes:
+            Repeated tokens are decoded once, decoding goes through the
+            cache of verified tokens and revocation of the whole batch is
+            confirmed by at most one Redis call. Database is not read.
+
+        Args:
+            cmd (models.TokenIntrospectionCommand): Tokens to verify.
+
+        Returns:
+            models.TokenIntrospectionResponse: Results in order of the tokens.
+        """
+
+        unique_tokens = list(dict.fromkeys(cmd.tokens))
+        payloads = {
+            token: payload
+            for token in unique_tokens
+            if (payload := self.jwt_handler.decode_access_token(token)) is not None
+        }
+        revoked = dict(
+            zip(
+                payloads,
+                await revocation_list.are_revoked(list(payloads.values())),
+            ),
+        )
+
+        results = {}
+        for token in unique_tokens:
+            payload = payloads.get(token)
+            if payload is None or revoked[token]:
+                results[token] = models.TokenIntrospection(active=False)
+                continue
+
+            claims = self.jwt_handler.claims_from_payload(payload)
+            results[token] = models.TokenIntrospection(
+                active=True,
+                user_id=payload.get("user_id"),
+                user_service_role=claims.user_service_role if claims else None,
+                user_is_active=claims.user_is_active if claims else None,
+                user_is_verified=claims.user_is_verified if claims else None,
+                expires_at=payload.get("exp"),
+            )
+
+        return models.TokenIntrospectionResponse(
+            results=[results[token] for token in cmd.tokens],
+        )
+
+    async def _rehash_password(self, user_id: UUID, password: SecretBytes) -> None:
+        """Replaces stored password hash by a hash of the current algorithm and
+        parameters.
+
+        Notes:
+            Failure is only logged, the hash will be upgraded on the next login.
+
+        Args:
+            user_id (UUID): The ID of the user.
+            password (SecretBytes): Raw password that just passed verification.
+        """
+
+        try:
+            hashed_password = await hash_password(password.get_secret_value())
+            await self.user_repository.update_password(
+                cmd=models.UserPasswordUpdateCommand(
+                    user_id=user_id,
+                    hash_password=hashed_password,
+                ),
+            )
+        except (PasswordHashingUnavailable, EmptyResult, DriverError) as exc:
+            self.__logger.warning("Failed to rehash password: %r", exc)
+
     @staticmethod
     def set_token_cookies(response: Response, tokens: models.TokenResponse) -> None:
         """Set access and refresh tokens in HTTP-only cookies."""
@@ -5,12 +5,15 @@ from datetime import datetime, timezone
 from logging import Logger
 from uuid import uuid4
 
-from passlib.handlers.bcrypt import bcrypt
 from redis import RedisError
 
-from app.internal.pkg.password.password import check_password
+from app.internal.pkg.events.publisher import event_publisher
+from app.internal.pkg.outbox.relay import outbox_relay
+from app.internal.pkg.password.executor import hash_password, verify_password
 from app.internal.pkg.verification.verification import create_verification_code
 from app.internal.repository.v1 import rabbitmq, redis
+from app.internal.repository.v1.postgresql.outbox import OutboxRepository
+from app.internal.repository.v1.postgresql.unit_of_work import unit_of_work
 from app.internal.repository.v1.postgresql.user import UserRepository
 from app.pkg.logger import get_logger
 from app.pkg.models import v1 as models
@@ -40,6 +43,7 @@ class UserService:
     """User service class."""
 
     user_repository: UserRepository
+    outbox_repository: OutboxRepository
     redis_repository: redis.BaseRedisRepository
     rabbitmq_repository: rabbitmq.RabbitMQRepository
     __logger: Logger = get_logger(__name__)
@@ -57,46 +61,23 @@ class UserService:
             models.UserVerificationResponse: The newly created user details.
         """
 
-        try:
-            hashed_password = bcrypt.hash(cmd.user_password)
-            user = await self.user_repository.create(
-                cmd.migrate(
-                    model=models.UserCreateCommand,
-                    extra_fields={
-                        "hashed_password": hashed_password,
-                    },
-                ),
-            )
-        except UniqueViolation as exc:
-            self.__logger.exception("User with given unique data already exists.")
-            raise UserAlreadyExists from exc
-        except DriverError as exc:
-            self.__logger.exception("Database error during user creation.")
-            raise UserCreateError from exc
-
+        hashed_password = await hash_password(cmd.user_password.encode())
         verification_code = await create_verification_code()
         verification_id = uuid4()
-        redis_key = f"verify:email:{verification_id}"
-        redis_value = json.dumps(
-            {
-                "user_id": str(user.user_id),
-                "verification_code": verification_code,
-            },
-        )
-
-        try:
-            await self.redis_repository.create(
-                redis_key=redis_key,
-                redis_value=redis_value,
-                expire_time=300,
-            )
-        except RedisError as exc:
-            self.__logger.exception("Failed to create verification entry in Redis.")
-            raise ErrorRedisCreate from exc
 
-        try:
-            await self.rabbitmq_repository.create(
-                message=models.UserVerifiedEvent(
+        # The user and its verification event are committed together, the
+        # event is published by the outbox relay.
+        async with unit_of_work() as uow:
+            try:
+                user = await self.user_repository.create(
+                    cmd.migrate(
+                        model=models.UserCreateCommand,
+                        extra_fields={
+                            "hashed_password": hashed_password,
+                        },
+                    ),
+                )
+                event = models.UserVerifiedEvent(
                     event="user.verification",
                     event_id=uuid4(),
                     occurred_at=datetime.now(timezone.utc),
@@ -104,19 +85,37 @@ class UserService:
                     user_id=user.user_id,
                     email=user.user_email,
                     verification_code=verification_code,
-                ),
-                routing_key=settings.RABBITMQ.NOTIFICATION_KEY,
-            )
-        except Exception as exc:
-            self.__logger.exception("Failed to publish verification event to RabbitMQ.")
+                )
+                await self.outbox_repository.create(
+                    cmd=models.OutboxCreateCommand(
+                        event_id=event.event_id,
+                        routing_key=settings.RABBITMQ.NOTIFICATION_KEY,
+                        payload=event.model_dump(mode="json"),
+                    ),
+                )
+            except UniqueViolation as exc:
+                self.__logger.exception("User with given unique data already exists.")
+                raise UserAlreadyExists from exc
+            except DriverError as exc:
+                self.__logger.exception("Database error during user creation.")
+                raise UserCreateError from exc
+
             try:
-                await self.redis_repository.delete(redis_key=redis_key)
-            except RedisError as exc:
-                self.__logger.warning(
-                    "Error deleting verification entry from Redis: %r",
-                    exc,
+                await self.redis_repository.create(
+                    redis_key=f"verify:email:{verification_id}",
+                    redis_value=json.dumps(
+                        {
+                            "user_id": str(user.user_id),
+                            "verification_code": verification_code,
+                        },
+                    ),
+                    expire_time=300,
                 )
-            raise ErrorPublishToRabbitMQ from exc
+            except RedisError as exc:
+                self.__logger.exception("Failed to create verification entry in Redis.")
+                raise ErrorRedisCreate from exc
+
+            uow.after_commit(outbox_relay.wake)
 
         return user.migrate(
             model=models.UserVerificationResponse,
@@ -179,11 +178,11 @@ class UserService:
                 confirm and apply the password change.
         """
 
-        if not check_password(cmd.old_password, user.hashed_password):
+        if not await verify_password(cmd.old_password, user.hashed_password):
             raise InvalidCredentials
 
         verification_code = await create_verification_code()
-        new_hashed_password = bcrypt.hash(cmd.new_password)
+        new_hashed_password = await hash_password(cmd.new_password.encode())
         verification_id = uuid4()
         redis_key = f"verify:password:{verification_id}"
         redis_value = json.dumps(
@@ -205,7 +204,7 @@ class UserService:
             raise ErrorRedisCreate from exc
 
         try:
-            await self.rabbitmq_repository.create(
+            await event_publisher.publish(
                 message=models.UserVerifiedEvent(
                     event="user.change_password.requested",
                     event_id=uuid4(),
@@ -217,8 +216,8 @@ class UserService:
                 ),
                 routing_key=settings.RABBITMQ.NOTIFICATION_KEY,
             )
-        except Exception as exc:
-            self.__logger.exception("Failed to publish verification event to RabbitMQ.")
+        except DriverError as exc:
+            self.__logger.exception("Failed to publish verification event.")
             try:
                 await self.redis_repository.delete(redis_key=redis_key)
             except RedisError:
@@ -299,6 +298,26 @@ class UserService:
         except DriverError as exc:
             raise UserUpdateError from exc
 
+    async def change_active(
+        self,
+        cmd: models.UserUpdateActiveCommand,
+    ) -> models.UserResponse:
+        """Activates or deactivates the user.
+
+        Args:
+            cmd (models.UserUpdateActiveCommand): Command containing the user ID and new status.
+
+        Returns:
+            models.UserResponse: The updated user data.
+        """
+
+        try:
+            return await self.user_repository.update_active(cmd)
+        except EmptyResult:
+            raise UserNotFound
+        except DriverError as exc:
+            raise UserUpdateError from exc
+
     async def _read_verification_payload(self, redis_key: str) -> dict:
         """Reads the verification payload from Redis and returns it as a
         dictionary.
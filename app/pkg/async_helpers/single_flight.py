@@ -0,0 +1,125 @@
+"""This module contains request coalescing for coroutines."""
+
+import asyncio
+from functools import partial, wraps
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+__all__ = ["SingleFlight", "single_flight", "single_flight_stats"]
+
+_T = TypeVar("_T")
+
+_registry: list["SingleFlight"] = []
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers with the same key.
+
+    The first caller starts the call, callers arriving while it runs await
+    the same result (or exception). The call runs as a separate task, so
+    cancellation of any caller does not affect the others.
+
+    Attributes:
+        name: Name of the coalesced function, used in metrics.
+        calls: Count of calls.
+        collapsed: Count of calls served by a call of another caller.
+        bypassed: Count of calls which were not coalesced, see
+            :func:`.single_flight`.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.collapsed = 0
+        self.bypassed = 0
+        self._in_flight: dict[Hashable, asyncio.Future] = {}
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[..., Awaitable[_T]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> _T:
+        """Await ``fn(*args, **kwargs)`` or the in-flight call with ``key``."""
+
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self.__forget(key, done))
+        else:
+            self.collapsed += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "calls": self.calls,
+            "collapsed": self.collapsed,
+            "bypassed": self.bypassed,
+            "in_flight": len(self._in_flight),
+        }
+
+    def __forget(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark exception as retrieved if every caller was cancelled.
+        if not task.cancelled():
+            task.exception()
+
+
+def single_flight(
+    fn: Callable[..., Awaitable[_T]] | None = None,
+    *,
+    bypass: Callable[[], bool] | None = None,
+) -> Callable[..., Awaitable[_T]]:
+    """Coalesce concurrent calls of a method with equal arguments.
+
+    Calls are keyed by the qualified name of ``fn`` and ``repr`` of its
+    arguments except ``self``, so concurrent calls on different instances
+    of a repository are coalesced too.
+
+    Args:
+        fn: Coalesced method.
+        bypass: Checked in the task of the caller. If it returns True, ``fn``
+            is awaited in that task and its result is not shared, e.g. when
+            the caller must see its own uncommitted writes, which a shared
+            call running in another task would not.
+
+    Warnings:
+        Use it only for reads whose arguments are fully described by their
+        ``repr``. Secrets are masked in ``repr`` of models.
+
+    Examples:
+        ::
+
+            >>> class UserRepository(Repository):
+            ...     @single_flight(bypass=has_pending_writes)
+            ...     @collect_response
+            ...     async def read(self, cmd: ReadUserCommand) -> User:
+            ...         ...
+    """
+
+    if fn is None:
+        return partial(single_flight, bypass=bypass)
+
+    flight = SingleFlight(fn.__qualname__)
+    _registry.append(flight)
+
+    @wraps(fn)
+    async def inner(self, *args: Any, **kwargs: Any) -> _T:
+        if bypass is not None and bypass():
+            flight.calls += 1
+            flight.bypassed += 1
+            return await fn(self, *args, **kwargs)
+
+        key = (repr(args), repr(sorted(kwargs.items())))
+        return await flight.do(key, fn, self, *args, **kwargs)
+
+    return inner
+
+
+def single_flight_stats() -> dict[str, dict[str, int]]:
+    """Metrics of all functions decorated by :func:`.single_flight`."""
+
+    return {flight.name: flight.stats() for flight in _registry}
@@ -1,8 +1,12 @@
 """Container with PostgreSQL connector using SQLAlchemy async."""
 
+import operator
+
 from dependency_injector import containers, providers
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
+from app.pkg.connectors.postgresql.pool import InstrumentedQueuePool
+from app.pkg.connectors.postgresql.replicas import Replicas
 from app.pkg.connectors.postgresql.resource import Postgresql
 from app.pkg.settings import settings
 
@@ -19,7 +23,16 @@ class PostgresSQL(containers.DeclarativeContainer):
         create_async_engine,
         url=configuration.POSTGRES.DSN,
         echo=configuration.POSTGRES.ECHO,
+        poolclass=InstrumentedQueuePool,
         pool_size=configuration.POSTGRES.MIN_CONNECTION,
+        max_overflow=providers.Callable(
+            operator.sub,
+            configuration.POSTGRES.MAX_CONNECTION,
+            configuration.POSTGRES.MIN_CONNECTION,
+        ),
+        pool_timeout=configuration.POSTGRES.POOL_TIMEOUT_SECONDS,
+        pool_recycle=configuration.POSTGRES.POOL_RECYCLE_SECONDS,
+        pool_pre_ping=configuration.POSTGRES.POOL_PRE_PING,
         future=True,
     )
 
@@ -29,6 +42,23 @@ class PostgresSQL(containers.DeclarativeContainer):
         expire_on_commit=False,
     )
 
+    replicas = providers.Singleton(
+        Replicas,
+        dsns=configuration.POSTGRES.REPLICA_DSNS,
+        echo=configuration.POSTGRES.ECHO,
+        poolclass=InstrumentedQueuePool,
+        pool_size=configuration.POSTGRES.MIN_CONNECTION,
+        max_overflow=providers.Callable(
+            operator.sub,
+            configuration.POSTGRES.MAX_CONNECTION,
+            configuration.POSTGRES.MIN_CONNECTION,
+        ),
+        pool_timeout=configuration.POSTGRES.POOL_TIMEOUT_SECONDS,
+        pool_recycle=configuration.POSTGRES.POOL_RECYCLE_SECONDS,
+        pool_pre_ping=configuration.POSTGRES.POOL_PRE_PING,
+        future=True,
+    )
+
 
 class TestPostgresSQL(containers.DeclarativeContainer):
     """Declarative container with test async SQLAlchemy PostgreSQL
@@ -41,7 +71,16 @@ class TestPostgresSQL(containers.DeclarativeContainer):
         create_async_engine,
         url=configuration.POSTGRES.TEST_DSN,
         echo=configuration.POSTGRES.ECHO,
+        poolclass=InstrumentedQueuePool,
         pool_size=configuration.POSTGRES.MIN_CONNECTION,
+        max_overflow=providers.Callable(
+            operator.sub,
+            configuration.POSTGRES.MAX_CONNECTION,
+            configuration.POSTGRES.MIN_CONNECTION,
+        ),
+        pool_timeout=configuration.POSTGRES.POOL_TIMEOUT_SECONDS,
+        pool_recycle=configuration.POSTGRES.POOL_RECYCLE_SECONDS,
+        pool_pre_ping=configuration.POSTGRES.POOL_PRE_PING,
         future=True,
     )
 
@@ -50,3 +89,5 @@ class TestPostgresSQL(containers.DeclarativeContainer):
         bind=engine,
         expire_on_commit=False,
     )
+
+    replicas = providers.Singleton(Replicas, dsns=[])
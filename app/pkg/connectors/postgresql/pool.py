@@ -0,0 +1,75 @@
+"""Connection pool of SQLAlchemy engine with checkout metrics."""
+
+import time
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+__all__ = ["InstrumentedQueuePool"]
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool which measures how long checkouts wait for a connection.
+
+    A wait close to zero with ``checked_out`` below ``size`` means the pool
+    is oversized, growing waits or timeouts mean it is too small for the
+    concurrency of the pod.
+
+    Attributes:
+        wait_buckets: Upper bounds in seconds of the wait histogram.
+    """
+
+    wait_buckets = (0.001, 0.01, 0.1, 1.0)
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._wait_histogram = [0] * (len(self.wait_buckets) + 1)
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self._timeouts += 1
+            raise
+        finally:
+            self.__observe(time.perf_counter() - started)
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of pool usage and checkout waits."""
+
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "checkouts": self._checkouts,
+            "timeouts": self._timeouts,
+            "wait_seconds_avg": (
+                self._wait_total / self._checkouts if self._checkouts else 0.0
+            ),
+            "wait_seconds_max": self._wait_max,
+            "wait_histogram": {
+                **{
+                    f"le_{bound}": count
+                    for bound, count in zip(self.wait_buckets, self._wait_histogram)
+                },
+                "le_inf": self._wait_histogram[-1],
+            },
+        }
+
+    def __observe(self, wait: float) -> None:
+        self._checkouts += 1
+        self._wait_total += wait
+        self._wait_max = max(self._wait_max, wait)
+        for i, bound in enumerate(self.wait_buckets):
+            if wait <= bound:
+                self._wait_histogram[i] += 1
+                return
+        self._wait_histogram[-1] += 1
@@ -0,0 +1,84 @@
+"""Engines of postgresql read replicas."""
+
+import itertools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+__all__ = ["Replicas", "primary_reads", "replicas_allowed"]
+
+_primary_only: ContextVar[bool] = ContextVar("primary_only", default=False)
+
+
+@contextmanager
+def primary_reads() -> Iterator[None]:
+    """Send read-only queries inside the block to the primary.
+
+    Use it for reads whose result outlives the request, e.g. fills of a
+    cache: a lagging replica may return a row older than an invalidation
+    which already happened, and it would be cached for the whole TTL.
+    """
+
+    token = _primary_only.set(True)
+    try:
+        yield
+    finally:
+        _primary_only.reset(token)
+
+
+def replicas_allowed() -> bool:
+    """Check that read-only queries may be sent to a replica."""
+
+    return not _primary_only.get()
+
+
+class Replicas:
+    """Engines and session factories of read replicas, used round robin.
+
+    Attributes:
+        engines: Engine of every replica, empty if no replica is configured.
+    """
+
+    def __init__(self, dsns: list[str], **engine_kwargs: Any):
+        """
+        Args:
+            dsns: DSNs of replicas.
+            **engine_kwargs: Arguments of ``create_async_engine`` shared by
+                all replicas (pool sizing, echo etc.).
+        """
+
+        self.engines: list[AsyncEngine] = [
+            create_async_engine(dsn, **engine_kwargs) for dsn in dsns
+        ]
+        self._session_factories = [
+            async_sessionmaker(bind=engine, expire_on_commit=False)
+            for engine in self.engines
+        ]
+        self._next = itertools.cycle(range(len(self.engines)))
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def next(self) -> tuple[AsyncEngine, async_sessionmaker[AsyncSession]]:
+        """Engine and session factory of the next replica."""
+
+        i = next(self._next)
+        return self.engines[i], self._session_factories[i]
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Pool stats of every replica, see :class:`.InstrumentedQueuePool`."""
+
+        return [engine.pool.stats() for engine in self.engines]
+
+    async def dispose(self) -> None:
+        """Close pools of all replicas, see :func:`.dispose_engines`."""
+
+        for engine in self.engines:
+            await engine.dispose()
@@ -2,7 +2,7 @@
 
 from dependency_injector import containers, providers
 
-from app.pkg.connectors.rabbitmq.resource import RabbitMQ
+from app.pkg.connectors.rabbitmq.resource import RabbitMQ, RabbitMQChannels
 from app.pkg.settings import settings
 
 __all__ = ["RabbitMQContainer"]
@@ -19,3 +19,9 @@ class RabbitMQContainer(containers.DeclarativeContainer):
         dsn=configuration.RABBITMQ.DSN,
         max_size=configuration.RABBITMQ.MAX_CONNECTION,
     )
+
+    channels = providers.Resource(
+        RabbitMQChannels,
+        connection_pool=connector,
+        max_size=configuration.RABBITMQ.MAX_CHANNELS,
+    )
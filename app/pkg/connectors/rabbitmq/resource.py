@@ -4,7 +4,7 @@ import aio_pika
 
 from app.pkg.connectors.resources import BaseAsyncResource
 
-__all__ = ["RabbitMQ"]
+__all__ = ["RabbitMQ", "RabbitMQChannels"]
 
 
 class RabbitMQ(BaseAsyncResource):
@@ -39,3 +39,49 @@ class RabbitMQ(BaseAsyncResource):
         """
 
         await resource.close()
+
+
+class RabbitMQChannels(BaseAsyncResource):
+    """Pool of channels on top of the pool of connections.
+
+    Opening a channel costs a round trip to the broker, so publishers reuse
+    channels instead of opening one per message. Channels are opened with
+    publisher confirms, and publishing of unroutable mandatory messages
+    raises.
+    """
+
+    async def init(
+        self,
+        connection_pool: aio_pika.pool.Pool,
+        *args,
+        **kwargs,
+    ) -> aio_pika.pool.Pool:
+        """Create pool of channels.
+
+        Args:
+            connection_pool: Resource returned by :meth:`.RabbitMQ.init()`.
+
+        Returns:
+            Pool of channels.
+        """
+
+        if not isinstance(connection_pool, aio_pika.pool.Pool):
+            connection_pool = await connection_pool
+
+        async def get_channel() -> aio_pika.abc.AbstractChannel:
+            async with connection_pool.acquire() as connection:
+                return await connection.channel(
+                    publisher_confirms=True,
+                    on_return_raises=True,
+                )
+
+        return aio_pika.pool.Pool(get_channel, *args, **kwargs)
+
+    async def shutdown(self, resource: aio_pika.pool.Pool):
+        """Close all channels of the pool.
+
+        Args:
+            resource: Resource returned by :meth:`.RabbitMQChannels.init()`.
+        """
+
+        await resource.close()
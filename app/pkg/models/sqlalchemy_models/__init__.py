@@ -1,4 +1,4 @@
 """"""
 
 from app.pkg.models.sqlalchemy_models.base_model import Base
-from app.pkg.models.sqlalchemy_models.v1 import User
+from app.pkg.models.sqlalchemy_models.v1 import Outbox, User
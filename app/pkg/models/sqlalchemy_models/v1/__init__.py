@@ -1 +1,2 @@
+from app.pkg.models.sqlalchemy_models.v1.outbox import Outbox
 from app.pkg.models.sqlalchemy_models.v1.user import User
@@ -0,0 +1,34 @@
+"""SQlAlchemy model for outbox of events."""
+
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID as UUIDType
+
+from sqlalchemy import Index, func, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.pkg.models.sqlalchemy_models import Base
+
+
+class Outbox(Base):
+    __tablename__ = "outbox"
+    __table_args__ = (
+        # Only pending events are polled by the relay.
+        Index(
+            "ix_outbox_pending",
+            "created_at",
+            postgresql_where=text("sent_at IS NULL"),
+        ),
+    )
+
+    event_id: Mapped[UUIDType] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    routing_key: Mapped[str] = mapped_column(nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(),
+        nullable=False,
+    )
+    sent_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
+    # Failed publications of the event alone, see OutboxRelay.
+    attempts: Mapped[int] = mapped_column(server_default=text("0"), nullable=False)
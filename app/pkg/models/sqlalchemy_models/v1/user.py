@@ -6,7 +6,7 @@ from typing import Optional
 from uuid import UUID as UUIDType
 
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy import func
+from sqlalchemy import Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -16,6 +16,19 @@ from app.pkg.models.v1 import ServiceRoleEnum
 
 class User(Base):
     __tablename__ = "user"
+    __table_args__ = (
+        # Covers `UserRepository.get_user_principal_by_id`, so authorization
+        # checks are index-only scans and never touch the heap.
+        Index(
+            "ix_user_auth_state",
+            "user_id",
+            postgresql_include=[
+                "user_service_role",
+                "user_is_active",
+                "user_is_verified",
+            ],
+        ),
+    )
 
     user_id: Mapped[UUIDType] = mapped_column(
         UUID(as_uuid=True),
@@ -1,2 +1,3 @@
 from app.pkg.models.v1.app.auth import *
 from app.pkg.models.v1.app.user import *
+from app.pkg.models.v1.app.outbox import *
@@ -1,13 +1,37 @@
 """Auth models."""
 
+from uuid import UUID
+
 from pydantic import EmailStr
 from pydantic.fields import Field
 
-from app.pkg.models.base import BaseModel
+from app.pkg.models.base import BaseEnum, BaseModel
 from app.pkg.models.types import EncryptedSecretBytes
-from app.pkg.models.v1.app.user import UserFields
+from app.pkg.models.v1.app.user import ServiceRoleEnum, UserFields, UserPrincipal
+
+__all__ = [
+    "AuthCommand",
+    "TokenResponse",
+    "AccessTokenClaims",
+    "RefreshTokenClaims",
+    "RefreshTokenRotation",
+    "TokenIntrospectionCommand",
+    "TokenIntrospection",
+    "TokenIntrospectionResponse",
+]
+
 
-__all__ = ["AuthCommand", "TokenResponse"]
+class RefreshTokenRotation(BaseEnum):
+    """Result of rotation of a refresh token."""
+
+    #: The token was the latest in its family and is replaced by a new one.
+    ROTATED = "ROTATED"
+    #: The token was replaced moments ago, its successor is issued again.
+    GRACE = "GRACE"
+    #: The token was already rotated, its family is revoked.
+    REUSED = "REUSED"
+    #: The family was revoked (logout) or expired.
+    REVOKED = "REVOKED"
 
 
 class BaseAuth(BaseModel):
@@ -29,6 +53,59 @@ class AuthFields:
         description="Type of the token, usually 'bearer'.",
         examples=["bearer"],
     )
+    claims_version: int = Field(
+        alias="cv",
+        description="Version of the claim set embedded into access token.",
+        examples=[1],
+    )
+    user_id_claim: UUID = Field(
+        alias="user_id",
+        description="Unique identifier of the user.",
+        examples=["123e4567-e89b-12d3-a456-426614174000"],
+    )
+    role_claim: ServiceRoleEnum = Field(
+        alias="role",
+        description="User role name.",
+        examples=[ServiceRoleEnum.USER.value, ServiceRoleEnum.ADMIN.value],
+    )
+    active_claim: bool = Field(
+        alias="act",
+        description="Indicates whether the user is active.",
+        examples=[True, False],
+    )
+    verified_claim: bool = Field(
+        alias="vrf",
+        description="Indicates whether the user's email is verified.",
+        examples=[True, False],
+    )
+    family_id_claim: str = Field(
+        alias="fid",
+        description="Id of the family of refresh tokens started by one login.",
+        examples=["8f14e45fceea167a5a36dedd4bea2543"],
+    )
+    tokens: list[str] = Field(
+        min_length=1,
+        max_length=100,
+        description="Access tokens to introspect.",
+        examples=[["eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9..."]],
+    )
+    active: bool = Field(
+        description="Indicates whether the token is valid and not revoked.",
+        examples=[True, False],
+    )
+    expires_at: int | None = Field(
+        default=None,
+        description="Expiration time of the token as unix timestamp.",
+        examples=[1767225600],
+    )
+    introspection_results: list["TokenIntrospection"] = Field(
+        description="Results in order of the requested tokens.",
+    )
+    token_id_claim: str = Field(
+        alias="jti",
+        description="Unique identifier of the token.",
+        examples=["c9f0f895fb98ab9159f51fd0297e236d"],
+    )
 
 
 class AuthCommand(BaseAuth):
@@ -45,3 +122,54 @@ class TokenResponse(BaseAuth):
     access_token: str = AuthFields.access_token
     refresh_token: str = AuthFields.refresh_token
     token_type: str = AuthFields.token_type
+
+
+class AccessTokenClaims(UserPrincipal):
+    """Authorization claims embedded into access token.
+
+    Aliases of fields are the claim names in the token payload.
+    """
+
+    claims_version: int = AuthFields.claims_version
+    user_id: UUID = AuthFields.user_id_claim
+    user_service_role: ServiceRoleEnum = AuthFields.role_claim
+    user_is_active: bool = AuthFields.active_claim
+    user_is_verified: bool = AuthFields.verified_claim
+
+
+class RefreshTokenClaims(BaseAuth):
+    """Claims of refresh token.
+
+    Aliases of fields are the claim names in the token payload.
+    """
+
+    user_id: UUID = AuthFields.user_id_claim
+    family_id: str = AuthFields.family_id_claim
+    token_id: str = AuthFields.token_id_claim
+
+
+class TokenIntrospectionCommand(BaseAuth):
+    """Command model for introspection of a batch of access tokens."""
+
+    tokens: list[str] = AuthFields.tokens
+
+
+class TokenIntrospection(BaseAuth):
+    """Result of introspection of a single access token.
+
+    Claims are set only for active tokens. Tokens issued without
+    authorization claims have only ``user_id`` set.
+    """
+
+    active: bool = AuthFields.active
+    user_id: UUID | None = None
+    user_service_role: ServiceRoleEnum | None = None
+    user_is_active: bool | None = None
+    user_is_verified: bool | None = None
+    expires_at: int | None = AuthFields.expires_at
+
+
+class TokenIntrospectionResponse(BaseAuth):
+    """Response model for introspection of a batch of access tokens."""
+
+    results: list[TokenIntrospection] = AuthFields.introspection_results
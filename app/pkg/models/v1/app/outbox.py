@@ -0,0 +1,61 @@
+"""Outbox models."""
+
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from pydantic.fields import Field
+
+from app.pkg.models.base import BaseModel
+
+__all__ = [
+    "OutboxEvent",
+    "OutboxCreateCommand",
+]
+
+
+class BaseOutbox(BaseModel):
+    """Base model for outbox."""
+
+
+class OutboxFields:
+    """Outbox fields."""
+
+    event_id: UUID = Field(
+        description="Unique identifier of the event, used for idempotency.",
+        examples=["a8d39bb4-0c52-4c56-a21b-34ed4b3f1570"],
+    )
+    routing_key: str = Field(
+        description="Routing key the event is published with.",
+        examples=["notification_key"],
+    )
+    payload: dict[str, Any] = Field(
+        description="Body of the event.",
+        examples=[{"event": "user.verification"}],
+    )
+    created_at: datetime = Field(
+        description="Timestamp when the event was written to the outbox.",
+        examples=["2025-09-09T14:10:11.532000"],
+    )
+    attempts: int = Field(
+        description="Count of failed publications of the event.",
+        examples=[0],
+    )
+
+
+class OutboxEvent(BaseOutbox):
+    """Event stored in the outbox."""
+
+    event_id: UUID = OutboxFields.event_id
+    routing_key: str = OutboxFields.routing_key
+    payload: dict[str, Any] = OutboxFields.payload
+    created_at: datetime = OutboxFields.created_at
+    attempts: int = OutboxFields.attempts
+
+
+class OutboxCreateCommand(BaseOutbox):
+    """Command to write an event to the outbox."""
+
+    event_id: UUID = OutboxFields.event_id
+    routing_key: str = OutboxFields.routing_key
+    payload: dict[str, Any] = OutboxFields.payload
@@ -4,7 +4,7 @@ from datetime import datetime
 from enum import Enum
 from uuid import UUID
 
-from pydantic import EmailStr
+from pydantic import EmailStr, field_serializer
 from pydantic.fields import Field
 
 from app.pkg.models.base import BaseModel
@@ -14,6 +14,7 @@ from app.pkg.models.types import EncryptedSecretBytes
 __all__ = [
     "UserFields",
     "User",
+    "UserPrincipal",
     "ServiceRoleEnum",
     "UserVerifiedEvent",
     "UserResponse",
@@ -27,6 +28,7 @@ __all__ = [
     "UserPasswordUpdateCommand",
     "UserChangeDataCommand",
     "UserUpdateDataCommand",
+    "UserUpdateActiveCommand",
 ]
 
 
@@ -104,6 +106,12 @@ class UserFields:
         examples=["user.verification.requested"],
     )
 
+    schema_version: int = Field(
+        default=1,
+        description="Version of the schema of the event payload.",
+        examples=[1],
+    )
+
     event_id: UUID = Field(
         description="Unique identifier of the event (UUID) used for idempotency.",
         examples=["a8d39bb4-0c52-4c56-a21b-34ed4b3f1570"],
@@ -143,9 +151,28 @@ class User(BaseUser):
     user_update_at: datetime | None = UserFields.user_update_at
 
 
+class UserPrincipal(BaseUser):
+    """Authorization data of the user.
+
+    It's enough to authorize most requests, so it can be built from access
+    token claims without reading the user from database.
+    """
+
+    user_id: UUID = UserFields.user_id
+    user_service_role: ServiceRoleEnum = UserFields.user_service_role
+    user_is_active: bool = UserFields.user_is_active
+    user_is_verified: bool = UserFields.user_is_verified
+
+
 class UserVerifiedEvent(BaseUser):
-    """"""
+    """Event requesting to send a verification code to the user.
+
+    Payload is built by ``model_dump(mode="json")``, serialization schema of
+    which is compiled once per class, instead of :meth:`.BaseModel.to_dict`.
+    Bump ``schema_version`` on incompatible changes of the payload.
+    """
 
+    schema_version: int = UserFields.schema_version
     event: str = UserFields.event
     event_id: UUID = UserFields.event_id
     occurred_at: datetime = UserFields.occurred_at
@@ -154,6 +181,12 @@ class UserVerifiedEvent(BaseUser):
     email: EmailStr = UserFields.user_email
     verification_code: str = UserFields.verification_code
 
+    @field_serializer("occurred_at", when_used="json")
+    def serialize_occurred_at(self, occurred_at: datetime) -> str:
+        """Keep the format of :meth:`.BaseModel.to_dict` of schema version 1."""
+
+        return occurred_at.strftime("%Y-%m-%d %H:%M:%S")
+
 
 class UserResponse(BaseUser):
     """Response model for a user."""
@@ -243,3 +276,10 @@ class UserUpdateDataCommand(BaseUser):
 
     user_id: UUID = UserFields.user_id
     new_user_name: str = UserFields.user_name
+
+
+class UserUpdateActiveCommand(BaseUser):
+    """Command model for activation or deactivation of a user."""
+
+    user_id: UUID = UserFields.user_id
+    user_is_active: bool = UserFields.user_is_active
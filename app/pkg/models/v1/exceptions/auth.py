@@ -10,6 +10,9 @@ __all__ = [
     "InvalidTokenPayload",
     "InvalidAuthCredentials",
     "TokenPayloadMissingUserID",
+    "RefreshTokenReused",
+    "RefreshTokenRevoked",
+    "AccessTokenRevoked",
 ]
 
 
@@ -38,6 +41,21 @@ class TokenPayloadMissingUserID(BaseAPIException):
     status_code = status.HTTP_401_UNAUTHORIZED
 
 
+class RefreshTokenReused(BaseAPIException):
+    message = "Refresh token was already used, the session is revoked."
+    status_code = status.HTTP_401_UNAUTHORIZED
+
+
+class RefreshTokenRevoked(BaseAPIException):
+    message = "Session is expired or revoked."
+    status_code = status.HTTP_401_UNAUTHORIZED
+
+
+class AccessTokenRevoked(BaseAPIException):
+    message = "Access token is revoked."
+    status_code = status.HTTP_401_UNAUTHORIZED
+
+
 class IncorrectOldPassword(BaseAPIException):
     message = "Incorrect old password."
     status_code = status.HTTP_400_BAD_REQUEST
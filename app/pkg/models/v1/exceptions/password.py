@@ -0,0 +1,14 @@
+"""Module with password hashing exceptions for the application."""
+
+from starlette import status
+
+from app.pkg.models.base import BaseAPIException
+
+__all__ = ["PasswordHashingUnavailable"]
+
+
+class PasswordHashingUnavailable(BaseAPIException):
+    """Exception raised when password hashing pool can't accept new jobs."""
+
+    message = "Password service is overloaded, try again later."
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
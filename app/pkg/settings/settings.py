@@ -7,7 +7,13 @@ from typing import Literal
 
 from dotenv import find_dotenv
 from pydantic import AmqpDsn, PostgresDsn, RedisDsn, model_validator
-from pydantic.types import PositiveInt, SecretStr
+from pydantic.types import (
+    NonNegativeFloat,
+    NonNegativeInt,
+    PositiveFloat,
+    PositiveInt,
+    SecretStr,
+)
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from app.pkg.models.core.logger import LoggerLevel
@@ -71,15 +77,42 @@ class Postgresql(_Settings):
     #: str: Postgresql database name.
     DATABASE_NAME: str = "postgres"
 
-    #: PositiveInt: Min count of connections in one pool to postgresql.
-    MIN_CONNECTION: PositiveInt = 1
+    #: PositiveInt: Count of connections kept open in one pool to postgresql.
+    MIN_CONNECTION: PositiveInt = 8
     #: PositiveInt: Max count of connections in one pool  to postgresql.
+    #  Connections above `MIN_CONNECTION` are opened under load and closed
+    #  when returned to the pool.
     MAX_CONNECTION: PositiveInt = 16
+    #: PositiveFloat: Max wait in seconds for a free connection of the pool.
+    POOL_TIMEOUT_SECONDS: PositiveFloat = 5
+    #: int: Connections older than it in seconds are reopened, -1 disables.
+    POOL_RECYCLE_SECONDS: int = 1800
+    #: bool: Check connections by a ping on checkout.
+    POOL_PRE_PING: bool = True
+    #: bool: Log all statements.
+    ECHO: bool = False
+
+    #: set[str]: Methods of `UserRepository` that bypass the ORM and run
+    #  prepared statements by asyncpg directly.
+    RAW_QUERY_METHODS: set[str] = {
+        "get_user_by_id",
+        "get_user_principal_by_id",
+        "get_full_user_by_id",
+        "get_user_by_email",
+    }
+
+    #: list[str]: Read replicas as ``host`` or ``host:port``. They share
+    #  user, password and database name with the primary. Reads are sent to
+    #  the primary if no replica is set.
+    REPLICA_HOSTS: list[str] = []
 
     #: str: Concatenation all settings for postgresql in one string. (DSN)
     #  Builds in `root_validator` method.
     DSN: str | None = None
 
+    #: list[str]: DSNs of `REPLICA_HOSTS`. Builds in `build_replica_dsns`.
+    REPLICA_DSNS: list[str] = []
+
     TEST_DSN: str | None = None
 
     @model_validator(mode="before")
@@ -113,6 +146,37 @@ class Postgresql(_Settings):
 
         return data
 
+    @model_validator(mode="after")
+    def build_replica_dsns(self) -> "Postgresql":
+        """Build DSNs of read replicas, default port is the port of primary."""
+
+        password = urllib.parse.quote_plus(self.PASSWORD.get_secret_value())
+        dsns = []
+        for replica in self.REPLICA_HOSTS:
+            host, _, port = replica.partition(":")
+            dsns.append(
+                str(
+                    PostgresDsn.build(
+                        scheme="postgresql+asyncpg",
+                        username=self.USER,
+                        password=password,
+                        host=host,
+                        port=int(port or self.PORT),
+                        path=self.DATABASE_NAME,
+                    ),
+                ),
+            )
+        self.REPLICA_DSNS = dsns
+        return self
+
+    @model_validator(mode="after")
+    def check_pool_bounds(self) -> "Postgresql":
+        """Pool can't keep open more connections than its limit."""
+
+        if self.MAX_CONNECTION < self.MIN_CONNECTION:
+            raise ValueError("MAX_CONNECTION must not be less than MIN_CONNECTION.")
+        return self
+
 
 class RabbitMQ(_Settings):
     """RabbitMQ settings."""
@@ -130,6 +194,16 @@ class RabbitMQ(_Settings):
 
     NOTIFICATION_KEY: str
 
+    #: PositiveInt: Max count of connections in the pool.
+    MAX_CONNECTION: PositiveInt = 2
+    #: PositiveInt: Max count of channels reused by publishers.
+    MAX_CHANNELS: PositiveInt = 32
+    #: Literal: Format of published messages. Consumers decode messages by
+    #  their content type, so upgrade consumers before switching it.
+    CONTENT_TYPE: Literal["application/json", "application/msgpack"] = (
+        "application/json"
+    )
+
     #: str: Concatenation all settings for Resource in one string. (DSN)
     #  Builds in `root_validator` method.
     DSN: str | None = None
@@ -222,19 +296,179 @@ class JWTSettings(_Settings):
 
     REFRESH_SECRET_KEY: SecretStr = SecretStr("super-secret")
 
-    #: str: Algorithm for encoding tokens, usually "HS256"
+    #: str: Algorithm for signing access tokens. "HS256" signs with
+    #  `SECRET_KEY`, asymmetric algorithms (e.g. "RS256") sign with keys
+    #  from `KEYS_DIR` and publish public keys at `/.well-known/jwks.json`.
     ALGORITHM: str = "HS256"
 
+    #: str: Algorithm for refresh tokens. They are verified only by this
+    #  service, so shared secret `REFRESH_SECRET_KEY` is used.
+    REFRESH_ALGORITHM: str = "HS256"
+
+    #: str | None: Directory with private keys for asymmetric algorithms.
+    #  Use `scripts/generate_jwt_key.py` to add a key.
+    KEYS_DIR: str | None = None
+    #: PositiveInt: Seconds after creation of a key until it signs tokens.
+    #  Must be greater than `JWKS_MAX_AGE_SECONDS`.
+    KEY_ACTIVATION_DELAY_SECONDS: PositiveInt = 3600
+    #: PositiveInt: Interval in seconds of reloading keys from `KEYS_DIR`.
+    KEYS_RELOAD_INTERVAL_SECONDS: PositiveInt = 60
+    #: PositiveInt: Seconds clients may cache response of JWKS endpoint.
+    JWKS_MAX_AGE_SECONDS: PositiveInt = 600
+
+    #: int: Max count of verified access tokens kept in memory of a worker.
+    #  0 disables the cache.
+    TOKEN_CACHE_SIZE: NonNegativeInt = 10000
+
+    #: PositiveInt: Expected count of revoked access tokens at a time.
+    #  Sizes in-process Bloom filter of revocations.
+    REVOCATION_CAPACITY: PositiveInt = 100000
+    #: PositiveFloat: Target false positive rate of the filter. Every false
+    #  positive costs a Redis call.
+    REVOCATION_ERROR_RATE: PositiveFloat = 0.001
+    #: PositiveInt: Interval in seconds of rebuilding the filter from Redis.
+    REVOCATION_REBUILD_INTERVAL_SECONDS: PositiveInt = 300
+
     #: int: Expiration time for access token in minutes
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
 
     #: int: Expiration time for refresh token in days
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    #: NonNegativeFloat: Seconds after rotation of a refresh token during
+    #  which it's answered with its successor instead of being treated as
+    #  reused. Covers retries of lost responses and concurrent refreshes.
+    REFRESH_REUSE_GRACE_SECONDS: NonNegativeFloat = 10.0
 
     #: Optional[str]: Audience or subject claim, optional
     AUDIENCE: str | None = None
 
 
+class PasswordSettings(_Settings):
+    """Password hashing settings."""
+
+    #: str: Algorithm for new password hashes. Hashes of the other algorithm
+    #  are still verified and upgraded on login.
+    ALGORITHM: Literal["argon2id", "bcrypt"] = "argon2id"
+
+    #: PositiveInt: Log2 of count of bcrypt rounds.
+    BCRYPT_ROUNDS: PositiveInt = 12
+
+    #: PositiveInt: Count of Argon2id iterations.
+    #  Use `scripts/calibrate_password_hashing.py` to pick it for the host.
+    ARGON2_TIME_COST: PositiveInt = 3
+    #: PositiveInt: Argon2id memory usage in kibibytes.
+    ARGON2_MEMORY_COST: PositiveInt = 65536
+    #: PositiveInt: Count of Argon2id threads. Keep 1, each worker process
+    #  is already busy with its own job.
+    ARGON2_PARALLELISM: PositiveInt = 1
+
+    #: PositiveInt | None: Count of worker processes for hashing.
+    #  If not set, count of CPU cores is used.
+    WORKERS: PositiveInt | None = None
+
+    #: PositiveInt | None: Max count of running login verifications.
+    #  If not set, all workers may be used.
+    LOGIN_MAX_CONCURRENCY: PositiveInt | None = None
+    #: PositiveFloat: Max time in seconds a login verification may wait in queue.
+    LOGIN_WAIT_BUDGET: PositiveFloat = 1.0
+
+    #: PositiveInt | None: Max count of running verifications outside of login.
+    #  If not set, all workers may be used.
+    VERIFY_MAX_CONCURRENCY: PositiveInt | None = None
+    #: PositiveFloat: Max time in seconds such a verification may wait in queue.
+    VERIFY_WAIT_BUDGET: PositiveFloat = 0.5
+
+    #: PositiveInt | None: Max count of running hashings of new passwords.
+    #  If not set, half of workers may be used.
+    HASH_MAX_CONCURRENCY: PositiveInt | None = None
+    #: PositiveFloat: Max time in seconds a hashing may wait in queue.
+    HASH_WAIT_BUDGET: PositiveFloat = 0.25
+
+
+class CacheSettings(_Settings):
+    """Settings of user cache.
+
+    Users are cached in memory of a worker (L1) and in Redis (L2). Set TTL
+    of a method to 0 to disable caching of it. Results with the password
+    hash (`get_full_user_by_id`, `get_user_by_email`) are kept out of Redis
+    and cached in L1 only, for at most `L1_TTL_SECONDS`.
+    """
+
+    #: PositiveInt: Max count of entries in memory of a worker.
+    L1_MAX_SIZE: PositiveInt = 10000
+    #: NonNegativeInt: Max lifetime in seconds of an entry in memory of a
+    #  worker. Bounds staleness if an invalidation message is missed.
+    L1_TTL_SECONDS: NonNegativeInt = 5
+
+    #: NonNegativeInt: TTL in seconds of `UserRepository.get_user_by_id`.
+    USER_BY_ID_TTL_SECONDS: NonNegativeInt = 60
+    #: NonNegativeInt: TTL in seconds of
+    #  `UserRepository.get_user_principal_by_id`.
+    USER_PRINCIPAL_BY_ID_TTL_SECONDS: NonNegativeInt = 60
+    #: NonNegativeInt: TTL in seconds of `UserRepository.get_full_user_by_id`.
+    FULL_USER_BY_ID_TTL_SECONDS: NonNegativeInt = 60
+    #: NonNegativeInt: TTL in seconds of `UserRepository.get_user_by_email`.
+    USER_BY_EMAIL_TTL_SECONDS: NonNegativeInt = 60
+
+
+class OutboxSettings(_Settings):
+    """Settings of relay of the outbox of events."""
+
+    #: PositiveInt: Max count of events published in one batch.
+    BATCH_SIZE: PositiveInt = 100
+    #: PositiveFloat: Interval in seconds of polling when the outbox is empty.
+    #  Events written by the worker itself wake the relay immediately.
+    POLL_INTERVAL_SECONDS: PositiveFloat = 1.0
+    #: PositiveInt: Published events are deleted after it in hours.
+    RETENTION_HOURS: PositiveInt = 24
+    #: PositiveInt: Count of failed publications of an event after which
+    #  it's quarantined, i.e. left in the outbox unsent.
+    MAX_ATTEMPTS: PositiveInt = 5
+
+
+class PublisherSettings(_Settings):
+    """Settings of buffered publisher of events."""
+
+    #: PositiveInt: Max count of buffered events. Events above it are
+    #  written to the outbox.
+    BUFFER_SIZE: PositiveInt = 10000
+    #: PositiveInt: Max count of events published in one batch.
+    BATCH_SIZE: PositiveInt = 100
+    #: PositiveFloat: Max time in seconds an event waits for its batch.
+    FLUSH_INTERVAL_SECONDS: PositiveFloat = 0.05
+    #: NonNegativeInt: Count of retries of a failed batch before it is
+    #  written to the outbox.
+    MAX_RETRIES: NonNegativeInt = 3
+    #: PositiveFloat: Delay in seconds before the first retry, doubled for
+    #  every next one.
+    RETRY_BACKOFF_SECONDS: PositiveFloat = 0.1
+    #: PositiveFloat: Max time in seconds of publishing of a batch.
+    PUBLISH_TIMEOUT_SECONDS: PositiveFloat = 5.0
+
+
+class ConsumerSettings(_Settings):
+    """Settings of consumer of user-lifecycle commands (`app.consumer`)."""
+
+    #: str: Queue of commands. Failed ones go to `<QUEUE>.dlq`.
+    QUEUE: str = "user_commands"
+    #: PositiveInt: Max count of unacknowledged deliveries.
+    PREFETCH: PositiveInt = 100
+    #: PositiveInt: Count of concurrent handlers.
+    CONCURRENCY: PositiveInt = 16
+    #: PositiveInt: Count of handled deliveries acknowledged by one frame.
+    ACK_BATCH_SIZE: PositiveInt = 50
+    #: PositiveFloat: Max delay in seconds of acknowledgement.
+    ACK_INTERVAL_SECONDS: PositiveFloat = 0.2
+    #: PositiveFloat: Max time in seconds of handling of one command.
+    HANDLER_TIMEOUT_SECONDS: PositiveFloat = 10.0
+    #: list[PositiveInt]: Delays in seconds of retries of failed commands,
+    #  a delay queue `<QUEUE>.retry.<delay>s` is declared for each. Attempts
+    #  after the last one wait the last delay.
+    RETRY_DELAYS_SECONDS: list[PositiveInt] = [1, 4, 16, 64, 256]
+    #: PositiveInt: Max count of attempts before a command is dead-lettered.
+    MAX_ATTEMPTS: PositiveInt = 6
+
+
 class Settings(_Settings):
     """Server settings.
 
@@ -248,15 +482,30 @@ class Settings(_Settings):
     #: JWTSettings: Token config
     JWT: JWTSettings
 
+    #: PasswordSettings: Password hashing config
+    PASSWORD: PasswordSettings
+
     #: Postgresql: Postgresql settings.
     POSTGRES: Postgresql
 
     #: Redis
     REDIS: Redis
 
+    #: CacheSettings: User cache config
+    CACHE: CacheSettings
+
     #: RabbitMQ
     RABBITMQ: RabbitMQ
 
+    #: OutboxSettings: Outbox relay config
+    OUTBOX: OutboxSettings
+
+    #: PublisherSettings: Buffered event publisher config
+    PUBLISHER: PublisherSettings
+
+    #: ConsumerSettings: Consumer of commands config
+    CONSUMER: ConsumerSettings
+
 
 @lru_cache
 def get_settings(env_file: str = ".env") -> Settings:
@@ -0,0 +1,107 @@
+"""Compare :class:`.HMACCodec` with ``python-jose`` on HS256 tokens.
+
+Measures encoding, decoding of a valid token and rejection of a token with
+broken signature and of a malformed token::
+
+    $ python -m scripts.benchmark_jwt --iterations 20000
+"""
+
+import secrets
+import timeit
+import uuid
+from argparse import ArgumentParser
+from datetime import datetime, timedelta, timezone
+
+from jose import JWTError, jwt
+
+from app.internal.pkg.jwt.codec import HMACCodec
+
+_ALGORITHM = "HS256"
+
+
+def build_claims() -> dict:
+    return {
+        "cv": 1,
+        "user_id": str(uuid.uuid4()),
+        "role": "user",
+        "act": True,
+        "vrf": True,
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=15),
+    }
+
+
+def jose_decode(token: str, secret: str) -> dict | None:
+    try:
+        return jwt.decode(token, secret, algorithms=[_ALGORITHM])
+    except JWTError:
+        return None
+
+
+def run(iterations: int) -> list[tuple[str, float, float]]:
+    """Time each case by both implementations.
+
+    Returns:
+        Case name, jose and codec time of a single call in microseconds.
+    """
+
+    secret = secrets.token_urlsafe(32)
+    codec = HMACCodec(secret, _ALGORITHM)
+    claims = build_claims()
+
+    token = jwt.encode(claims, secret, algorithm=_ALGORITHM)
+    assert codec.decode(token) == jose_decode(token, secret)
+    assert jose_decode(codec.encode(claims), secret) is not None
+
+    forged = token[:-2] + ("AA" if not token.endswith("AA") else "BB")
+    malformed = "not-a-token"
+
+    cases = {
+        "encode": (
+            lambda: jwt.encode(claims, secret, algorithm=_ALGORITHM),
+            lambda: codec.encode(claims),
+        ),
+        "decode valid": (
+            lambda: jose_decode(token, secret),
+            lambda: codec.decode(token),
+        ),
+        "reject bad signature": (
+            lambda: jose_decode(forged, secret),
+            lambda: codec.decode(forged),
+        ),
+        "reject malformed": (
+            lambda: jose_decode(malformed, secret),
+            lambda: codec.decode(malformed),
+        ),
+    }
+
+    results = []
+    for name, (jose_fn, codec_fn) in cases.items():
+        jose_time = min(timeit.repeat(jose_fn, number=iterations, repeat=3))
+        codec_time = min(timeit.repeat(codec_fn, number=iterations, repeat=3))
+        results.append(
+            (name, jose_time / iterations * 1e6, codec_time / iterations * 1e6),
+        )
+    return results
+
+
+def parse_cli_args():
+    parser = ArgumentParser(description="Benchmark JWT codec against python-jose")
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=20000,
+        help="Count of calls per measurement",
+    )
+    return parser.parse_args()
+
+
+def cli():
+    args = parse_cli_args()
+
+    print(f"{'case':<22}{'jose, us':>12}{'codec, us':>12}{'speedup':>10}")
+    for name, jose_us, codec_us in run(args.iterations):
+        print(f"{name:<22}{jose_us:>12.2f}{codec_us:>12.2f}{jose_us / codec_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    cli()
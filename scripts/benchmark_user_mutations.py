@@ -0,0 +1,146 @@
+"""Measure database round trips and latency of user mutations.
+
+Compares the previous pattern of mutations (``UPDATE``, ``COMMIT``, then
+``SELECT`` of the updated row) with ``UPDATE ... RETURNING`` used by
+:class:`.UserRepository`, and the repository method itself. Round trips
+are counted by SQLAlchemy engine events: every statement, ``BEGIN`` and
+``COMMIT``.
+
+A temporary user is created in the configured database and deleted at the
+end::
+
+    $ python -m scripts.benchmark_user_mutations --iterations 200
+"""
+
+import asyncio
+import statistics
+import time
+import uuid
+from argparse import ArgumentParser
+from typing import Awaitable, Callable
+
+from sqlalchemy import delete, event, update
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.configuration import __containers__
+from app.internal.repository.v1.postgresql.connection import get_connection
+from app.internal.repository.v1.postgresql.user import UserRepository
+from app.pkg.models import v1 as models
+from app.pkg.models.sqlalchemy_models import User
+
+
+class RoundTripCounter:
+    """Count round trips of an engine."""
+
+    def __init__(self, engine: AsyncEngine):
+        self.count = 0
+        for name in ("before_cursor_execute", "begin", "commit", "rollback"):
+            event.listen(engine.sync_engine, name, self.__increment)
+
+    def __increment(self, *args, **kwargs) -> None:
+        self.count += 1
+
+
+async def update_then_get(user_id: uuid.UUID, user_name: str) -> None:
+    async with get_connection() as session:
+        await session.execute(
+            update(User).where(User.user_id == user_id).values(user_name=user_name),
+        )
+        await session.commit()
+        updated = await session.get(User, user_id)
+        models.UserResponse.model_validate(updated)
+
+
+async def update_returning(user_id: uuid.UUID, user_name: str) -> None:
+    async with get_connection() as session:
+        result = await session.execute(
+            update(User)
+            .where(User.user_id == user_id)
+            .values(user_name=user_name)
+            .returning(User),
+        )
+        updated = result.scalar_one()
+        await session.commit()
+        models.UserResponse.model_validate(updated)
+
+
+async def measure(
+    counter: RoundTripCounter,
+    fn: Callable[[int], Awaitable[None]],
+    iterations: int,
+) -> tuple[float, float]:
+    """Run ``fn`` and return round trips per call and median latency in ms."""
+
+    timings = []
+    started_count = counter.count
+    for i in range(iterations):
+        started = time.perf_counter()
+        await fn(i)
+        timings.append((time.perf_counter() - started) * 1000)
+    return (counter.count - started_count) / iterations, statistics.median(timings)
+
+
+async def run(iterations: int) -> list[tuple[str, float, float]]:
+    async with get_connection(return_engine=True) as engine:
+        counter = RoundTripCounter(engine)
+
+    repository = UserRepository()
+    suffix = uuid.uuid4().hex[:8]
+    user = await repository.create(
+        cmd=models.UserCreateCommand(
+            user_email=f"benchmark-{suffix}@example.com",
+            user_name=f"benchmark-{suffix}",
+            hashed_password="benchmark-password",
+        ),
+    )
+
+    cases = {
+        "UPDATE, COMMIT, SELECT": lambda i: update_then_get(
+            user.user_id,
+            f"benchmark-{suffix}-a{i}",
+        ),
+        "UPDATE RETURNING, COMMIT": lambda i: update_returning(
+            user.user_id,
+            f"benchmark-{suffix}-b{i}",
+        ),
+        "UserRepository.update_data": lambda i: repository.update_data(
+            cmd=models.UserUpdateDataCommand(
+                user_id=user.user_id,
+                new_user_name=f"benchmark-{suffix}-c{i}",
+            ),
+        ),
+    }
+
+    try:
+        return [
+            (name, *await measure(counter, fn, iterations))
+            for name, fn in cases.items()
+        ]
+    finally:
+        async with get_connection() as session:
+            await session.execute(delete(User).where(User.user_id == user.user_id))
+            await session.commit()
+
+
+def parse_cli_args():
+    parser = ArgumentParser(description="Benchmark round trips of user mutations")
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=200,
+        help="Count of calls per case",
+    )
+    return parser.parse_args()
+
+
+def cli():
+    args = parse_cli_args()
+    __containers__.wire_packages()
+
+    print(f"{'case':<30}{'round trips':>13}{'median, ms':>12}")
+    for name, round_trips, median_ms in asyncio.run(run(args.iterations)):
+        print(f"{name:<30}{round_trips:>13.2f}{median_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,100 @@
+"""Compare ORM and raw asyncpg paths of user reads.
+
+Runs the bodies of :class:`.UserRepository` reads (without cache and
+coalescing in front of them) once with the ORM and once with the raw
+query layer, see ``POSTGRES__RAW_QUERY_METHODS``. A temporary user is
+created in the configured database and deleted at the end::
+
+    $ python -m scripts.benchmark_user_reads --iterations 2000
+"""
+
+import asyncio
+import inspect
+import statistics
+import time
+import uuid
+from argparse import ArgumentParser
+
+from sqlalchemy import delete
+
+from app.configuration import __containers__
+from app.internal.repository.v1.postgresql.connection import get_connection
+from app.internal.repository.v1.postgresql.user import UserRepository
+from app.pkg.models import v1 as models
+from app.pkg.models.sqlalchemy_models import User
+from app.pkg.settings import settings
+
+_METHODS = ("get_user_by_id", "get_full_user_by_id", "get_user_by_email")
+
+
+async def measure(fn, iterations: int) -> tuple[float, float]:
+    """Run ``fn`` and return median and p99 latency in microseconds."""
+
+    await fn()
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - started) * 1e6)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99) - 1]
+
+
+async def run(iterations: int) -> list[tuple[str, str, float, float]]:
+    repository = UserRepository()
+    suffix = uuid.uuid4().hex[:8]
+    user = await repository.create(
+        cmd=models.UserCreateCommand(
+            user_email=f"benchmark-{suffix}@example.com",
+            user_name=f"benchmark-{suffix}",
+            hashed_password="benchmark-password",
+        ),
+    )
+    by_id = models.UserReadByIDCommand(user_id=user.user_id)
+    by_email = models.UserReadByEmailCommand(user_email=user.user_email)
+    arguments = {
+        "get_user_by_id": by_id,
+        "get_full_user_by_id": by_id,
+        "get_user_by_email": by_email,
+    }
+
+    results = []
+    try:
+        for method in _METHODS:
+            body = inspect.unwrap(getattr(UserRepository, method))
+            for path, raw_methods in (("orm", set()), ("raw", {method})):
+                settings.POSTGRES.RAW_QUERY_METHODS = raw_methods
+                median, p99 = await measure(
+                    lambda: body(repository, cmd=arguments[method]),
+                    iterations,
+                )
+                results.append((method, path, median, p99))
+    finally:
+        async with get_connection() as session:
+            await session.execute(delete(User).where(User.user_id == user.user_id))
+            await session.commit()
+    return results
+
+
+def parse_cli_args():
+    parser = ArgumentParser(description="Benchmark ORM and raw paths of user reads")
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=2000,
+        help="Count of calls per case",
+    )
+    return parser.parse_args()
+
+
+def cli():
+    args = parse_cli_args()
+    __containers__.wire_packages()
+
+    print(f"{'method':<22}{'path':>6}{'median, us':>12}{'p99, us':>10}")
+    for method, path, median, p99 in asyncio.run(run(args.iterations)):
+        print(f"{method:<22}{path:>6}{median:>12.1f}{p99:>10.1f}")
+
+
+if __name__ == "__main__":
+    cli()
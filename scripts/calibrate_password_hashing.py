@@ -0,0 +1,125 @@
+"""Pick Argon2id parameters for a target verify latency on this host.
+
+Run it on the instance type the service is deployed to::
+
+    $ python -m scripts.calibrate_password_hashing --target-ms 250
+
+Memory cost is chosen first (the largest power of two that still fits the
+target with a single iteration), then count of iterations is raised while
+verification stays within the target. The result is printed as ``.env``
+lines.
+"""
+
+import statistics
+import time
+from argparse import ArgumentParser
+
+from app.internal.pkg.password.hashers import Argon2Hasher
+
+_PASSWORD = b"calibration-password"
+
+
+def measure_verify_ms(hasher: Argon2Hasher, samples: int) -> float:
+    """Median time of a single verification in milliseconds."""
+
+    hashed = hasher.hash(_PASSWORD)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hasher.verify(_PASSWORD, hashed)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(
+    target_ms: float,
+    min_memory_kib: int,
+    max_memory_kib: int,
+    parallelism: int,
+    samples: int,
+) -> tuple[Argon2Hasher, float]:
+    """Find the strongest parameters with verify latency under ``target_ms``.
+
+    Returns:
+        Calibrated hasher and its measured verify latency in milliseconds.
+    """
+
+    memory_cost = max_memory_kib
+    while True:
+        hasher = Argon2Hasher(
+            time_cost=1,
+            memory_cost=memory_cost,
+            parallelism=parallelism,
+        )
+        elapsed = measure_verify_ms(hasher, samples)
+        if elapsed <= target_ms or memory_cost // 2 < min_memory_kib:
+            break
+        memory_cost //= 2
+
+    while True:
+        candidate = Argon2Hasher(
+            time_cost=hasher.time_cost + 1,
+            memory_cost=memory_cost,
+            parallelism=parallelism,
+        )
+        candidate_elapsed = measure_verify_ms(candidate, samples)
+        if candidate_elapsed > target_ms:
+            return hasher, elapsed
+        hasher, elapsed = candidate, candidate_elapsed
+
+
+def parse_cli_args():
+    parser = ArgumentParser(description="Calibrate Argon2id parameters")
+    parser.add_argument(
+        "--target-ms",
+        type=float,
+        default=250.0,
+        help="Target verify latency in milliseconds",
+    )
+    parser.add_argument(
+        "--min-memory-mib",
+        type=int,
+        default=19,
+        help="Lower bound of memory cost in MiB",
+    )
+    parser.add_argument(
+        "--max-memory-mib",
+        type=int,
+        default=256,
+        help="Upper bound of memory cost in MiB",
+    )
+    parser.add_argument(
+        "--parallelism",
+        type=int,
+        default=1,
+        help="Count of Argon2id threads",
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=5,
+        help="Count of measurements per candidate",
+    )
+    return parser.parse_args()
+
+
+def cli():
+    args = parse_cli_args()
+
+    hasher, elapsed = calibrate(
+        target_ms=args.target_ms,
+        min_memory_kib=args.min_memory_mib * 1024,
+        max_memory_kib=args.max_memory_mib * 1024,
+        parallelism=args.parallelism,
+        samples=args.samples,
+    )
+
+    print(f"# Argon2id verify takes {elapsed:.1f} ms on this host.")
+    print("PASSWORD__ALGORITHM=argon2id")
+    print(f"PASSWORD__ARGON2_TIME_COST={hasher.time_cost}")
+    print(f"PASSWORD__ARGON2_MEMORY_COST={hasher.memory_cost}")
+    print(f"PASSWORD__ARGON2_PARALLELISM={hasher.parallelism}")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,76 @@
+"""Add a new private key for signing access tokens.
+
+Run it ahead of rotation, the key signs tokens only after
+``JWT__KEY_ACTIVATION_DELAY_SECONDS`` so every verifier has the key in its
+cached JWKS by then::
+
+    $ python -m scripts.generate_jwt_key --keys-dir ./keys --algorithm RS256
+
+Old keys are retired by the service itself, remove their files once they
+are no longer published.
+"""
+
+import os
+import secrets
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+
+import ecdsa
+import rsa
+
+
+def generate_pem(algorithm: str, rsa_bits: int) -> bytes:
+    """Generate private key in PEM for ``algorithm``."""
+
+    if algorithm.startswith(("RS", "PS")):
+        _, private_key = rsa.newkeys(rsa_bits)
+        return private_key.save_pkcs1()
+    curves = {
+        "ES256": ecdsa.NIST256p,
+        "ES384": ecdsa.NIST384p,
+        "ES512": ecdsa.NIST521p,
+    }
+    return ecdsa.SigningKey.generate(curve=curves[algorithm]).to_pem()
+
+
+def parse_cli_args():
+    parser = ArgumentParser(description="Generate key for signing access tokens")
+    parser.add_argument(
+        "--keys-dir",
+        type=str,
+        default="./keys",
+        help="Directory with private keys, same as JWT__KEYS_DIR",
+    )
+    parser.add_argument(
+        "--algorithm",
+        type=str,
+        default="RS256",
+        choices=["RS256", "RS384", "RS512", "ES256", "ES384", "ES512"],
+        help="Algorithm the key is used with, same as JWT__ALGORITHM",
+    )
+    parser.add_argument(
+        "--rsa-bits",
+        type=int,
+        default=2048,
+        help="Size of RSA key in bits",
+    )
+    return parser.parse_args()
+
+
+def cli():
+    args = parse_cli_args()
+
+    keys_dir = Path(args.keys_dir)
+    keys_dir.mkdir(parents=True, exist_ok=True)
+    path = keys_dir / f"{int(time.time())}-{secrets.token_hex(4)}.pem"
+
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as file:
+        file.write(generate_pem(args.algorithm, args.rsa_bits))
+
+    print(f"Key {path.stem} written to {path}.")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,119 @@
+"""Send dead-lettered commands back to the queue of the consumer.
+
+Commands are dead-lettered to ``<queue>.dlq`` when they failed permanently
+or too many times (see :mod:`app.internal.consumers.runtime`). Once the
+cause is fixed, replay them with a fresh count of attempts::
+
+    $ python -m scripts.replay_dead_letters --limit 100
+
+With ``--dry-run`` messages are only printed and stay in the dead letter
+queue.
+"""
+
+import asyncio
+from argparse import ArgumentParser
+
+import aio_pika
+
+from app.configuration import __containers__
+from app.internal.consumers.runtime import ATTEMPTS_HEADER
+from app.internal.repository.v1.rabbitmq.connection import (
+    acquire_connection,
+    get_connection,
+)
+from app.internal.repository.v1.rabbitmq.serializers import get_serializer
+from app.pkg.settings import settings
+
+#: Headers describing previous deliveries, dropped on replay.
+_STALE_HEADERS = {
+    ATTEMPTS_HEADER,
+    "x-death",
+    "x-first-death-exchange",
+    "x-first-death-queue",
+    "x-first-death-reason",
+}
+
+
+def _describe(message: aio_pika.abc.AbstractIncomingMessage) -> str:
+    """Decoded body of ``message`` for display, raw bytes if it's broken."""
+
+    try:
+        return repr(get_serializer(message.content_type).loads(message.body))
+    except Exception:  # pylint: disable=broad-exception-caught
+        return repr(message.body)
+
+
+async def run(queue_name: str, limit: int | None, dry_run: bool) -> int:
+    """Replay up to ``limit`` messages and return count of replayed ones."""
+
+    replayed = 0
+    async with get_connection(return_pool=True) as pool:
+        async with acquire_connection(pool) as channel:
+            # Without requeue, messages are returned to the queue when the
+            # channel is closed, so one message is not read twice.
+            dead_letters = await channel.get_queue(f"{queue_name}.dlq")
+            while limit is None or replayed < limit:
+                message = await dead_letters.get(no_ack=False, fail=False)
+                if message is None:
+                    break
+
+                print(message.message_id, message.headers, _describe(message))
+                replayed += 1
+                if dry_run:
+                    continue
+
+                # Published on a channel with confirms and acked only after
+                # the broker has confirmed the message, so a failed publish
+                # leaves it in the dead letter queue.
+                async with get_connection() as publisher:
+                    await publisher.default_exchange.publish(
+                        aio_pika.Message(
+                            body=message.body,
+                            headers={
+                                key: value
+                                for key, value in (message.headers or {}).items()
+                                if key not in _STALE_HEADERS
+                            },
+                            content_type=message.content_type,
+                            message_id=message.message_id,
+                            delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                        ),
+                        routing_key=queue_name,
+                        mandatory=True,
+                    )
+                await message.ack()
+    return replayed
+
+
+def parse_cli_args():
+    parser = ArgumentParser(description="Replay dead-lettered commands")
+    parser.add_argument(
+        "--queue",
+        default=settings.CONSUMER.QUEUE,
+        help="Queue of the consumer, messages are read from <queue>.dlq",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Max count of messages to replay, all by default",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only print messages",
+    )
+    return parser.parse_args()
+
+
+def cli():
+    args = parse_cli_args()
+    __containers__.wire_packages()
+
+    replayed = asyncio.run(run(args.queue, args.limit, args.dry_run))
+    action = "Found" if args.dry_run else "Replayed"
+    print(f"{action} {replayed} messages.")
+
+
+if __name__ == "__main__":
+    cli()
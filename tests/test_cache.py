@@ -0,0 +1,76 @@
+"""Tests of the read-through cache of repository results."""
+
+import asyncio
+
+from app.internal.pkg.cache import cache as cache_module
+from app.internal.pkg.cache.cache import cached, invalidates
+from app.pkg.connectors.postgresql.replicas import replicas_allowed
+from app.pkg.models.base import BaseModel
+
+
+class _User(BaseModel):
+    user_id: int
+    user_is_active: bool
+
+
+class _CacheRepository:
+    """In-memory :class:`.CacheRepository`."""
+
+    def __init__(self):
+        self.entries: dict[str, str] = {}
+        self.versions: dict[str, int] = {}
+
+    async def read(self, key: str) -> tuple[bytes | None, str]:
+        value = self.entries.get(key)
+        return value.encode() if value else None, await self.read_version(key)
+
+    async def read_version(self, key: str) -> str:
+        return str(self.versions[key]) if key in self.versions else ""
+
+    async def create(self, key: str, value: str, expire_time: int, version: str):
+        if await self.read_version(key) != version:
+            return False
+        self.entries[key] = value
+        return True
+
+    async def delete(self, keys: list[str]) -> None:
+        for key in keys:
+            self.versions[key] = self.versions.get(key, 0) + 1
+            self.entries.pop(key, None)
+
+
+class _Repository:
+    """User stored on the primary and on a replica which lags behind."""
+
+    def __init__(self):
+        self.primary = _User(user_id=1, user_is_active=True)
+        self.replica = self.primary
+
+    @cached(key=lambda user_id: f"user:{user_id}", ttl=60)
+    async def read(self, user_id: int) -> _User:
+        return self.replica if replicas_allowed() else self.primary
+
+    @invalidates(keys=lambda user: [f"user:{user.user_id}"])
+    async def deactivate(self, user_id: int) -> _User:
+        self.primary = _User(user_id=user_id, user_is_active=False)
+        return self.primary
+
+
+def test_cache_is_not_filled_from_lagging_replica(monkeypatch):
+    monkeypatch.setattr(cache_module.cache, "repository", _CacheRepository())
+    cache_module.cache.local.clear()
+
+    async def scenario() -> tuple[_User, _User]:
+        repository = _Repository()
+        await repository.read(1)
+        # Not replicated yet.
+        await repository.deactivate(1)
+        after_write = await repository.read(1)
+        cache_module.cache.local.clear()
+        from_l2 = await repository.read(1)
+        return after_write, from_l2
+
+    after_write, from_l2 = asyncio.run(scenario())
+
+    assert after_write.user_is_active is False
+    assert from_l2.user_is_active is False
@@ -0,0 +1,92 @@
+"""Tests of the relay of the outbox."""
+
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.internal.pkg.outbox.relay import OutboxRelay
+
+
+class _OutboxRepository:
+    """In-memory :class:`.OutboxRepository`."""
+
+    def __init__(self, events: list[SimpleNamespace]):
+        self.events = events
+        self.sent: set = set()
+
+    async def read_pending(self, limit: int, max_attempts: int):
+        return [
+            event
+            for event in self.events
+            if event.event_id not in self.sent and event.attempts < max_attempts
+        ][:limit]
+
+    async def mark_sent(self, event_ids: list) -> None:
+        self.sent.update(event_ids)
+
+    async def mark_failed(self, event_ids: list) -> None:
+        for event in self.events:
+            if event.event_id in event_ids:
+                event.attempts += 1
+
+
+class _RabbitMQRepository:
+    """Broker which rejects batches containing a poison event."""
+
+    def __init__(self, up: bool = True):
+        self.up = up
+        self.published: list[dict] = []
+
+    async def publish_batch(self, messages: list[tuple[dict, str]]) -> None:
+        if not self.up or any(body.get("poison") for body, _ in messages):
+            raise RuntimeError("rejected")
+        self.published.extend(body for body, _ in messages)
+
+
+def _event(**payload) -> SimpleNamespace:
+    return SimpleNamespace(
+        event_id=uuid4(),
+        routing_key="notification_key",
+        payload=payload,
+        attempts=0,
+    )
+
+
+def _relay(
+    events: list[SimpleNamespace],
+    up: bool = True,
+    max_attempts: int = 1,
+) -> OutboxRelay:
+    return OutboxRelay(
+        outbox_repository=_OutboxRepository(events),
+        rabbitmq_repository=_RabbitMQRepository(up),
+        batch_size=10,
+        poll_interval=0.01,
+        retention=timedelta(hours=1),
+        max_attempts=max_attempts,
+    )
+
+
+def test_poison_event_does_not_block_batch():
+    poison = _event(poison=True)
+    relay = _relay([poison, _event(n=1), _event(n=2)])
+
+    published = [asyncio.run(relay.relay_batch()) for _ in range(2)]
+
+    assert published == [2, 0]
+    assert relay.rabbitmq_repository.published == [{"n": 1}, {"n": 2}]
+    assert poison.attempts == 1
+    assert relay.stats()["quarantined"] == 1
+
+
+def test_failures_are_not_counted_when_broker_is_down():
+    event = _event(n=1)
+    relay = _relay([event], up=False)
+
+    try:
+        asyncio.run(relay.relay_batch())
+    except RuntimeError:
+        pass
+
+    assert event.attempts == 0
@@ -0,0 +1,96 @@
+"""Tests of reads inside a unit of work."""
+
+import asyncio
+
+from app.internal.repository.v1.postgresql.unit_of_work import (
+    current_unit_of_work,
+    has_pending_writes,
+    unit_of_work,
+)
+from app.pkg.async_helpers.single_flight import single_flight
+
+
+class _Repository:
+    """Repository with one committed row and writes visible to the unit."""
+
+    def __init__(self):
+        self.committed = "old"
+        self.pending = None
+        self.read_started = asyncio.Event()
+        self.release_read = asyncio.Event()
+
+    async def write(self, value: str) -> None:
+        uow = current_unit_of_work()
+        uow.dirty = True
+        uow.after_commit(lambda: self.__commit(value))
+        self.pending = value
+
+    @single_flight(bypass=has_pending_writes)
+    async def read(self, key: str) -> str:
+        if has_pending_writes():
+            return self.pending
+
+        self.read_started.set()
+        await self.release_read.wait()
+        return self.committed
+
+    async def __commit(self, value: str) -> None:
+        self.committed = value
+
+
+def test_read_after_write_is_not_coalesced_with_concurrent_read():
+    async def scenario() -> tuple[str, str]:
+        repository = _Repository()
+        concurrent = asyncio.create_task(repository.read("user"))
+        await repository.read_started.wait()
+
+        async with unit_of_work():
+            await repository.write("new")
+            # Coalesced with the concurrent read, it would wait for it.
+            async with asyncio.timeout(1):
+                own = await repository.read("user")
+            repository.release_read.set()
+            return own, await concurrent
+
+    own, concurrent = asyncio.run(scenario())
+
+    assert own == "new"
+    assert concurrent == "old"
+
+
+def test_read_without_writes_is_coalesced():
+    async def scenario() -> list[str]:
+        repository = _Repository()
+        first = asyncio.create_task(repository.read("user"))
+        await repository.read_started.wait()
+
+        async with unit_of_work():
+            asyncio.get_running_loop().call_soon(repository.release_read.set)
+            second = await repository.read("user")
+        return [await first, second]
+
+    assert asyncio.run(scenario()) == ["old", "old"]
+
+
+def test_independent_unit_is_not_rolled_back_with_outer_unit():
+    committed = []
+
+    async def on_commit(name: str) -> None:
+        committed.append(name)
+
+    async def scenario() -> None:
+        async with unit_of_work() as outer:
+            outer.after_commit(lambda: on_commit("outer"))
+            async with unit_of_work(join=False) as inner:
+                assert inner is not outer
+                assert current_unit_of_work() is inner
+                inner.after_commit(lambda: on_commit("inner"))
+            assert current_unit_of_work() is outer
+            raise RuntimeError("request failed")
+
+    try:
+        asyncio.run(scenario())
+    except RuntimeError:
+        pass
+
+    assert committed == ["inner"]